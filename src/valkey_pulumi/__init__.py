@@ -1,8 +1,35 @@
 """Pulumi Valkey deployment provider."""
 
-from .__main__ import ValkeyReplicaSet, ValkeyStandalone, create_standalone_valkey, create_valkey_replica_set
+from .__main__ import (
+    ValkeyBackup,
+    ValkeyBenchmark,
+    ValkeyCluster,
+    ValkeyHostTuning,
+    ValkeyReplicaSet,
+    ValkeySentinelReplicaSet,
+    ValkeyStandalone,
+    create_fleet,
+    create_standalone_valkey,
+    create_valkey_cluster,
+    create_valkey_replica_set,
+    create_valkey_sentinel_replica_set,
+)
 from .config import Config
 
 __version__ = "0.0.1"
 
-__all__ = ["Config", "ValkeyStandalone", "ValkeyReplicaSet", "create_standalone_valkey", "create_valkey_replica_set"]
+__all__ = [
+    "Config",
+    "ValkeyStandalone",
+    "ValkeyReplicaSet",
+    "ValkeySentinelReplicaSet",
+    "ValkeyCluster",
+    "ValkeyHostTuning",
+    "ValkeyBenchmark",
+    "ValkeyBackup",
+    "create_standalone_valkey",
+    "create_valkey_replica_set",
+    "create_valkey_sentinel_replica_set",
+    "create_valkey_cluster",
+    "create_fleet",
+]
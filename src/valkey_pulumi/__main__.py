@@ -4,17 +4,344 @@ This module provides Valkey deployment configurations compatible with
 Bitnami's Valkey Docker images and Docker Compose configurations.
 """
 
+import copy
+import hashlib
+import ipaddress
+import math
 import os
+import re
 from typing import Any
 
 import pulumi
 import pulumi_docker as docker
 
+from valkey_pulumi.backup import BACKUP_LATEST_FILENAME, CronSchedule, parse_cron
+from valkey_pulumi.benchmark import (
+    BENCHMARK_RESULTS_FILENAME,
+    DEFAULT_BENCHMARK_TESTS,
+    parse_benchmark_csv,
+    write_benchmark_results,
+)
+from valkey_pulumi.certificates import (
+    TLS_CA_FILENAME,
+    TLS_CA_VALIDITY_FACTOR,
+    TLS_CERT_FILENAME,
+    TLS_CERT_USES,
+    TLS_KEY_FILENAME,
+    TLS_KEY_GROUP,
+    tls_material_dir,
+    write_tls_material,
+)
 from valkey_pulumi.config import Config
+from valkey_pulumi.fleet import REPLICA_SET_KINDS, FleetInstance, load_fleet_file, parse_fleet
+from valkey_pulumi.ports import PORT_ALLOCATIONS_FILENAME, PortAllocator, parse_port_range
+from valkey_pulumi.topology import (
+    TOPOLOGY_MANIFEST_VERSION,
+    read_weights,
+    write_peer_list,
+    write_topology_manifest,
+)
+from valkey_pulumi.tuning import (
+    REPLICA_ONLY_PERSISTENCE,
+    config_digest,
+    derived_maxmemory,
+    effective_aof_enabled,
+    parse_size,
+    tcp_backlog_exceeds_somaxconn,
+    write_valkey_conf,
+)
 
 CONFIG_MOUNT_PATH = "/opt/bitnami/valkey/mounted-etc/valkey.conf"
 OVERRIDES_MOUNT_PATH = "/opt/bitnami/valkey/mounted-etc/overrides.conf"
 ACL_MOUNT_PATH = "/opt/bitnami/valkey/mounted-etc/users.acl"
+PEERS_MOUNT_PATH = "/opt/bitnami/valkey/mounted-etc/peers"
+SEED_MOUNT_PATH = "/seed"
+BACKUP_MOUNT_PATH = "/backups"
+CLUSTER_HASH_SLOTS = 16384
+# valkey.conf: more than 8 I/O threads is unlikely to help much
+IO_THREADS_RECOMMENDED_MAX = 8
+TRANSPARENT_HUGEPAGE_MODES = ("always", "madvise", "never")
+DEFAULT_SENTINEL_PRIMARY_NAME = "mymaster"
+DATA_PLACEMENTS = ("volume", "bind", "tmpfs")
+AOF_PLACEMENTS = ("volume", "bind")
+NETWORK_MODES = ("bridge", "host")
+UPDATE_STRATEGIES = ("replace", "rolling")
+# The Bitnami image's own start command, exec'd by the rolling update start script
+BITNAMI_START = "/opt/bitnami/scripts/valkey/entrypoint.sh /opt/bitnami/scripts/valkey/run.sh"
+# Valkey keeps AOF files in <dir>/<appenddirname>; appenddirname cannot be a path of its own
+AOF_DIRNAME = "appendonlydir"
+AOF_FILENAME = "appendonly.aof"
+
+# One RemoteImage per distinct image reference for the whole stack
+_REMOTE_IMAGES: dict[str, docker.RemoteImage] = {}
+
+
+def _remote_image(image: str, aliases: list[str] | None = None) -> docker.RemoteImage:
+    """Return the stack-wide RemoteImage for an image reference, creating it on first use.
+
+    Containers sharing a tag then cost a single pull and digest lookup against the Docker daemon.
+    The resource is named after the reference plus a digest of it, since different references
+    can sanitize to the same name. ``aliases`` are the per-container image resource names of
+    earlier versions; the first caller's are adopted, so existing stacks keep their images
+    instead of deleting them.
+    """
+    if image not in _REMOTE_IMAGES:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", image).strip("-")
+        digest = hashlib.sha256(image.encode()).hexdigest()[:8]
+        _REMOTE_IMAGES[image] = docker.RemoteImage(
+            f"{slug}-{digest}_image",
+            name=image,
+            keep_locally=False,
+            opts=pulumi.ResourceOptions(aliases=[pulumi.Alias(name=alias) for alias in aliases or []]),
+        )
+    return _REMOTE_IMAGES[image]
+
+
+# One allocator per allocations file, shared by every component of the stack
+_PORT_ALLOCATORS: dict[str, PortAllocator] = {}
+
+
+def _port_allocator(config: Config) -> PortAllocator:
+    """Return the stack's allocator for the Config's allocations file.
+
+    Previews allocate in memory only, so they never change the ports ``pulumi up`` assigned.
+    """
+    path = os.path.abspath(
+        config.port_allocations_file or os.path.join(config.generated_config_dir, PORT_ALLOCATIONS_FILENAME)
+    )
+    if path not in _PORT_ALLOCATORS:
+        scope = f"{pulumi.get_project()}/{pulumi.get_stack()}"
+        _PORT_ALLOCATORS[path] = PortAllocator(path, scope, read_only=pulumi.runtime.is_dry_run())
+    return _PORT_ALLOCATORS[path]
+
+
+# One private CA per generated_config_dir, shared by every component of the stack
+_TLS_AUTHORITIES: dict[str, tuple[Any, Any]] = {}
+# Generated TLS directory of each container, resolved once its files are written
+_TLS_MATERIAL: dict[str, pulumi.Output[str]] = {}
+
+
+def _pulumi_tls():
+    """Import pulumi_tls, which only ``tls_generate`` needs.
+
+    Raises:
+        ValueError: If the package is not installed.
+
+    """
+    try:
+        import pulumi_tls
+    except ImportError:
+        raise ValueError("tls_generate needs the pulumi-tls package: pip install 'valkey-pulumi[tls]'") from None
+    return pulumi_tls
+
+
+def _tls_authority(config: Config) -> tuple[Any, Any]:
+    """Return the stack's private CA key and certificate for ``generated_config_dir``, creating them on first use."""
+    root = os.path.abspath(config.generated_config_dir)
+    if root not in _TLS_AUTHORITIES:
+        tls = _pulumi_tls()
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", config.generated_config_dir).strip("-.")
+        key = tls.PrivateKey(f"{slug}-tls-ca-key", algorithm="ECDSA", ecdsa_curve="P256")
+        cert = tls.SelfSignedCert(
+            f"{slug}-tls-ca",
+            private_key_pem=key.private_key_pem,
+            subject=tls.SelfSignedCertSubjectArgs(common_name=f"{slug} CA"),
+            is_ca_certificate=True,
+            validity_period_hours=config.tls_cert_validity_hours * TLS_CA_VALIDITY_FACTOR,
+            allowed_uses=["cert_signing", "crl_signing"],
+        )
+        pulumi.export(f"{slug}_tls_ca_cert", cert.cert_pem)
+        _TLS_AUTHORITIES[root] = (key, cert)
+    return _TLS_AUTHORITIES[root]
+
+
+def _generated_tls_config(config: Config, container_name: str) -> Config:
+    """Point a Config at generated TLS material for ``container_name``.
+
+    With ``tls_enabled`` and ``tls_generate``, an ECDSA P-256 key and a certificate signed by
+    the stack's CA are created for the container, valid for its name, ``localhost`` and, on the
+    host network, ``host_address``. The certificate is replaced on the first ``pulumi up`` in
+    the last quarter of ``tls_cert_validity_hours``. Other Configs are returned unchanged.
+
+    Raises:
+        ValueError: If ``tls_generate`` is combined with TLS files of its own, or pulumi-tls is
+            not installed.
+
+    """
+    if not (config.tls_enabled and config.tls_generate):
+        return config
+    own_files = [config.tls_cert_file, config.tls_key_file, config.tls_ca_file]
+    generated = config.tls_cert_file and os.path.dirname(os.path.abspath(config.tls_cert_file)) in _TLS_MATERIAL
+    if any(own_files) and not generated:
+        raise ValueError(
+            f"{container_name}: tls_generate cannot be combined with tls_cert_file, tls_key_file or tls_ca_file"
+        )
+
+    directory = tls_material_dir(config, container_name)
+    if directory not in _TLS_MATERIAL:
+        tls = _pulumi_tls()
+        ca_key, ca_cert = _tls_authority(config)
+        dns_names, ip_addresses = [container_name, "localhost"], ["127.0.0.1"]
+        if _host_network(config):
+            try:
+                ip_addresses.append(str(ipaddress.ip_address(config.host_address)))
+            except ValueError:
+                dns_names.append(config.host_address)
+        key = tls.PrivateKey(f"{container_name}-tls-key", algorithm="ECDSA", ecdsa_curve="P256")
+        request = tls.CertRequest(
+            f"{container_name}-tls-request",
+            private_key_pem=key.private_key_pem,
+            subject=tls.CertRequestSubjectArgs(common_name=container_name),
+            dns_names=dns_names,
+            ip_addresses=ip_addresses,
+        )
+        cert = tls.LocallySignedCert(
+            f"{container_name}-tls-cert",
+            cert_request_pem=request.cert_request_pem,
+            ca_private_key_pem=ca_key.private_key_pem,
+            ca_cert_pem=ca_cert.cert_pem,
+            validity_period_hours=config.tls_cert_validity_hours,
+            early_renewal_hours=config.tls_cert_validity_hours // 4,
+            allowed_uses=list(TLS_CERT_USES),
+        )
+        # The mount's host path resolves once the files exist, so containers start after them
+        written = pulumi.Output.all(ca_cert.cert_pem, cert.cert_pem, key.private_key_pem).apply(
+            lambda pems: write_tls_material(directory, *pems)
+        )
+        _TLS_MATERIAL[directory] = pulumi.Output.unsecret(written)
+
+    resolved = copy.copy(config)
+    resolved.tls_ca_file = os.path.join(directory, TLS_CA_FILENAME)
+    resolved.tls_cert_file = os.path.join(directory, TLS_CERT_FILENAME)
+    resolved.tls_key_file = os.path.join(directory, TLS_KEY_FILENAME)
+    return resolved
+
+
+def _host_port(config: Config, container_name: str, purpose: str, default: int) -> int:
+    """Return the host port that publishes ``purpose`` (``valkey``, ``tls``, ...) of a container.
+
+    Without ``port_range`` this is ``default``, the fixed ``port + offset`` layout; with it the
+    port comes from the stack's persisted allocations.
+    """
+    if not config.port_range:
+        return default
+    return _port_allocator(config).allocate(f"{container_name}/{purpose}", parse_port_range(config.port_range))
+
+
+def _published_ports(config: Config, container_name: str, offset: int = 0) -> list[docker.ContainerPortArgs]:
+    """Publish the Valkey port, and the TLS port when it is a separate one.
+
+    ``offset`` shifts the host ports of the fixed layout (used without ``port_range``).
+    """
+    ports = [
+        docker.ContainerPortArgs(
+            internal=config.port, external=_host_port(config, container_name, "valkey", config.port + offset)
+        )
+    ]
+    if config.tls_enabled and config.tls_port_number != config.port:
+        ports.append(
+            docker.ContainerPortArgs(
+                internal=config.tls_port_number,
+                external=_host_port(config, container_name, "tls", config.tls_port_number + offset),
+            )
+        )
+    return ports
+
+
+def _published_client_port(config: Config, container_name: str, offset: int = 0) -> int:
+    """Return the host port clients use: the published TLS port when TLS has its own port."""
+    if config.tls_enabled and config.tls_port_number != config.port:
+        return _host_port(config, container_name, "tls", config.tls_port_number + offset)
+    return _host_port(config, container_name, "valkey", config.port + offset)
+
+
+def _host_network(config: Config) -> bool:
+    """Return whether containers share the host's network stack instead of a bridge network.
+
+    Raises:
+        ValueError: If ``network_mode`` is not a known mode.
+
+    """
+    if config.network_mode not in NETWORK_MODES:
+        raise ValueError(f"Unknown network_mode '{config.network_mode}'. Available: {', '.join(NETWORK_MODES)}")
+    return config.network_mode == "host"
+
+
+def _host_network_config(config: Config, container_name: str, offset: int = 0) -> Config:
+    """Give a host-network container its own listening ports.
+
+    Containers on the host network cannot share a port, so the container listens directly on
+    the host port it would otherwise publish (allocated from ``port_range`` or ``port + offset``).
+    Bridge-network Configs are returned unchanged.
+    """
+    if not _host_network(config):
+        return config
+    resolved = copy.copy(config)
+    resolved.port = _host_port(config, container_name, "valkey", config.port + offset)
+    if config.tls_port_number == config.port:
+        resolved.tls_port_number = resolved.port
+    else:
+        resolved.tls_port_number = _host_port(config, container_name, "tls", config.tls_port_number + offset)
+    return resolved
+
+
+def _reachable_host(config: Config, container_name: str) -> str:
+    """Return the address other containers use: the host address on the host network, else the container name."""
+    return config.host_address if _host_network(config) else container_name
+
+
+def _network_args(config: Config, container_name: str, network: docker.Network | None, offset: int = 0):
+    """Build the docker.Container networking arguments: bridge network and published ports, or the host network."""
+    if _host_network(config):
+        return {"network_mode": "host"}
+    return {
+        "ports": _published_ports(config, container_name, offset),
+        "networks_advanced": [docker.ContainerNetworksAdvancedArgs(name=network.name, aliases=[container_name])]
+        if network
+        else None,
+    }
+
+
+def _rolling_update(config: Config) -> bool:
+    """Return whether replica sets hand the primary role off before the primary is replaced.
+
+    Raises:
+        ValueError: If ``update_strategy`` is not a known strategy.
+
+    """
+    if config.update_strategy not in UPDATE_STRATEGIES:
+        raise ValueError(
+            f"Unknown update_strategy '{config.update_strategy}'. Available: {', '.join(UPDATE_STRATEGIES)}"
+        )
+    return config.update_strategy == "rolling"
+
+
+def _warn_rolling_unsupported(config: Config, name: str) -> None:
+    """Warn that a deployment without a replica set is replaced in place despite ``update_strategy: rolling``."""
+    if _rolling_update(config):
+        pulumi.log.warn(f"{name}: update_strategy 'rolling' needs a replica set; containers are replaced in place")
+
+
+def _revision(*values: pulumi.Input[str]) -> pulumi.Output[str]:
+    """Return a short digest of container inputs that changes whenever one of them does."""
+    return pulumi.Output.all(*values).apply(
+        lambda resolved: hashlib.sha256("\n".join(str(value) for value in resolved).encode()).hexdigest()[:16]
+    )
+
+
+def release_unused_ports() -> dict[str, int]:
+    """Drop port assignments of containers this run no longer deploys and return the rest.
+
+    Call once after every deployment of the stack has been created. Only the current stack's
+    assignments are released, and previews release nothing.
+    """
+    assignments: dict[str, int] = {}
+    for allocator in _PORT_ALLOCATORS.values():
+        released = [] if pulumi.runtime.is_dry_run() else allocator.release_unrequested()
+        if released:
+            pulumi.log.info(f"Released host ports of removed containers: {', '.join(released)}")
+        assignments.update(allocator.assignments)
+    return dict(sorted(assignments.items()))
 
 
 def _bool_to_yes_no(value: bool | None) -> str | None:
@@ -36,8 +363,15 @@ def _env_args(env_map: dict[str, Any]) -> list[pulumi.Input[str]]:
     return args
 
 
-def _build_env(config: Config, overrides: dict[str, str | None] | None = None) -> list[pulumi.Input[str]]:
-    """Build environment variables for a container from a Config."""
+def _build_env(
+    config: Config, overrides: dict[str, str | None] | None = None, index: int = 0
+) -> list[pulumi.Input[str]]:
+    """Build environment variables for a container from a Config.
+
+    ``index`` is the container's position in its topology; it selects the container's
+    cpuset when ``io_threads`` is ``"auto"``.
+    """
+    io_threads = _effective_io_threads(config, index)
     env_map: dict[str, Any] = {
         # Authentication
         "ALLOW_EMPTY_PASSWORD": "yes" if config.allow_empty_password else None,
@@ -48,7 +382,7 @@ def _build_env(config: Config, overrides: dict[str, str | None] | None = None) -
         "VALKEY_DATA_DIR": config.valkey_data_dir,
         "VALKEY_DATABASE": config.database,
         "VALKEY_OVERRIDES_FILE": OVERRIDES_MOUNT_PATH if config.valkey_overrides_file else None,
-        "VALKEY_AOF_ENABLED": _bool_to_yes_no(config.aof_enabled),
+        "VALKEY_AOF_ENABLED": _bool_to_yes_no(effective_aof_enabled(config)),
         "VALKEY_RDB_POLICY": config.rdb_policy,
         "VALKEY_RDB_POLICY_DISABLED": _bool_to_yes_no(config.rdb_policy_disabled),
         "VALKEY_EXTRA_FLAGS": " ".join(config.extra_flags) if config.extra_flags else None,
@@ -67,7 +401,7 @@ def _build_env(config: Config, overrides: dict[str, str | None] | None = None) -
         "VALKEY_ACLFILE": ACL_MOUNT_PATH if config.acl_file else None,
         # Performance
         "VALKEY_IO_THREADS_DO_READS": _bool_to_yes_no(config.io_threads_do_reads),
-        "VALKEY_IO_THREADS": str(config.io_threads) if config.io_threads is not None else None,
+        "VALKEY_IO_THREADS": str(io_threads) if io_threads is not None else None,
         # TLS/SSL
         "VALKEY_TLS_ENABLED": _bool_to_yes_no(config.tls_enabled),
         "VALKEY_TLS_PORT_NUMBER": str(config.tls_port_number) if config.tls_port_number is not None else None,
@@ -84,6 +418,8 @@ def _build_env(config: Config, overrides: dict[str, str | None] | None = None) -
         "VALKEY_SENTINEL_PORT_NUMBER": str(config.valkey_sentinel_port_number)
         if config.valkey_sentinel_port_number is not None
         else None,
+        # Changes whenever the generated valkey.conf changes, so the container is recreated
+        "VALKEY_PULUMI_CONFIG_DIGEST": config_digest(config),
     }
 
     if overrides:
@@ -98,11 +434,62 @@ def _build_env(config: Config, overrides: dict[str, str | None] | None = None) -
     return env_vars
 
 
-def _file_mounts(config: Config) -> list[docker.ContainerVolumeArgs]:
-    """Create file/directory mounts (TLS, ACL, config) for a container."""
+def _persistence_role_config(config: Config, persists: bool) -> Config:
+    """Resolve a ``replica-only-persistence`` preset for one container.
+
+    The container that keeps the data set on disk gets ``aof-everysec``; every other container
+    gets ``none``. Configs with any other preset are returned unchanged.
+    """
+    if config.persistence_preset != REPLICA_ONLY_PERSISTENCE:
+        return config
+    resolved = copy.copy(config)
+    resolved.persistence_preset = "aof-everysec" if persists else "none"
+    return resolved
+
+
+def _warn_replica_only_primary(config: Config, primary_name: str) -> None:
+    """Warn when a primary without persistence restarts on its own.
+
+    A restarted primary comes back with an empty data set and its replicas resync to it,
+    wiping the only persisted copy.
+    """
+    if config.persistence_preset == REPLICA_ONLY_PERSISTENCE and config.restart_policy != "no":
+        pulumi.log.warn(
+            f"{primary_name}: with replica-only persistence an automatically restarted primary comes "
+            "back empty and its replicas discard their data; set restart_policy to 'no' or promote "
+            "a replica before restarting it"
+        )
+
+
+def _generated_tls_material(config: Config) -> pulumi.Output[str] | None:
+    """Return the host directory of the generated TLS material a Config points at, if any."""
+    if not config.tls_cert_file:
+        return None
+    return _TLS_MATERIAL.get(os.path.dirname(os.path.abspath(config.tls_cert_file)))
+
+
+def _file_mounts(config: Config, name: str | None = None) -> list[docker.ContainerVolumeArgs]:
+    """Create file/directory mounts (TLS, ACL, config) for a container.
+
+    When ``name`` is given and the Config calls for tuning directives, a generated valkey.conf
+    (which already includes ``valkey_config_file``) is written for that container and mounted
+    in place of the user's file. Generated TLS material (``tls_generate``) is mounted as one
+    directory instead of file by file.
+    """
     mounts: list[docker.ContainerVolumeArgs] = []
 
-    if config.tls_cert_file:
+    generated_tls = _generated_tls_material(config)
+    if generated_tls is not None:
+        # Generated CA, certificate and key share one directory
+        mounts.append(
+            docker.ContainerVolumeArgs(
+                container_path=os.path.dirname(os.path.abspath(config.tls_cert_file)),
+                host_path=generated_tls,
+                volume_name=None,
+                read_only=True,
+            )
+        )
+    if config.tls_cert_file and generated_tls is None:
         mounts.append(
             docker.ContainerVolumeArgs(
                 container_path=os.path.abspath(config.tls_cert_file),
@@ -111,7 +498,7 @@ def _file_mounts(config: Config) -> list[docker.ContainerVolumeArgs]:
                 read_only=True,
             )
         )
-    if config.tls_key_file:
+    if config.tls_key_file and generated_tls is None:
         mounts.append(
             docker.ContainerVolumeArgs(
                 container_path=os.path.abspath(config.tls_key_file),
@@ -120,7 +507,7 @@ def _file_mounts(config: Config) -> list[docker.ContainerVolumeArgs]:
                 read_only=True,
             )
         )
-    if config.tls_ca_file:
+    if config.tls_ca_file and generated_tls is None:
         mounts.append(
             docker.ContainerVolumeArgs(
                 container_path=os.path.abspath(config.tls_ca_file),
@@ -158,11 +545,12 @@ def _file_mounts(config: Config) -> list[docker.ContainerVolumeArgs]:
             )
         )
 
-    if config.valkey_config_file:
+    generated_config = write_valkey_conf(config, name) if name else None
+    if generated_config or config.valkey_config_file:
         mounts.append(
             docker.ContainerVolumeArgs(
                 container_path=CONFIG_MOUNT_PATH,
-                host_path=os.path.abspath(config.valkey_config_file),
+                host_path=generated_config or os.path.abspath(config.valkey_config_file),
                 volume_name=None,
                 read_only=True,
             )
@@ -181,65 +569,986 @@ def _file_mounts(config: Config) -> list[docker.ContainerVolumeArgs]:
     return mounts
 
 
-class ValkeyStandalone:
-    """Standalone Valkey deployment using Docker."""
+def _data_placement(config: Config) -> str | None:
+    """Resolve where a container keeps its data directory: ``volume``, ``bind``, ``tmpfs`` or nowhere.
+
+    Without ``data_placement``, ``host_data_path`` selects a bind mount and
+    ``persistence_enabled`` a named volume, as before placement modes existed.
+    """
+    if config.data_placement is None:
+        if config.host_data_path or config.host_data_paths:
+            return "bind"
+        return "volume" if config.persistence_enabled else None
+    if config.data_placement not in DATA_PLACEMENTS:
+        raise ValueError(f"Invalid data_placement '{config.data_placement}'. Available: {', '.join(DATA_PLACEMENTS)}")
+    if config.data_placement == "bind" and not (config.host_data_path or config.host_data_paths):
+        raise ValueError("data_placement 'bind' requires host_data_path or host_data_paths")
+    return config.data_placement
+
+
+def _tmpfs_options(config: Config, name: str) -> str:
+    """Build the tmpfs mount options for a data directory, sized from ``maxmemory``.
+
+    A dump of the dataset is at most about ``maxmemory``, and tmpfs pages count against the
+    container memory limit, so the size is never left unbounded when it can be derived.
+    """
+    if config.tmpfs_size is not None:
+        size = parse_size(config.tmpfs_size)
+    elif config.maxmemory is not None:
+        size = parse_size(config.maxmemory)
+    else:
+        size = derived_maxmemory(config)
+    if size is None:
+        pulumi.log.warn(f"{name}: tmpfs data directory has no size limit; set tmpfs_size, maxmemory or memory_limit")
+        return "rw"
+    return f"rw,size={size}"
+
+
+def _bind_mount(container_path: str, host_path: str) -> docker.ContainerVolumeArgs:
+    return docker.ContainerVolumeArgs(
+        container_path=container_path,
+        host_path=os.path.abspath(host_path),
+        volume_name=None,
+        read_only=False,
+    )
+
+
+def _volume_mount(container_path: str, volume: docker.Volume) -> docker.ContainerVolumeArgs:
+    return docker.ContainerVolumeArgs(
+        container_path=container_path,
+        volume_name=volume.name,
+        host_path=None,
+        read_only=False,
+    )
+
+
+def _host_data_root(config: Config, index: int = 0) -> str:
+    """Return the host directory holding the ``index``-th container's data subdirectory.
+
+    ``host_data_paths`` spreads containers round-robin over several disks, numbered like
+    ``node_cpusets``; otherwise every container uses ``host_data_path``.
+    """
+    if config.host_data_paths:
+        return config.host_data_paths[index % len(config.host_data_paths)]
+    return config.host_data_path
+
+
+def _data_storage(
+    config: Config, container_name: str, volume_name: str, index: int = 0, shared_host_path: bool = False
+) -> tuple[list[docker.ContainerVolumeArgs], list[docker.Volume], dict[str, str] | None]:
+    """Build the data and AOF mounts of a Valkey container according to its placement.
+
+    Bind placement uses ``<host data root>/<container_name>`` so containers never share data
+    files. With ``shared_host_path``, a ``host_data_path`` given without an explicit
+    ``data_placement`` is mounted as is, which standalone instances have always done.
+    ``aof_placement`` mounts the AOF directory separately so fsyncs do not compete with RDB
+    dumps.
+
+    Args:
+        config: Configuration of the container
+        container_name: Container name, used for bind subdirectories and the AOF volume
+        volume_name: Name of the data volume when placed on a volume
+        index: Position of the container in its topology, used to pick from ``host_data_paths``
+        shared_host_path: Mount a legacy ``host_data_path`` without a per-container subdirectory
+
+    Returns:
+        ``(mounts, volumes, tmpfs)``: the container mounts, the docker.Volume resources they
+        use and the ``tmpfs`` argument for docker.Container (None unless placed on tmpfs)
+
+    """
+    placement = _data_placement(config)
+    mounts: list[docker.ContainerVolumeArgs] = []
+    volumes: list[docker.Volume] = []
+    tmpfs = None
+
+    if placement == "tmpfs":
+        if effective_aof_enabled(config) or config.aof_placement:
+            pulumi.log.warn(f"{container_name}: persistence files on tmpfs are lost when the container is removed")
+        tmpfs = {config.valkey_data_dir: _tmpfs_options(config, container_name)}
+    elif placement == "bind":
+        if shared_host_path and config.data_placement is None and not config.host_data_paths:
+            mounts.append(_bind_mount(config.valkey_data_dir, config.host_data_path))
+        else:
+            root = _host_data_root(config, index)
+            mounts.append(_bind_mount(config.valkey_data_dir, os.path.join(root, container_name)))
+    elif placement == "volume":
+        volume = docker.Volume(volume_name, name=volume_name, driver="local")
+        volumes.append(volume)
+        mounts.append(_volume_mount(config.valkey_data_dir, volume))
+
+    if config.aof_placement:
+        aof_path = f"{config.valkey_data_dir}/{AOF_DIRNAME}"
+        if config.aof_placement not in AOF_PLACEMENTS:
+            raise ValueError(f"Invalid aof_placement '{config.aof_placement}'. Available: {', '.join(AOF_PLACEMENTS)}")
+        if config.aof_placement == "bind":
+            if not config.aof_host_path:
+                raise ValueError("aof_placement 'bind' requires aof_host_path")
+            mounts.append(_bind_mount(aof_path, os.path.join(config.aof_host_path, container_name)))
+        else:
+            aof_volume = docker.Volume(f"{container_name}_aof", name=f"{container_name}_aof", driver="local")
+            volumes.append(aof_volume)
+            mounts.append(_volume_mount(aof_path, aof_volume))
+
+    return mounts, volumes, tmpfs
+
+
+def _seed_job(
+    config: Config, container_name: str, image: docker.RemoteImage, data_mounts: list[docker.ContainerVolumeArgs]
+) -> docker.Container | None:
+    """Create the one-shot job that seeds an empty data directory from an RDB snapshot.
+
+    The snapshot comes from ``seed_rdb_file`` on the host or ``dump.rdb`` at the root of the
+    existing ``seed_volume``. It is copied into ``valkey_data_dir`` only when the directory has
+    neither a ``dump.rdb`` nor an AOF manifest, so a container that already holds data is never
+    overwritten. With AOF on, Valkey loads the AOF and ignores ``dump.rdb``, so the snapshot
+    becomes the base file of a fresh multi-part AOF instead. Returns None when no seed is
+    configured.
+
+    Raises:
+        ValueError: If both seed sources are set, the seed file does not exist, or the data
+            directory is not on a volume or bind mount the job can share.
+
+    """
+    if not config.seed_rdb_file and not config.seed_volume:
+        return None
+    if config.seed_rdb_file and config.seed_volume:
+        raise ValueError(f"{container_name}: set either seed_rdb_file or seed_volume, not both")
+    if _data_placement(config) not in ("volume", "bind"):
+        raise ValueError(f"{container_name}: seeding needs the data directory on a volume or bind mount")
+    if config.seed_rdb_file:
+        if not os.path.isfile(config.seed_rdb_file):
+            raise ValueError(f"{container_name}: seed_rdb_file {config.seed_rdb_file} does not exist")
+        source = docker.ContainerVolumeArgs(
+            container_path=SEED_MOUNT_PATH + "/dump.rdb",
+            host_path=os.path.abspath(config.seed_rdb_file),
+            volume_name=None,
+            read_only=True,
+        )
+    else:
+        source = docker.ContainerVolumeArgs(
+            container_path=SEED_MOUNT_PATH, volume_name=config.seed_volume, host_path=None, read_only=True
+        )
+
+    data = config.valkey_data_dir
+    aof_dir = f"{data}/{AOF_DIRNAME}"
+    lines = [
+        "set -eu",
+        f'if [ -e "{data}/dump.rdb" ] || ls "{aof_dir}"/*.manifest >/dev/null 2>&1; then',
+        f'  echo "{data} already holds data; not seeding"',
+        "  exit 0",
+        "fi",
+    ]
+    # Copy under a temporary name so Valkey never sees a partial file
+    if effective_aof_enabled(config):
+        base = f"{AOF_FILENAME}.1.base.rdb"
+        lines += [
+            f'mkdir -p "{aof_dir}"',
+            f'cp "{SEED_MOUNT_PATH}/dump.rdb" "{aof_dir}/{base}.seeding"',
+            f'mv "{aof_dir}/{base}.seeding" "{aof_dir}/{base}"',
+            # The manifest goes last: without it Valkey does not load the directory
+            f"printf 'file {base} seq 1 type b\\n' > \"{aof_dir}/{AOF_FILENAME}.manifest\"",
+        ]
+    else:
+        lines += [
+            f'cp "{SEED_MOUNT_PATH}/dump.rdb" "{data}/dump.rdb.seeding"',
+            f'mv "{data}/dump.rdb.seeding" "{data}/dump.rdb"',
+        ]
+    lines.append(f'echo "Seeded {data} from the snapshot"')
+    script = "\n".join(lines)
+    job_name = f"{container_name}-seed"
+    return docker.Container(
+        job_name,
+        name=job_name,
+        image=image.repo_digest,
+        command=["/bin/bash", "-c", script + "\n"],
+        volumes=[*data_mounts, source],
+        network_mode="none",
+        attach=True,
+        logs=True,
+        must_run=False,
+        restart="no",
+    )
+
+
+def _node_cpuset(config: Config, index: int = 0) -> str | None:
+    """Return the cpuset for the ``index``-th container built from a Config."""
+    if config.node_cpusets:
+        return config.node_cpusets[index % len(config.node_cpusets)]
+    return config.cpuset_cpus
+
+
+def _cpuset_size(cpuset: str) -> int:
+    """Count the CPUs in a cpuset specification such as ``"0-3,8"``."""
+    count = 0
+    for part in cpuset.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        count += int(last) - int(first) + 1 if last else 1
+    return count
+
+
+def _allocated_cpus(config: Config, index: int = 0) -> int:
+    """Return how many CPUs the ``index``-th container can use.
+
+    The cpuset wins over the CPU quota; without either, the host core count of the machine
+    running Pulumi is used, which assumes a local Docker daemon.
+    """
+    cpuset = _node_cpuset(config, index)
+    if cpuset:
+        return _cpuset_size(cpuset)
+    if config.cpus is not None:
+        return max(1, math.ceil(float(config.cpus)))
+    return os.cpu_count() or 1
+
+
+def _effective_io_threads(config: Config, index: int = 0) -> int | None:
+    """Resolve ``io_threads`` for a container, computing it from its CPUs when set to ``"auto"``.
+
+    Following the valkey.conf guidance, small containers leave one core to the main thread,
+    larger ones leave two for the main thread and background work, and the total is capped
+    at ``IO_THREADS_RECOMMENDED_MAX``.
+    """
+    if config.io_threads is None:
+        return None
+    if str(config.io_threads).lower() != "auto":
+        return int(config.io_threads)
+    cpus = _allocated_cpus(config, index)
+    spare = 1 if cpus <= 4 else 2
+    return max(1, min(IO_THREADS_RECOMMENDED_MAX, cpus - spare))
+
+
+def _resource_args(config: Config, index: int = 0) -> dict[str, Any]:
+    """Build the docker.Container CPU, memory, ulimit and sysctl arguments for a container.
+
+    Args:
+        config: Configuration of the container
+        index: Position of the container in its topology, used to pick from ``node_cpusets``
+
+    Returns:
+        Keyword arguments for docker.Container (sizes in MB, as the provider expects)
+
+    """
+    memory_mb = parse_size(config.memory_limit) // 1024**2 if config.memory_limit is not None else None
+    args: dict[str, Any] = {
+        "cpu_set": _node_cpuset(config, index),
+        "cpus": config.cpus,
+        "cpu_shares": config.cpu_shares,
+        "memory": memory_mb,
+        "memory_reservation": parse_size(config.memory_reservation) // 1024**2
+        if config.memory_reservation is not None
+        else None,
+        # A swap limit equal to the memory limit leaves the container no swap at all
+        "memory_swap": memory_mb if config.swap_disabled and memory_mb is not None else None,
+        "shm_size": parse_size(config.shm_size) // 1024**2 if config.shm_size is not None else None,
+        "ulimits": [docker.ContainerUlimitArgs(name="nofile", soft=config.nofile_ulimit, hard=config.nofile_ulimit)]
+        if config.nofile_ulimit
+        else None,
+        # Namespaced per container, so Docker allows it without touching the host
+        "sysctls": {"net.core.somaxconn": str(config.somaxconn)}
+        if config.somaxconn is not None and not _host_network(config)
+        else None,
+    }
+    if config.swap_disabled and memory_mb is None:
+        pulumi.log.warn("swap_disabled has no effect without memory_limit")
+    if config.somaxconn is not None and _host_network(config):
+        # Docker rejects net.* sysctls for containers in the host network namespace
+        pulumi.log.warn("somaxconn is not applied with network_mode 'host'; set net.core.somaxconn on the host")
+    return {key: value for key, value in args.items() if value is not None}
+
+
+def _cli_auth_line(variable: str) -> str:
+    """Return the shell line that hands the password in ``$variable`` to valkey-cli.
+
+    valkey-cli sends ``AUTH`` whenever ``VALKEYCLI_AUTH`` is set, even to an empty string, and a
+    passwordless server rejects that, so the variable is only exported for a non-empty password.
+    """
+    return f'if [ -n "${{{variable}:-}}" ]; then export VALKEYCLI_AUTH="${variable}"; fi'
+
+
+def _readiness_args(config: Config, replica: bool = False) -> dict[str, Any]:
+    """Build the docker.Container health check and ``wait`` arguments for a Valkey container.
+
+    The container is healthy once it answers PING and reports ``loading:0`` (the AOF/RDB is
+    fully loaded) and, for replicas, ``master_link_status:up``. With ``wait=True`` Pulumi only
+    finishes the container, and starts the resources that depend on it, once it is healthy.
+    Replicas may take ``replica_sync_timeout`` for their initial full sync and everything else
+    ``startup_timeout`` to load its dataset; unhealthy probes during that period do not count.
+    """
+    if not config.healthcheck_enabled:
+        return {}
+    probe = (
+        f"{_cli_auth_line('VALKEY_PASSWORD')}; "
+        f'cli() {{ valkey-cli {_cli_args(config)} -p {_client_port(config)} "$@"; }}; '
+        "cli PING | grep -q PONG && cli INFO persistence | grep -q '^loading:0'"
+    )
+    if replica:
+        probe += " && cli INFO replication | grep -q '^master_link_status:up'"
+    timeout = config.replica_sync_timeout if replica else config.startup_timeout
+    return {
+        "healthcheck": _healthcheck(config, probe, timeout),
+        "wait": True,
+        "wait_timeout": timeout,
+    }
+
+
+def _healthcheck(config: Config, probe: str, start_period: int) -> docker.ContainerHealthcheckArgs:
+    """Wrap a shell probe in a docker health check using the configured interval, timeout and retries."""
+    return docker.ContainerHealthcheckArgs(
+        tests=["CMD-SHELL", probe],
+        interval=f"{config.healthcheck_interval}s",
+        timeout=f"{config.healthcheck_timeout}s",
+        retries=config.healthcheck_retries,
+        start_period=f"{start_period}s",
+    )
+
+
+def _manifest_endpoint(host: str, config: Config, published_port: int, role: str, read_weight: int) -> dict[str, Any]:
+    """Describe one Valkey container for the topology manifest."""
+    return {
+        "host": host,
+        "port": _client_port(config),
+        "published_port": published_port,
+        "role": role,
+        "read_only": role != "primary",
+        "read_weight": read_weight,
+        "tls": bool(config.tls_enabled),
+    }
+
+
+def _sync_waves(replica_count: int, concurrency: int) -> list[range]:
+    """Split replica indexes into waves of at most ``concurrency`` (all at once when < 1)."""
+    if concurrency < 1:
+        concurrency = max(replica_count, 1)
+    return [range(start, min(start + concurrency, replica_count)) for start in range(0, replica_count, concurrency)]
+
+
+def _warn_tcp_backlog(config: Config, name: str) -> None:
+    """Warn at preview time when ``tcp-backlog`` would be truncated by ``somaxconn``."""
+    mismatch = tcp_backlog_exceeds_somaxconn(config)
+    if mismatch:
+        backlog, somaxconn = mismatch
+        pulumi.log.warn(
+            f"{name}: tcp-backlog {backlog} exceeds net.core.somaxconn {somaxconn}; "
+            "the kernel will truncate the accept queue. Set somaxconn to at least the backlog."
+        )
+
+
+def _host_tuning_script(config: Config) -> str:
+    """Build the shell script that applies host-wide kernel settings for Valkey."""
+    lines = ["set -e"]
+    if config.transparent_hugepages:
+        # THP makes fork() for RDB saves and AOF rewrites copy 2 MB pages on write
+        for knob in ("enabled", "defrag"):
+            lines.append(f"echo {config.transparent_hugepages} > /sys/kernel/mm/transparent_hugepage/{knob}")
+    if config.vm_overcommit_memory is not None:
+        # Without overcommit, background saves fail once the dataset exceeds half the free memory
+        lines.append(f"sysctl -w vm.overcommit_memory={config.vm_overcommit_memory}")
+    if config.somaxconn is not None:
+        lines.append(f"sysctl -w net.core.somaxconn={config.somaxconn}")
+    return "\n".join(lines)
+
+
+def _client_port(config: Config) -> int:
+    """Return the port clients (and valkey-cli) should connect to."""
+    return config.tls_port_number if config.tls_enabled else config.port
+
+
+def _replication_port(primary: Config, replica: Config) -> int:
+    """Return the port a replica syncs from: the primary's TLS port when the replica sets ``tls_replication``."""
+    if primary.tls_enabled and replica.tls_enabled and replica.tls_replication:
+        return primary.tls_port_number
+    return primary.port
+
+
+def _tls_client_args(config: Config) -> list[str]:
+    """Build the client TLS flags shared by valkey-cli and valkey-benchmark."""
+    args: list[str] = []
+    if config.tls_enabled:
+        args.append("--tls")
+        if config.tls_ca_file:
+            args.append(f"--cacert {os.path.abspath(config.tls_ca_file)}")
+        if config.tls_ca_dir:
+            args.append(f"--cacertdir {os.path.abspath(config.tls_ca_dir)}")
+        if config.tls_cert_file:
+            args.append(f"--cert {os.path.abspath(config.tls_cert_file)}")
+        if config.tls_key_file:
+            args.append(f"--key {os.path.abspath(config.tls_key_file)}")
+    return args
+
+
+def _cli_args(config: Config) -> str:
+    """Build the valkey-cli connection flags (TLS material) for a Config."""
+    return " ".join(["--no-auth-warning", *_tls_client_args(config)])
+
+
+def _cluster_slot_ranges(primary_count: int) -> list[tuple[int, int]]:
+    """Split the cluster hash slots evenly into one inclusive range per primary."""
+    if primary_count < 1:
+        raise ValueError("A Valkey cluster needs at least one primary")
+    base, remainder = divmod(CLUSTER_HASH_SLOTS, primary_count)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    for i in range(primary_count):
+        size = base + (1 if i < remainder else 0)
+        ranges.append((start, start + size - 1))
+        start += size
+    return ranges
+
+
+def _cluster_bootstrap_script(
+    primaries: list[str], replicas: dict[str, str], port: int, cli_args: str = "--no-auth-warning"
+) -> str:
+    """Build the one-shot shell script that forms a cluster from freshly started nodes.
+
+    Every step checks the node's own view first: primaries that already own slots are not given
+    them again, nodes the seed already knows are not met again and replicas that already follow
+    their primary are not re-attached. A run that stopped halfway picks up where it left off.
+
+    Args:
+        primaries: Hostnames of the primary nodes, in slot order
+        replicas: Mapping of replica hostname to the hostname of the primary it follows
+        port: Port every node listens on
+        cli_args: Extra valkey-cli flags (auth warning, TLS material)
+
+    Returns:
+        A bash script that is safe to re-run against a partly or fully bootstrapped cluster
+
+    """
+    nodes = [*primaries, *replicas]
+    seed = primaries[0]
+    lines = [
+        "set -euo pipefail",
+        f'cli() {{ host="$1"; shift; valkey-cli {cli_args} -h "$host" -p {port} "$@"; }}',
+        # The "myself" line of CLUSTER NODES: id, address, flags, primary id, ..., owned slots
+        "myself() { cli \"$1\" CLUSTER NODES | tr -d '\\r' | awk '$3 ~ /myself/'; }",
+        f"for node in {' '.join(nodes)}; do",
+        '  until cli "$node" PING 2>/dev/null | grep -q PONG; do sleep 1; done',
+        "done",
+        f"if cli {seed} CLUSTER INFO | tr -d '\\r' | grep -q '^cluster_slots_assigned:{CLUSTER_HASH_SLOTS}$'; then",
+        '  echo "Cluster already bootstrapped"',
+        "  exit 0",
+        "fi",
+    ]
+    for host, (first, last) in zip(primaries, _cluster_slot_ranges(len(primaries)), strict=True):
+        lines.append(
+            f"if ! myself {host} | awk '{{exit !(NF > 8)}}'; then cli {host} CLUSTER ADDSLOTSRANGE {first} {last}; fi"
+        )
+    lines.append(f"seed_ip=$(getent hosts {seed} | awk '{{print $1}}')")
+    for host in nodes[1:]:
+        lines.append(f"node_id=$(cli {host} CLUSTER MYID | tr -d '\\r')")
+        lines.append(
+            f"if ! cli {seed} CLUSTER NODES | tr -d '\\r' | grep -q \"^$node_id \"; then "
+            f'cli {host} CLUSTER MEET "$seed_ip" {port}; fi'
+        )
+    lines.append(
+        f"until [ \"$(cli {seed} CLUSTER INFO | tr -d '\\r' | sed -n 's/^cluster_known_nodes://p')\" = \"{len(nodes)}\" ]; "
+        "do sleep 1; done"
+    )
+    for replica, primary in replicas.items():
+        lines.append(f"primary_id=$(cli {primary} CLUSTER MYID | tr -d '\\r')")
+        lines.append(
+            f'if [ "$(myself {replica} | awk \'{{print $4}}\')" != "$primary_id" ]; then\n'
+            f'  until cli {replica} CLUSTER REPLICATE "$primary_id" | grep -q OK; do sleep 1; done\n'
+            "fi"
+        )
+    lines.append(f"until cli {seed} CLUSTER INFO | tr -d '\\r' | grep -q '^cluster_state:ok$'; do sleep 1; done")
+    lines.append('echo "Cluster bootstrapped"')
+    return "\n".join(lines) + "\n"
+
+
+def _benchmark_script(
+    port: int,
+    tls_args: list[str],
+    clients: int,
+    requests: int,
+    pipeline: int,
+    data_size: int,
+    tests: list[str],
+    keyspace: int | None = None,
+    threads: int | None = None,
+    cluster: bool = False,
+    wait_timeout: int = 300,
+) -> str:
+    """Build the one-shot shell script that runs valkey-benchmark against 127.0.0.1.
+
+    The password is read from ``VALKEY_BENCHMARK_AUTH``, so it stays out of the container
+    command Pulumi stores and shows. valkey-benchmark only takes it as ``-a``, so it is in that
+    process's argv, visible to ``ps`` inside the container. The script gives up, and fails the run, if the target does not answer PING within
+    ``wait_timeout`` seconds.
+    """
+    flags = [
+        f"-h 127.0.0.1 -p {port}",
+        *tls_args,
+        '${VALKEY_BENCHMARK_AUTH:+-a "$VALKEY_BENCHMARK_AUTH"}',
+        "--csv",
+        f"-c {clients}",
+        f"-n {requests}",
+        f"-P {pipeline}",
+        f"-d {data_size}",
+        f"-t {','.join(tests)}",
+    ]
+    if keyspace:
+        flags.append(f"-r {keyspace}")
+    if threads:
+        flags.append(f"--threads {threads}")
+    if cluster:
+        flags.append("--cluster")
+    cli_args = " ".join(["--no-auth-warning", *tls_args])
+    return "\n".join(
+        [
+            "set -eu",
+            _cli_auth_line("VALKEY_BENCHMARK_AUTH"),
+            f"deadline=$((SECONDS + {wait_timeout}))",
+            f"until valkey-cli {cli_args} -h 127.0.0.1 -p {port} PING 2>/dev/null | grep -q PONG; do",
+            '  if [ "$SECONDS" -ge "$deadline" ]; then',
+            f'    echo "Valkey on 127.0.0.1:{port} did not answer PING within {wait_timeout}s" >&2',
+            "    exit 1",
+            "  fi",
+            "  sleep 1",
+            "done",
+            f"exec valkey-benchmark {' '.join(flags)}",
+        ]
+    )
+
+
+def _backup_script(schedule: CronSchedule, port: int, cli_args: str, prefix: str, keep: int) -> str:
+    """Build the loop of the backup sidecar.
+
+    Every minute that matches ``schedule``, ``valkey-cli --rdb -`` asks the Valkey server at
+    ``127.0.0.1:port`` for a full RDB, exactly as a new replica would. The server forks and
+    streams the snapshot, which is gzipped straight into ``<prefix>-<UTC timestamp>.rdb.gz``.
+    Files are written under a hidden temporary name and renamed once complete. ``LATEST`` names
+    the newest file, and only the ``keep`` newest generations are kept.
+    """
+
+    def words(values: tuple[int, ...]) -> str:
+        return " ".join(str(value) for value in values)
+
+    day_test = "||" if schedule.days_restricted and schedule.weekdays_restricted else "&&"
+    lines = [
+        "set -uo pipefail",
+        _valkey_cli_function(cli_args),
+        'within() { case " $1 " in *" $2 "*) return 0 ;; esac; return 1; }',
+        "due() {",
+        '  read -r minute hour day month weekday <<< "$(date -u "+%-M %-H %-d %-m %w")"',
+        f'  within "{words(schedule.minutes)}" "$minute" && within "{words(schedule.hours)}" "$hour" &&',
+        f'    within "{words(schedule.months)}" "$month" &&',
+        f'    {{ within "{words(schedule.days)}" "$day" {day_test} within "{words(schedule.weekdays)}" "$weekday"; }}',
+        "}",
+        "backup() {",
+        f'  file="{prefix}-$(date -u +%Y%m%dT%H%M%SZ).rdb.gz"',
+        f'  partial="{BACKUP_MOUNT_PATH}/.$file.partial"',
+        f'  if ! cli -h 127.0.0.1 -p {port} --rdb - | gzip -c > "$partial"; then',
+        '    rm -f "$partial"',
+        '    echo "Backup $file failed" >&2',
+        "    return 1",
+        "  fi",
+        f'  mv "$partial" "{BACKUP_MOUNT_PATH}/$file"',
+        f'  printf "%s\\n" "$file" > "{BACKUP_MOUNT_PATH}/.{BACKUP_LATEST_FILENAME}"',
+        f'  mv "{BACKUP_MOUNT_PATH}/.{BACKUP_LATEST_FILENAME}" "{BACKUP_MOUNT_PATH}/{BACKUP_LATEST_FILENAME}"',
+        f'  ls -1 "{BACKUP_MOUNT_PATH}"/{prefix}-*.rdb.gz | sort | head -n -{keep} | xargs -r rm -f',
+        '  echo "Backed up to $file"',
+        "}",
+        'last=""',
+        "while true; do",
+        '  now="$(date -u +%Y%m%d%H%M)"',
+        '  if [ "$now" != "$last" ] && due; then',
+        '    last="$now"',
+        "    backup",
+        "  fi",
+        '  sleep "$((60 - 10#$(date -u +%S)))"',
+        "done",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _metrics_exporter(
+    name: str,
+    config: Config,
+    target_host: str,
+    network: docker.Network | None,
+    host_port: int,
+    depends_on: list[pulumi.Resource],
+) -> docker.Container:
+    """Create a Prometheus exporter container that scrapes one Valkey container over ``network``.
+
+    The exporter logs in as ``exporter_user`` (or the default user) with ``exporter_password``
+    (or the server password) and reuses the TLS material mounted by ``_file_mounts``; it joins
+    ``TLS_KEY_GROUP`` to read a generated key. With ``network_mode: host`` it shares the host
+    network and listens on ``host_port`` directly.
+    """
+    host_network = _host_network(config)
+    tls = config.tls_enabled
+    env = {
+        "REDIS_ADDR": f"{'rediss' if tls else 'redis'}://{target_host}:{_client_port(config)}",
+        "REDIS_USER": config.exporter_user,
+        "REDIS_PASSWORD": config.exporter_password or config.password,
+        "REDIS_EXPORTER_WEB_LISTEN_ADDRESS": f":{host_port if host_network else config.exporter_port}",
+        "REDIS_EXPORTER_TLS_CA_CERT_FILE": os.path.abspath(config.tls_ca_file) if tls and config.tls_ca_file else None,
+        "REDIS_EXPORTER_TLS_CLIENT_CERT_FILE": os.path.abspath(config.tls_cert_file)
+        if tls and config.tls_cert_file
+        else None,
+        "REDIS_EXPORTER_TLS_CLIENT_KEY_FILE": os.path.abspath(config.tls_key_file)
+        if tls and config.tls_key_file
+        else None,
+    }
+    image = _remote_image(config.exporter_image)
+    return docker.Container(
+        name,
+        name=name,
+        image=image.repo_digest,
+        envs=_env_args(env),
+        restart=config.restart_policy,
+        volumes=_file_mounts(config),
+        group_adds=[str(TLS_KEY_GROUP)] if tls and _generated_tls_material(config) is not None else None,
+        opts=pulumi.ResourceOptions(depends_on=depends_on),
+        **(
+            {"network_mode": "host"}
+            if host_network
+            else {
+                "ports": [docker.ContainerPortArgs(internal=config.exporter_port, external=host_port)],
+                "networks_advanced": [docker.ContainerNetworksAdvancedArgs(name=network.name, aliases=[name])],
+            }
+        ),
+    )
+
+
+def _metrics_endpoints(config: Config, exporter_name: str, host_port: int) -> tuple[str, str]:
+    """Return where an exporter is scraped from: the Docker host, and the component's network.
+
+    From the host it answers on its published ``host_port``. On the network it is reached by
+    name on ``exporter_port``, or at ``host_address`` on ``host_port`` with ``network_mode: host``.
+    """
+    network_port = host_port if _host_network(config) else config.exporter_port
+    return f"localhost:{host_port}", f"{_reachable_host(config, exporter_name)}:{network_port}"
+
+
+def _sentinel_script(
+    sentinel_name: str,
+    config: Config,
+    primary_name: str,
+    primary_host: str,
+    quorum: int,
+) -> str:
+    """Build the entry script for one Sentinel container.
+
+    Sentinel rewrites its config file with the current primary, known replicas and epochs, so
+    the file is only seeded on first start and kept in the data directory. The tunables are
+    applied with ``SENTINEL SET`` on every start, which lets a changed stack config reach
+    Sentinels that already hold state. The primary password is read from
+    ``VALKEY_PRIMARY_PASSWORD`` and never written to the command line.
+    """
+    port = config.valkey_sentinel_port_number
+    conf = f"{config.valkey_data_dir}/sentinel.conf"
+    seed = [
+        f"port {port}",
+        f"dir {config.valkey_data_dir}",
+        "sentinel resolve-hostnames yes",
+        "sentinel announce-hostnames yes",
+        f"sentinel announce-ip {sentinel_name}",
+        f"sentinel announce-port {port}",
+        f"sentinel monitor {primary_name} {primary_host} {config.port} {quorum}",
+    ]
+    tunables = (
+        f"down-after-milliseconds {config.sentinel_down_after_milliseconds} "
+        f"failover-timeout {config.sentinel_failover_timeout} "
+        f"parallel-syncs {config.sentinel_parallel_syncs} "
+        f"quorum {quorum}"
+    )
+    lines = [
+        "set -eu",
+        f'conf="{conf}"',
+        'if [ ! -s "$conf" ]; then',
+        "  cat > \"$conf\" <<'EOF'",
+        *seed,
+        "EOF",
+        "fi",
+        'valkey-server "$conf" --sentinel &',
+        "pid=$!",
+        "trap 'kill -TERM \"$pid\"' TERM INT",
+        f"until valkey-cli -p {port} PING 2>/dev/null | grep -q PONG; do sleep 0.2; done",
+        f"valkey-cli -p {port} SENTINEL SET {primary_name} {tunables}",
+        'if [ -n "${VALKEY_PRIMARY_PASSWORD:-}" ]; then',
+        f'  valkey-cli -p {port} SENTINEL SET {primary_name} auth-pass "$VALKEY_PRIMARY_PASSWORD" >/dev/null',
+        "fi",
+        'wait "$pid"',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _valkey_cli_function(cli_args: str) -> str:
+    """Define a ``cli`` shell function that authenticates with ``VALKEY_PASSWORD`` from the environment, if set."""
+    return f'{_cli_auth_line("VALKEY_PASSWORD")}\ncli() {{ valkey-cli {cli_args} "$@"; }}'
+
+
+def _role_scan_lines(endpoints: str) -> list[str]:
+    """Build shell lines that set ``found`` to the first endpoint whose ROLE is master.
+
+    ``endpoints`` expands to ``host:client_port:replication_port`` words; ``found`` stays empty
+    when none of them is a primary.
+    """
+    return [
+        'found=""',
+        f"for endpoint in {endpoints}; do",
+        '  IFS=: read -r host client_port _ <<< "$endpoint"',
+        '  if cli -h "$host" -p "$client_port" ROLE 2>/dev/null | tr -d \'\\r\' | head -n 1 | grep -qx master; then',
+        '    found="$endpoint"',
+        "    break",
+        "  fi",
+        "done",
+    ]
+
+
+def _sentinel_query_lines(sentinels: list[str], primary_name: str, own_host: str) -> list[str]:
+    """Build shell lines that set ``found`` to the primary Sentinel reports, unless that is ``own_host``.
+
+    Sentinels are ``host:port``; ``found`` has the ``host:client_port:replication_port`` form of
+    ``_role_scan_lines`` and stays empty when no Sentinel answers.
+    """
+    return [
+        'found=""',
+        'address=""',
+        f"for sentinel in {' '.join(sentinels)}; do",
+        f'  address=$(valkey-cli -h "${{sentinel%:*}}" -p "${{sentinel##*:}}" SENTINEL get-master-addr-by-name {primary_name} '
+        "2>/dev/null | tr -d '\\r' | paste -sd: -)",
+        '  if [ -n "$address" ]; then break; fi',
+        "done",
+        f'if [ -n "$address" ] && [ "${{address%%:*}}" != "{own_host}" ]; then',
+        '  found="$address:${address##*:}"',
+        "fi",
+    ]
+
+
+def _rolling_start_script(cli_args: str, find_primary: list[str]) -> str:
+    """Build the start script of a replica set primary under ``update_strategy: rolling``.
+
+    When another member holds the primary role (a handoff replaced this container), the
+    container starts as its replica and keeps its dataset warm until the rejoin step hands the
+    role back; otherwise it starts as the primary.
+    """
+    lines = [
+        "set -u",
+        _valkey_cli_function(cli_args),
+        *find_primary,
+        'if [ -n "$found" ]; then',
+        '  IFS=: read -r host _ replication_port <<< "$found"',
+        '  echo "$host holds the primary role; starting as its replica"',
+        '  export VALKEY_REPLICATION_MODE=replica VALKEY_PRIMARY_HOST="$host" VALKEY_PRIMARY_PORT_NUMBER="$replication_port"',
+        '  export VALKEY_PRIMARY_PASSWORD="${VALKEY_PASSWORD:-}"',
+        "fi",
+        f"exec {BITNAMI_START}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _until_role_lines(host: str, port: int, role_test: str, timeout: int, failure: str) -> list[str]:
+    """Build shell lines that poll ``host``'s ROLE until ``role_test`` (a grep on it) succeeds."""
+    return [
+        f"deadline=$((SECONDS + {timeout}))",
+        f"until cli -h {host} -p {port} ROLE 2>/dev/null | tr -d '\\r' | head -n 1 | {role_test}; do",
+        '  if [ "$SECONDS" -ge "$deadline" ]; then',
+        f'    echo "{failure}" >&2',
+        "    exit 1",
+        "  fi",
+        "  sleep 0.2",
+        "done",
+    ]
+
+
+def _handoff_script(host: str, port: int, cli_args: str, failover: list[str], timeout: int) -> str:
+    """Build the one-shot script that moves the primary role off ``host`` before it is replaced.
+
+    Nothing happens when ``host`` is not running (first deployment) or has no connected replica.
+    Otherwise ``failover`` promotes a replica and the script waits until ``host`` is demoted.
+    """
+    lines = [
+        "set -u",
+        _valkey_cli_function(cli_args),
+        f"if ! cli -h {host} -p {port} ROLE 2>/dev/null | tr -d '\\r' | head -n 1 | grep -qx master; then",
+        f'  echo "{host} is not a running primary; nothing to hand off"',
+        "  exit 0",
+        "fi",
+        f"if ! cli -h {host} -p {port} INFO replication | tr -d '\\r' | grep -q '^connected_slaves:[1-9]'; then",
+        f'  echo "{host} has no connected replica; writes stop until it is replaced"',
+        "  exit 0",
+        "fi",
+        *failover,
+        *_until_role_lines(
+            host, port, "grep -qvx master", timeout, f"{host} is still the primary after {timeout} seconds"
+        ),
+        f'echo "{host} handed the primary role off"',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _rejoin_script(host: str, port: int, cli_args: str, endpoints: str, sync_timeout: int, timeout: int) -> str:
+    """Build the one-shot script that hands the primary role back to a replaced primary.
+
+    Waits until ``host`` has synced from the member that took over, then runs ``FAILOVER`` there;
+    Valkey pauses writes until ``host`` has caught up, so no acknowledged write is lost.
+    """
+    lines = [
+        "set -u",
+        _valkey_cli_function(cli_args),
+        f"if cli -h {host} -p {port} ROLE 2>/dev/null | tr -d '\\r' | head -n 1 | grep -qx master; then",
+        f'  echo "{host} is the primary"',
+        "  exit 0",
+        "fi",
+        f"deadline=$((SECONDS + {sync_timeout}))",
+        f"until cli -h {host} -p {port} INFO replication 2>/dev/null | tr -d '\\r' | grep -q '^master_link_status:up'; do",
+        '  if [ "$SECONDS" -ge "$deadline" ]; then',
+        f'    echo "{host} did not sync within {sync_timeout} seconds" >&2',
+        "    exit 1",
+        "  fi",
+        "  sleep 1",
+        "done",
+        *_role_scan_lines(endpoints),
+        'if [ -z "$found" ]; then',
+        '  echo "No replica holds the primary role" >&2',
+        "  exit 1",
+        "fi",
+        'IFS=: read -r current client_port _ <<< "$found"',
+        f'cli -h "$current" -p "$client_port" FAILOVER TIMEOUT {timeout * 1000}',
+        *_until_role_lines(
+            host,
+            port,
+            "grep -qx master",
+            timeout,
+            f"{host} did not take the primary role back within {timeout} seconds",
+        ),
+        f'echo "{host} is the primary again"',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class ValkeyHostTuning:
+    """Host kernel tuning for Valkey hosts using a privileged one-shot container.
+
+    Transparent huge pages, ``vm.overcommit_memory`` and the host's ``net.core.somaxconn``
+    cannot be changed from inside a Valkey container. This runs once in the host's network
+    namespace and is re-run whenever the settings change. Pass it to ``ValkeyStandalone``,
+    ``ValkeyReplicaSet`` or ``ValkeyCluster`` so Valkey starts after it.
+    """
 
     def __init__(self, name: str, config: Config):
         self.name = name
         self.config = config
+        if config.transparent_hugepages and config.transparent_hugepages not in TRANSPARENT_HUGEPAGE_MODES:
+            raise ValueError(
+                f"Invalid transparent_hugepages '{config.transparent_hugepages}'. "
+                f"Available: {', '.join(TRANSPARENT_HUGEPAGE_MODES)}"
+            )
+        self._deploy()
+
+    def _deploy(self):
+        """Deploy the host tuning init container."""
+        script = _host_tuning_script(self.config)
+        image = _remote_image(self.config.host_tuning_image)
+
+        self.container = docker.Container(
+            self.name,
+            name=self.name,
+            image=image.repo_digest,
+            command=["/bin/sh", "-c", script],
+            privileged=True,
+            network_mode="host",
+            attach=True,
+            logs=True,
+            must_run=False,
+            restart="no",
+        )
+
+        pulumi.export(f"{self.name}_script", script)
+
+
+class ValkeyStandalone:
+    """Standalone Valkey deployment using Docker."""
+
+    def __init__(self, name: str, config: Config, host_tuning: ValkeyHostTuning | None = None):
+        self.name = name
+        if config.persistence_preset == REPLICA_ONLY_PERSISTENCE:
+            pulumi.log.warn(f"{name}: a standalone deployment has no replica, so nothing is persisted")
+        _warn_rolling_unsupported(config, name)
+        self.config = _generated_tls_config(
+            _host_network_config(_persistence_role_config(config, persists=False), name), name
+        )
+        self.host_tuning = host_tuning
         self._deploy()
 
     def _deploy(self):
         """Deploy the standalone Valkey container."""
         volume_name = self.config.volume_name or f"{self.name}_data"
 
-        # Create volume/bind for data persistence
-        volumes: list[docker.ContainerVolumeArgs] = []
-        if self.config.host_data_path:
-            volumes.append(
-                docker.ContainerVolumeArgs(
-                    container_path=self.config.valkey_data_dir,
-                    host_path=os.path.abspath(self.config.host_data_path),
-                    volume_name=None,
-                    read_only=False,
-                )
-            )
-        elif self.config.persistence_enabled:
-            self.volume = docker.Volume(volume_name, name=volume_name, driver="local")
-            volumes.append(
-                docker.ContainerVolumeArgs(
-                    container_path=self.config.valkey_data_dir,
-                    volume_name=self.volume.name,
-                    host_path=None,
-                    read_only=False,
-                )
-            )
+        # Create volume/bind/tmpfs for the data directory
+        volumes, data_volumes, tmpfs = _data_storage(self.config, self.name, volume_name, shared_host_path=True)
+        self.volume = data_volumes[0] if data_volumes else None
+        remote_image = _remote_image(self.config.image, [f"{self.name}_image"])
+        self.seed = _seed_job(self.config, self.name, remote_image, list(volumes))
 
         # Add mounts for TLS, ACL, and config files
-        volumes.extend(_file_mounts(self.config))
+        volumes.extend(_file_mounts(self.config, self.name))
+
+        # The exporter reaches Valkey by name, which needs a user-defined network
+        host_network = _host_network(self.config)
+        self.network = None
+        if self.config.exporter_enabled and not host_network:
+            self.network = docker.Network(f"{self.name}_network", name=f"{self.name}_network", driver="bridge")
 
         # Create Valkey container
         depends_on = []
-        if self.config.persistence_enabled and not self.config.host_data_path:
-            depends_on.append(self.volume)
-
-        remote_image = docker.RemoteImage(f"{self.name}_image", name=self.config.image, keep_locally=False)
+        if self.network:
+            depends_on.append(self.network)
+        depends_on.extend(data_volumes)
+        if self.host_tuning:
+            depends_on.append(self.host_tuning.container)
+        if self.seed:
+            depends_on.append(self.seed)
+        _warn_tcp_backlog(self.config, self.name)
 
         self.container = docker.Container(
             self.name,
             name=self.name,
             image=remote_image.repo_digest,
-            ports=[docker.ContainerPortArgs(internal=self.config.port, external=self.config.port)],
             envs=_build_env(self.config),
             restart=self.config.restart_policy,
             volumes=volumes,
+            tmpfs=tmpfs,
             opts=pulumi.ResourceOptions(depends_on=depends_on if depends_on else None),
+            **_network_args(self.config, self.name, self.network),
+            **_resource_args(self.config),
+            **_readiness_args(self.config),
         )
 
+        self.exporter = None
+        exporter_port = (
+            _host_port(self.config, self.name, "exporter", self.config.exporter_port)
+            if self.config.exporter_enabled
+            else None
+        )
+        if self.config.exporter_enabled:
+            self.exporter = _metrics_exporter(
+                f"{self.name}-exporter",
+                self.config,
+                self.config.host_address if host_network else self.name,
+                self.network,
+                exporter_port,
+                [self.container],
+            )
+
         # Export connection details
-        pulumi.export(f"{self.name}_host", self.container.name)
-        pulumi.export(f"{self.name}_port", self.config.port)
-        pulumi.export(f"{self.name}_endpoint", self.container.name.apply(lambda name: f"{name}:{self.config.port}"))
+        port = _published_client_port(self.config, self.name)
+        host = self.config.host_address if host_network else self.container.name
+        pulumi.export(f"{self.name}_host", host)
+        pulumi.export(f"{self.name}_port", port)
+        pulumi.export(f"{self.name}_endpoint", pulumi.Output.concat(host, ":", str(port)))
+        if self.exporter:
+            host_endpoint, network_endpoint = _metrics_endpoints(self.config, f"{self.name}-exporter", exporter_port)
+            pulumi.export(f"{self.name}_metrics_host_endpoint", host_endpoint)
+            pulumi.export(f"{self.name}_metrics_network_endpoint", network_endpoint)
+
+        self.backup = ValkeyBackup(f"{self.name}-backup", self) if self.config.backup_enabled else None
 
 
 class ValkeyReplicaSet:
@@ -252,14 +1561,25 @@ class ValkeyReplicaSet:
         replica_config: Config,
         replica_count: int | None = None,
         replica_port_offset: int | None = None,
+        host_tuning: ValkeyHostTuning | None = None,
     ):
         self.name = name
-        self.primary_config = primary_config
+        if _host_network(primary_config) != _host_network(replica_config):
+            raise ValueError(f"Replica set '{name}': primary and replicas must use the same network_mode")
+        _warn_replica_only_primary(primary_config, f"{name}-primary")
+        self.rolling = _rolling_update(primary_config)
+        self.primary_config = _generated_tls_config(
+            _host_network_config(_persistence_role_config(primary_config, persists=False), f"{name}-primary"),
+            f"{name}-primary",
+        )
         self.replica_config = replica_config
+        self.host_tuning = host_tuning
         self.replica_count = replica_count if replica_count is not None else self.replica_config.replica_count
         self.replica_port_offset = (
             replica_port_offset if replica_port_offset is not None else self.replica_config.replica_port_offset
         )
+        if self.rolling and self.replica_count == 0:
+            pulumi.log.warn(f"Replica set '{name}' has no replica to hand the primary role to during updates")
         self._deploy()
 
     def _get_primary_environment(self) -> list[pulumi.Input[str]]:
@@ -267,150 +1587,946 @@ class ValkeyReplicaSet:
         overrides = {"VALKEY_REPLICATION_MODE": "primary"}
         return _build_env(self.primary_config, overrides)
 
-    def _get_replica_environment(self) -> list[pulumi.Input[str]]:
-        """Build environment variables for replica containers."""
+    def _replica_env_overrides(self, index: int = 0) -> dict[str, Any]:
+        """Return the replication settings for the ``index``-th replica container."""
         primary_password = self.primary_config.password or self.replica_config.password
 
         overrides = {
             "VALKEY_REPLICATION_MODE": "replica",
-            "VALKEY_PRIMARY_HOST": f"{self.name}-primary",
-            "VALKEY_PRIMARY_PORT_NUMBER": str(self.primary_config.port),
+            "VALKEY_PRIMARY_HOST": _reachable_host(self.primary_config, f"{self.name}-primary"),
+            "VALKEY_PRIMARY_PORT_NUMBER": str(_replication_port(self.primary_config, self.replica_config)),
             "VALKEY_PRIMARY_PASSWORD": primary_password,
             "VALKEY_PASSWORD": primary_password,
         }
+        if _host_network(self.replica_config):
+            # replica-announce-ip/port: what the primary reports in INFO replication
+            replica_config = self._replica_config_for(index)
+            overrides["VALKEY_REPLICA_IP"] = replica_config.host_address
+            overrides["VALKEY_REPLICA_PORT"] = str(replica_config.port)
 
         if not primary_password and self.replica_config.allow_empty_password:
             overrides["ALLOW_EMPTY_PASSWORD"] = "yes"
 
-        return _build_env(self.replica_config, overrides)
+        return overrides
 
-    def _deploy(self):
-        """Deploy the Valkey replica set."""
-        # Create shared network for communication
-        self.network = docker.Network(f"{self.name}_network", name=f"{self.name}_network", driver="bridge")
+    def _replica_config_for(self, index: int) -> Config:
+        """Return the Config for the ``index``-th replica.
 
-        # Deploy primary container
-        primary_volumes = _file_mounts(self.primary_config)
-        primary_depends: list[pulumi.Resource] = [self.network]
-        if self.primary_config.host_data_path:
-            primary_volumes.append(
-                docker.ContainerVolumeArgs(
-                    container_path=self.primary_config.valkey_data_dir,
-                    host_path=os.path.abspath(self.primary_config.host_data_path),
-                    volume_name=None,
-                    read_only=False,
-                )
-            )
-        elif self.primary_config.persistence_enabled:
-            volume_name = self.primary_config.volume_name or f"{self.name}_primary_data"
-            self.primary_volume = docker.Volume(volume_name, name=volume_name, driver="local")
-            primary_depends.append(self.primary_volume)
-            primary_volumes.append(
-                docker.ContainerVolumeArgs(
-                    container_path=self.primary_config.valkey_data_dir,
-                    volume_name=self.primary_volume.name,
-                    host_path=None,
-                    read_only=False,
-                )
-            )
+        With replica-only persistence only replica 0 persists; on the host network each replica
+        listens on its own port.
+        """
+        replica_name = f"{self.name}-replica-{index}"
+        return _generated_tls_config(
+            _host_network_config(
+                _persistence_role_config(self.replica_config, persists=index == 0),
+                replica_name,
+                self.replica_port_offset + index,
+            ),
+            replica_name,
+        )
+
+    def _get_replica_environment(self, index: int = 0) -> list[pulumi.Input[str]]:
+        """Build environment variables for the ``index``-th replica container."""
+        return _build_env(self._replica_config_for(index), self._replica_env_overrides(index), index + 1)
 
-        primary_image = docker.RemoteImage(
-            f"{self.name}_primary_image", name=self.primary_config.image, keep_locally=False
+    def _primary_host_port(self) -> int:
+        """Return the host port clients reach the primary on."""
+        return _published_client_port(self.primary_config, f"{self.name}-primary")
+
+    def _replica_host_port(self, index: int) -> int:
+        """Return the host port clients reach the ``index``-th replica on."""
+        return _published_client_port(
+            self.replica_config, f"{self.name}-replica-{index}", self.replica_port_offset + index
+        )
+
+    def _image_aliases(self, image: str) -> list[str]:
+        """Return the names the per-container image resources of this set's ``image`` had before sharing."""
+        aliases = [f"{self.name}_primary_image"] if self.primary_config.image == image else []
+        if self.replica_config.image == image:
+            aliases += [f"{self.name}-replica-{i}_image" for i in range(self.replica_count)]
+        return aliases
+
+    def _replica_depends_on(self) -> list[pulumi.Resource]:
+        """Return the resources every replica container waits for."""
+        depends_on: list[pulumi.Resource] = [self.primary]
+        if self.rejoin:
+            depends_on.append(self.rejoin)
+        if self.network:
+            depends_on.append(self.network)
+        if self.host_tuning:
+            depends_on.append(self.host_tuning.container)
+        return depends_on
+
+    def _deploy(self):
+        """Deploy the Valkey replica set."""
+        # Create shared network for communication (host-network containers talk over host addresses)
+        self.network = None
+        if not _host_network(self.primary_config):
+            self.network = docker.Network(f"{self.name}_network", name=f"{self.name}_network", driver="bridge")
+        self._deploy_primary()
+        self._deploy_replicas()
+        self._deploy_exporters()
+        self._deploy_backup()
+        self._export_endpoints()
+
+    def _deploy_primary(self):
+        """Deploy the primary container and its volume."""
+        primary_volumes = _file_mounts(self.primary_config, f"{self.name}-primary")
+        primary_depends: list[pulumi.Resource] = [self.network] if self.network else []
+        if self.host_tuning:
+            primary_depends.append(self.host_tuning.container)
+        _warn_tcp_backlog(self.primary_config, f"{self.name}-primary")
+        _warn_tcp_backlog(self.replica_config, f"{self.name}-replica")
+        volume_name = self.primary_config.volume_name or f"{self.name}_primary_data"
+        data_mounts, data_volumes, primary_tmpfs = _data_storage(
+            self.primary_config, f"{self.name}-primary", volume_name
         )
+        primary_volumes.extend(data_mounts)
+        primary_depends.extend(data_volumes)
+        self.primary_volume = data_volumes[0] if data_volumes else None
+
+        primary_image = _remote_image(self.primary_config.image, self._image_aliases(self.primary_config.image))
+        # Replicas get the seeded dataset through their initial sync
+        self.seed = _seed_job(self.primary_config, f"{self.name}-primary", primary_image, data_mounts)
+        if self.seed:
+            primary_depends.append(self.seed)
+        primary_env = self._get_primary_environment()
+
+        self.handoff = None
+        self.rejoin = None
+        rolling_args: dict[str, Any] = {}
+        if self.rolling:
+            script = _rolling_start_script(_cli_args(self.primary_config), self._find_primary_lines())
+            command = ["/bin/bash", "-c", script]
+            revision = _revision(primary_image.repo_digest, *primary_env, *command)
+            primary_volumes.append(self._peer_list_mount())
+            self.handoff = self._rolling_job("handoff", primary_image, self._handoff_job_script(), revision, [])
+            primary_depends.append(self.handoff)
+            rolling_args["command"] = command
 
         self.primary = docker.Container(
             f"{self.name}-primary",
             name=f"{self.name}-primary",
             image=primary_image.repo_digest,
-            ports=[docker.ContainerPortArgs(internal=self.primary_config.port, external=self.primary_config.port)],
-            envs=self._get_primary_environment(),
+            envs=primary_env,
             restart=self.primary_config.restart_policy,
             volumes=primary_volumes,
-            networks_advanced=[
-                docker.ContainerNetworksAdvancedArgs(name=self.network.name, aliases=[f"{self.name}-primary"])
-            ],
-            opts=pulumi.ResourceOptions(depends_on=primary_depends),
+            tmpfs=primary_tmpfs,
+            opts=pulumi.ResourceOptions(depends_on=primary_depends, delete_before_replace=self.rolling),
+            **_network_args(self.primary_config, f"{self.name}-primary", self.network),
+            **_resource_args(self.primary_config),
+            **_readiness_args(self.primary_config),
+            **rolling_args,
         )
+        if self.rolling:
+            self.rejoin = self._deploy_rejoin(primary_image, revision)
 
-        # Deploy replica containers
-        self.replicas = []
-        self.replica_volumes: list[docker.Volume] = []
+    def _replica_endpoints(self) -> list[str]:
+        """Return every replica as ``host:client_port:replication_port``, the way the primary reaches it."""
+        endpoints = []
         for i in range(self.replica_count):
-            replica_name = f"{self.name}-replica-{i}"
+            replica_config = self._replica_config_for(i)
+            host = _reachable_host(replica_config, f"{self.name}-replica-{i}")
+            endpoints.append(
+                f"{host}:{_client_port(replica_config)}:{_replication_port(replica_config, self.primary_config)}"
+            )
+        return endpoints
 
-            replica_volumes = _file_mounts(self.replica_config)
-            replica_depends_on: list[pulumi.Resource] = [self.network, self.primary]
+    def _peer_list_mount(self) -> docker.ContainerVolumeArgs:
+        """Write the replica endpoints file and return its read-only mount."""
+        path = write_peer_list(
+            self._replica_endpoints(), self.primary_config.generated_config_dir, f"{self.name}-primary"
+        )
+        return docker.ContainerVolumeArgs(
+            container_path=PEERS_MOUNT_PATH, host_path=path, volume_name=None, read_only=True
+        )
 
-            if self.replica_config.host_data_path:
-                replica_volumes.append(
-                    docker.ContainerVolumeArgs(
-                        container_path=self.replica_config.valkey_data_dir,
-                        host_path=os.path.abspath(self.replica_config.host_data_path),
-                        volume_name=None,
-                        read_only=False,
-                    )
+    def _find_primary_lines(self) -> list[str]:
+        """Return the shell lines that find a replica holding the primary role after a handoff."""
+        return _role_scan_lines(f"$(cat {PEERS_MOUNT_PATH})")
+
+    def _failover_lines(self) -> list[str]:
+        """Return the shell lines that promote a caught-up replica of the primary.
+
+        ``FAILOVER`` pauses writes on the primary until a replica has its offset, so no
+        acknowledged write is lost.
+        """
+        port = _client_port(self.primary_config)
+        timeout = self.primary_config.handoff_timeout * 1000
+        return [
+            f"cli -h {_reachable_host(self.primary_config, f'{self.name}-primary')} -p {port} FAILOVER TIMEOUT {timeout}"
+        ]
+
+    def _handoff_job_script(self) -> str:
+        """Build the script of the job that runs before the primary is replaced."""
+        config = self.primary_config
+        return _handoff_script(
+            _reachable_host(config, f"{self.name}-primary"),
+            _client_port(config),
+            _cli_args(config),
+            self._failover_lines(),
+            config.handoff_timeout,
+        )
+
+    def _deploy_rejoin(self, image: docker.RemoteImage, revision: pulumi.Output[str]) -> docker.Container | None:
+        """Deploy the job that hands the primary role back once the replaced primary has synced."""
+        config = self.primary_config
+        script = _rejoin_script(
+            _reachable_host(config, f"{self.name}-primary"),
+            _client_port(config),
+            _cli_args(config),
+            f"$(cat {PEERS_MOUNT_PATH})",
+            config.replica_sync_timeout,
+            config.handoff_timeout,
+        )
+        return self._rolling_job("rejoin", image, script, revision, [self.primary], [self._peer_list_mount()])
+
+    def _rolling_job(
+        self,
+        step: str,
+        image: docker.RemoteImage,
+        script: str,
+        revision: pulumi.Output[str],
+        depends_on: list[pulumi.Resource],
+        mounts: list[docker.ContainerVolumeArgs] | None = None,
+    ) -> docker.Container:
+        """Create the one-shot container for one step of a rolling update.
+
+        ``revision`` is a digest of the primary's image, environment and command, so the job is
+        replaced, and runs again, exactly when the primary is.
+        """
+        config = self.primary_config
+        job_name = f"{self.name}-{step}"
+        networking: dict[str, Any] = (
+            {"networks_advanced": [docker.ContainerNetworksAdvancedArgs(name=self.network.name)]}
+            if self.network
+            else {"network_mode": "host"}
+        )
+        return docker.Container(
+            job_name,
+            name=job_name,
+            image=image.repo_digest,
+            command=["/bin/bash", "-c", script],
+            envs=_env_args(
+                {
+                    "VALKEY_PASSWORD": config.password or self.replica_config.password,
+                    "VALKEY_PRIMARY_REVISION": revision,
+                }
+            ),
+            volumes=[*_file_mounts(config), *(mounts or [])],
+            attach=True,
+            logs=True,
+            must_run=False,
+            restart="no",
+            opts=pulumi.ResourceOptions(
+                depends_on=[*([self.network] if self.network else []), *depends_on], delete_before_replace=True
+            ),
+            **networking,
+        )
+
+    def _deploy_replicas(self):
+        """Deploy the replica containers and their volumes.
+
+        Replicas start in waves of ``replica_sync_concurrency``: each wave waits until the
+        previous one reports ``master_link_status:up``, so the primary forks and streams at most
+        that many full syncs at a time. Replica resources are keyed by index and their inputs do
+        not depend on ``replica_count``, so scaling out only adds the new indexes and scaling in
+        only removes the highest ones.
+        """
+        replica_image = _remote_image(self.replica_config.image, self._image_aliases(self.replica_config.image))
+        self.replicas = []
+        self.replica_volumes: list[docker.Volume] = []
+        self.sync_waves = _sync_waves(self.replica_count, self.replica_config.replica_sync_concurrency)
+        previous_wave: list[docker.Container] = []
+        for wave in self.sync_waves:
+            current_wave = [self._deploy_replica(replica_image, i, previous_wave) for i in wave]
+            self.replicas.extend(current_wave)
+            previous_wave = current_wave
+
+    def _deploy_replica(
+        self, replica_image: docker.RemoteImage, i: int, previous_wave: list[docker.Container]
+    ) -> docker.Container:
+        """Deploy the ``i``-th replica container after the replicas of the previous sync wave."""
+        replica_name = f"{self.name}-replica-{i}"
+        replica_config = self._replica_config_for(i)
+
+        replica_volumes = _file_mounts(replica_config, replica_name)
+        replica_depends_on = [*self._replica_depends_on(), *previous_wave]
+
+        data_mounts, data_volumes, replica_tmpfs = _data_storage(
+            replica_config, replica_name, f"{replica_name}_data", i + 1
+        )
+        replica_volumes.extend(data_mounts)
+        replica_depends_on.extend(data_volumes)
+        self.replica_volumes.extend(data_volumes)
+
+        return docker.Container(
+            replica_name,
+            name=replica_name,
+            image=replica_image.repo_digest,
+            envs=self._get_replica_environment(i),
+            restart=replica_config.restart_policy,
+            volumes=replica_volumes,
+            tmpfs=replica_tmpfs,
+            opts=pulumi.ResourceOptions(depends_on=replica_depends_on, delete_before_replace=self.rolling),
+            **_readiness_args(replica_config, replica=True),
+            # Without port_range, replicas publish on port + replica_port_offset + i
+            **_network_args(replica_config, replica_name, self.network, self.replica_port_offset + i),
+            **_resource_args(replica_config, i + 1),
+        )
+
+    def _deploy_exporters(self):
+        """Deploy metrics exporters, one per container, numbered like node_cpusets."""
+        self.exporters: list[docker.Container] = []
+        self.metrics_host_endpoints: list[str] = []
+        self.metrics_network_endpoints: list[str] = []
+        members = [(f"{self.name}-primary", self.primary_config, self.primary)]
+        members += [(f"{self.name}-replica-{i}", self._replica_config_for(i), r) for i, r in enumerate(self.replicas)]
+        for index, (member_name, member_config, member) in enumerate(members):
+            if not member_config.exporter_enabled:
+                continue
+            exporter_name = f"{member_name}-exporter"
+            host_port = _host_port(member_config, member_name, "exporter", member_config.exporter_port + index)
+            self.exporters.append(
+                _metrics_exporter(
+                    exporter_name,
+                    member_config,
+                    _reachable_host(member_config, member_name),
+                    self.network,
+                    host_port,
+                    [member],
+                )
+            )
+            host_endpoint, network_endpoint = _metrics_endpoints(member_config, exporter_name, host_port)
+            self.metrics_host_endpoints.append(host_endpoint)
+            self.metrics_network_endpoints.append(network_endpoint)
+
+    def _deploy_backup(self):
+        """Deploy the backup sidecar on a replica when ``backup_enabled`` is set."""
+        self.backup = ValkeyBackup(f"{self.name}-backup", self) if self.primary_config.backup_enabled else None
+
+    def _topology_manifest(self) -> dict[str, Any]:
+        """Describe the replica set for client-side read routing."""
+        primary_weight, replica_weights = read_weights(
+            [_allocated_cpus(self.replica_config, i + 1) for i in range(self.replica_count)]
+        )
+        config = self.primary_config
+        return {
+            "version": TOPOLOGY_MANIFEST_VERSION,
+            "name": self.name,
+            "kind": "replica_set",
+            "auth": {"user": config.client_user or "default", "password_required": config.password is not None},
+            "tls": {
+                "enabled": bool(config.tls_enabled),
+                "ca_file": os.path.abspath(config.tls_ca_file) if config.tls_enabled and config.tls_ca_file else None,
+            },
+            "primary": _manifest_endpoint(
+                _reachable_host(config, f"{self.name}-primary"),
+                config,
+                self._primary_host_port(),
+                "primary",
+                primary_weight,
+            ),
+            "replicas": [
+                _manifest_endpoint(
+                    _reachable_host(self.replica_config, f"{self.name}-replica-{i}"),
+                    self._replica_config_for(i),
+                    self._replica_host_port(i),
+                    "replica",
+                    weight,
                 )
-            elif self.replica_config.persistence_enabled:
-                replica_volume = docker.Volume(f"{replica_name}_data", name=f"{replica_name}_data", driver="local")
-                self.replica_volumes.append(replica_volume)
-                replica_volumes.append(
+                for i, weight in enumerate(replica_weights)
+            ],
+        }
+
+    def _export_endpoints(self):
+        """Export connection details and the topology manifest."""
+        manifest = self._topology_manifest()
+        manifest_path = write_topology_manifest(manifest, self.primary_config.generated_config_dir, self.name)
+        pulumi.export(f"{self.name}_topology", manifest)
+        pulumi.export(f"{self.name}_topology_file", manifest_path)
+
+        host_network = _host_network(self.primary_config)
+        primary_port = self._primary_host_port()
+        primary_host = self.primary_config.host_address if host_network else self.primary.name
+        pulumi.export(f"{self.name}_primary_host", primary_host)
+        pulumi.export(f"{self.name}_primary_port", primary_port)
+        pulumi.export(f"{self.name}_primary_endpoint", pulumi.Output.concat(primary_host, ":", str(primary_port)))
+
+        replica_endpoints = []
+        for i, replica in enumerate(self.replicas):
+            replica_external_port = self._replica_host_port(i)
+            replica_host = self.replica_config.host_address if host_network else replica.name
+            pulumi.export(f"{self.name}_replica_{i}_host", replica_host)
+            pulumi.export(f"{self.name}_replica_{i}_port", replica_external_port)
+            replica_endpoints.append(pulumi.Output.concat(replica_host, ":", str(replica_external_port)))
+
+        pulumi.export(f"{self.name}_replica_endpoints", replica_endpoints)
+        if self.exporters:
+            pulumi.export(f"{self.name}_metrics_host_endpoints", self.metrics_host_endpoints)
+            pulumi.export(f"{self.name}_metrics_network_endpoints", self.metrics_network_endpoints)
+
+
+class ValkeySentinelReplicaSet(ValkeyReplicaSet):
+    """Valkey primary-replica deployment with Sentinel for automatic failover.
+
+    Deploys the primary, then ``sentinel_count`` Sentinels on the replica-set network, then the
+    replicas, which ask Sentinel for the current primary when they (re)start. Sentinel settings
+    (quorum, ``down-after-milliseconds``, ``failover-timeout``, ``parallel-syncs``, port and
+    monitor name) are read from ``primary_config``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        primary_config: Config,
+        replica_config: Config,
+        replica_count: int | None = None,
+        replica_port_offset: int | None = None,
+        host_tuning: ValkeyHostTuning | None = None,
+        sentinel_count: int | None = None,
+    ):
+        self.sentinel_count = sentinel_count if sentinel_count is not None else primary_config.sentinel_count
+        self.sentinel_quorum = primary_config.sentinel_quorum or self.sentinel_count // 2 + 1
+        self.primary_name = primary_config.valkey_sentinel_primary_name or DEFAULT_SENTINEL_PRIMARY_NAME
+        if self.sentinel_count < 1:
+            raise ValueError("A Sentinel deployment needs at least one Sentinel")
+        if _host_network(primary_config):
+            raise ValueError(f"Sentinel deployment '{name}' does not support network_mode 'host'")
+        if not 1 <= self.sentinel_quorum <= self.sentinel_count:
+            raise ValueError(f"sentinel_quorum must be between 1 and {self.sentinel_count}")
+        if self.sentinel_count < 3:
+            pulumi.log.warn(
+                f"Sentinel deployment '{name}' has {self.sentinel_count} Sentinels; "
+                "at least 3 are needed to survive the loss of one"
+            )
+        if primary_config.tls_enabled:
+            pulumi.log.warn(
+                f"Sentinel deployment '{name}': Sentinels do not use TLS; the primary must keep a plain port"
+            )
+        super().__init__(name, primary_config, replica_config, replica_count, replica_port_offset, host_tuning)
+
+    def _sentinel_name(self, index: int) -> str:
+        return f"{self.name}-sentinel-{index}"
+
+    def _sentinel_host_port(self, index: int) -> int:
+        """Return the host port of the ``index``-th Sentinel (``sentinel port + index`` without ``port_range``)."""
+        port = self.primary_config.valkey_sentinel_port_number
+        return _host_port(self.primary_config, self._sentinel_name(index), "sentinel", port + index)
+
+    def _replica_env_overrides(self, index: int = 0) -> dict[str, Any]:
+        """Point replicas at Sentinel so a restarted replica follows the current primary."""
+        overrides = super()._replica_env_overrides(index)
+        overrides.update(
+            {
+                "VALKEY_SENTINEL_HOST": self._sentinel_name(0),
+                "VALKEY_SENTINEL_PORT_NUMBER": str(self.primary_config.valkey_sentinel_port_number),
+                "VALKEY_SENTINEL_PRIMARY_NAME": self.primary_name,
+                # Announce the container name so Sentinel reports replicas by hostname
+                "VALKEY_REPLICA_IP": f"{self.name}-replica-{index}",
+                "VALKEY_REPLICA_PORT": str(self.replica_config.port),
+            }
+        )
+        return overrides
+
+    def _replica_depends_on(self) -> list[pulumi.Resource]:
+        return [*super()._replica_depends_on(), *self.sentinels]
+
+    def _sentinel_endpoints(self) -> list[str]:
+        port = self.primary_config.valkey_sentinel_port_number
+        return [f"{self._sentinel_name(i)}:{port}" for i in range(self.sentinel_count)]
+
+    def _find_primary_lines(self) -> list[str]:
+        """Ask Sentinel for the current primary, which is another member after a handoff."""
+        return _sentinel_query_lines(self._sentinel_endpoints(), self.primary_name, f"{self.name}-primary")
+
+    def _failover_lines(self) -> list[str]:
+        """Have Sentinel fail over, so its view of the primary stays authoritative."""
+        return [
+            'failed_over=""',
+            f"for sentinel in {' '.join(self._sentinel_endpoints())}; do",
+            f'  if valkey-cli -h "${{sentinel%:*}}" -p "${{sentinel##*:}}" SENTINEL FAILOVER {self.primary_name} '
+            "2>/dev/null | grep -q OK; then",
+            "    failed_over=1",
+            "    break",
+            "  fi",
+            "done",
+            'if [ -z "$failed_over" ]; then',
+            '  echo "No Sentinel accepted the failover" >&2',
+            "  exit 1",
+            "fi",
+        ]
+
+    def _deploy_rejoin(self, image: docker.RemoteImage, revision: pulumi.Output[str]) -> docker.Container | None:
+        """Leave the primary role where Sentinel put it; clients find the primary through Sentinel."""
+        return None
+
+    def _deploy(self):
+        """Deploy the primary, the Sentinels and then the replicas."""
+        self.network = docker.Network(f"{self.name}_network", name=f"{self.name}_network", driver="bridge")
+        self._deploy_primary()
+        self._deploy_sentinels()
+        self._deploy_replicas()
+        self._deploy_exporters()
+        self._deploy_backup()
+        self._export_endpoints()
+
+    def _deploy_sentinels(self):
+        """Deploy the Sentinel containers."""
+        config = self.primary_config
+        image = _remote_image(config.image)
+        port = config.valkey_sentinel_port_number
+        self.sentinels: list[docker.Container] = []
+        self.sentinel_volumes: list[docker.Volume] = []
+        for i in range(self.sentinel_count):
+            sentinel_name = self._sentinel_name(i)
+            volumes: list[docker.ContainerVolumeArgs] = []
+            depends_on: list[pulumi.Resource] = [self.network, self.primary]
+            if config.persistence_enabled:
+                volume = docker.Volume(f"{sentinel_name}_data", name=f"{sentinel_name}_data", driver="local")
+                self.sentinel_volumes.append(volume)
+                volumes.append(
                     docker.ContainerVolumeArgs(
-                        container_path=self.replica_config.valkey_data_dir,
-                        volume_name=replica_volume.name,
+                        container_path=config.valkey_data_dir,
+                        volume_name=volume.name,
                         host_path=None,
                         read_only=False,
                     )
                 )
-                replica_depends_on.append(replica_volume)
+                depends_on.append(volume)
 
-            replica_image = docker.RemoteImage(
-                f"{replica_name}_image", name=self.replica_config.image, keep_locally=False
+            script = _sentinel_script(
+                sentinel_name, config, self.primary_name, f"{self.name}-primary", self.sentinel_quorum
             )
-
-            replica = docker.Container(
-                replica_name,
-                name=replica_name,
-                image=replica_image.repo_digest,
-                ports=[
-                    docker.ContainerPortArgs(
-                        internal=self.replica_config.port,
-                        external=self.replica_config.port
-                        + self.replica_port_offset
-                        + i,  # Use different external ports with configurable offset
-                    )
-                ],
-                envs=self._get_replica_environment(),
-                restart=self.replica_config.restart_policy,
-                volumes=replica_volumes,
+            sentinel = docker.Container(
+                sentinel_name,
+                name=sentinel_name,
+                image=image.repo_digest,
+                command=["/bin/bash", "-c", script],
+                ports=[docker.ContainerPortArgs(internal=port, external=self._sentinel_host_port(i))],
+                envs=_env_args({"VALKEY_PRIMARY_PASSWORD": config.password}),
+                restart=config.restart_policy,
+                volumes=volumes,
                 networks_advanced=[
-                    docker.ContainerNetworksAdvancedArgs(name=self.network.name, aliases=[replica_name])
+                    docker.ContainerNetworksAdvancedArgs(name=self.network.name, aliases=[sentinel_name])
                 ],
-                opts=pulumi.ResourceOptions(depends_on=replica_depends_on),
+                opts=pulumi.ResourceOptions(depends_on=depends_on),
+                **self._sentinel_readiness_args(),
+            )
+            self.sentinels.append(sentinel)
+
+    def _sentinel_readiness_args(self) -> dict[str, Any]:
+        """Health check a Sentinel by PINGing its port; Sentinels have no dataset to load."""
+        config = self.primary_config
+        if not config.healthcheck_enabled:
+            return {}
+        probe = f"valkey-cli -p {config.valkey_sentinel_port_number} PING | grep -q PONG"
+        return {
+            "healthcheck": _healthcheck(config, probe, config.startup_timeout),
+            "wait": True,
+            "wait_timeout": config.startup_timeout,
+        }
+
+    def _topology_manifest(self) -> dict[str, Any]:
+        """Describe the replica set and its Sentinels for client-side routing."""
+        manifest = super()._topology_manifest()
+        port = self.primary_config.valkey_sentinel_port_number
+        manifest["kind"] = "sentinel_replica_set"
+        manifest["sentinel"] = {
+            "primary_name": self.primary_name,
+            "endpoints": [
+                {"host": self._sentinel_name(i), "port": port, "published_port": self._sentinel_host_port(i)}
+                for i in range(self.sentinel_count)
+            ],
+        }
+        return manifest
+
+    def _export_endpoints(self):
+        """Export connection details, including the Sentinel endpoints."""
+        super()._export_endpoints()
+        pulumi.export(f"{self.name}_sentinel_primary_name", self.primary_name)
+        pulumi.export(
+            f"{self.name}_sentinel_endpoints",
+            [f"{self._sentinel_name(i)}:{self._sentinel_host_port(i)}" for i in range(self.sentinel_count)],
+        )
+
+
+class ValkeyCluster:
+    """Sharded Valkey Cluster deployment using Docker.
+
+    Deploys ``primary_count`` primaries, each followed by ``replicas_per_primary`` replicas,
+    splits the 16384 hash slots evenly across the primaries and forms the cluster with a
+    one-shot bootstrap container.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Config,
+        primary_count: int | None = None,
+        replicas_per_primary: int | None = None,
+        host_tuning: ValkeyHostTuning | None = None,
+    ):
+        self.name = name
+        self.config = config
+        self.host_tuning = host_tuning
+        self.primary_count = primary_count if primary_count is not None else self.config.cluster_primary_count
+        self.replicas_per_primary = (
+            replicas_per_primary if replicas_per_primary is not None else self.config.cluster_replicas_per_primary
+        )
+        if _host_network(self.config):
+            raise ValueError(f"Valkey cluster '{name}' does not support network_mode 'host'")
+        if self.primary_count < 1:
+            raise ValueError("A Valkey cluster needs at least one primary")
+        if self.replicas_per_primary < 0:
+            raise ValueError("replicas_per_primary cannot be negative")
+        _warn_replica_only_primary(self.config, name)
+        _warn_rolling_unsupported(self.config, name)
+        if self.config.seed_rdb_file or self.config.seed_volume:
+            pulumi.log.warn(f"Valkey cluster '{name}': seeding from a snapshot is not supported; nodes start empty")
+        if self.config.backup_enabled:
+            pulumi.log.warn(f"Valkey cluster '{name}': backup_enabled is not supported for clusters")
+        if self.primary_count < 3:
+            pulumi.log.warn(
+                f"Valkey cluster '{name}' has {self.primary_count} primaries; at least 3 are needed for automatic failover"
             )
-            self.replicas.append(replica)
+        # The bootstrap job, exporters and benchmarks connect with a certificate of the cluster's own
+        self.config = _generated_tls_config(config, name)
+        self._deploy()
+
+    def _node_name(self, index: int) -> str:
+        return f"{self.name}-node-{index}"
+
+    def _node_config(self, index: int) -> Config:
+        """Return the Config for the ``index``-th node.
+
+        With replica-only persistence the first replica of every shard persists; replica ``r`` of
+        primary ``p`` is node ``primary_count + p * replicas_per_primary + r``.
+        """
+        first_replica = index >= self.primary_count and (index - self.primary_count) % self.replicas_per_primary == 0
+        return _generated_tls_config(
+            _persistence_role_config(self.config, persists=first_replica), self._node_name(index)
+        )
+
+    def _get_node_environment(self, index: int = 0) -> list[pulumi.Input[str]]:
+        """Build environment variables for the ``index``-th cluster node container."""
+        cluster_flags = [
+            "--cluster-enabled yes",
+            "--cluster-config-file nodes.conf",
+            f"--cluster-node-timeout {self.config.cluster_node_timeout}",
+        ]
+        overrides = {
+            # Primary mode makes the image set masterauth, which every node needs after a failover
+            "VALKEY_REPLICATION_MODE": "primary",
+            "VALKEY_PRIMARY_PASSWORD": self.config.password,
+            "VALKEY_EXTRA_FLAGS": " ".join([*self.config.extra_flags, *cluster_flags]),
+        }
+        return _build_env(self._node_config(index), overrides, index)
+
+    def _deploy(self):
+        """Deploy the cluster nodes and the bootstrap job."""
+        _warn_tcp_backlog(self.config, self.name)
+        self.network = docker.Network(f"{self.name}_network", name=f"{self.name}_network", driver="bridge")
+        image = _remote_image(self.config.image, [f"{self.name}_image"])
+
+        node_count = self.primary_count * (1 + self.replicas_per_primary)
+        self.nodes: list[docker.Container] = []
+        self.exporters: list[docker.Container] = []
+        self.metrics_host_endpoints: list[str] = []
+        self.metrics_network_endpoints: list[str] = []
+        self.node_volumes: list[docker.Volume] = []
+        for i in range(node_count):
+            node_name = self._node_name(i)
+            node_config = self._node_config(i)
+
+            node_volumes = _file_mounts(node_config, node_name)
+            node_depends_on: list[pulumi.Resource] = [self.network]
+            if self.host_tuning:
+                node_depends_on.append(self.host_tuning.container)
+            data_mounts, data_volumes, node_tmpfs = _data_storage(node_config, node_name, f"{node_name}_data", i)
+            node_volumes.extend(data_mounts)
+            node_depends_on.extend(data_volumes)
+            self.node_volumes.extend(data_volumes)
+
+            node = docker.Container(
+                node_name,
+                name=node_name,
+                image=image.repo_digest,
+                ports=_published_ports(node_config, node_name, i),
+                envs=self._get_node_environment(i),
+                restart=self.config.restart_policy,
+                volumes=node_volumes,
+                tmpfs=node_tmpfs,
+                networks_advanced=[docker.ContainerNetworksAdvancedArgs(name=self.network.name, aliases=[node_name])],
+                opts=pulumi.ResourceOptions(depends_on=node_depends_on),
+                **_resource_args(self.config, i),
+                **_readiness_args(node_config),
+            )
+            self.nodes.append(node)
+            if self.config.exporter_enabled:
+                exporter_name = f"{node_name}-exporter"
+                host_port = _host_port(self.config, node_name, "exporter", self.config.exporter_port + i)
+                self.exporters.append(
+                    _metrics_exporter(exporter_name, self.config, node_name, self.network, host_port, [node])
+                )
+                host_endpoint, network_endpoint = _metrics_endpoints(self.config, exporter_name, host_port)
+                self.metrics_host_endpoints.append(host_endpoint)
+                self.metrics_network_endpoints.append(network_endpoint)
+
+        primaries = [self._node_name(i) for i in range(self.primary_count)]
+        replicas = {
+            self._node_name(self.primary_count + p * self.replicas_per_primary + r): primaries[p]
+            for p in range(self.primary_count)
+            for r in range(self.replicas_per_primary)
+        }
+        script = _cluster_bootstrap_script(primaries, replicas, _client_port(self.config), _cli_args(self.config))
+
+        self.bootstrap = docker.Container(
+            f"{self.name}-bootstrap",
+            name=f"{self.name}-bootstrap",
+            image=image.repo_digest,
+            command=["/bin/bash", "-c", script],
+            envs=_env_args({"REDISCLI_AUTH": self.config.password, "VALKEYCLI_AUTH": self.config.password}),
+            volumes=_file_mounts(self.config),
+            networks_advanced=[docker.ContainerNetworksAdvancedArgs(name=self.network.name)],
+            attach=True,
+            logs=True,
+            must_run=False,
+            restart="no",
+            opts=pulumi.ResourceOptions(depends_on=self.nodes),
+        )
 
         # Export connection details
-        pulumi.export(f"{self.name}_primary_host", self.primary.name)
-        pulumi.export(f"{self.name}_primary_port", self.primary_config.port)
+        self.seed_nodes = [f"{node_name}:{_client_port(self.config)}" for node_name in [*primaries, *replicas]]
+        pulumi.export(f"{self.name}_seed_nodes", self.seed_nodes)
         pulumi.export(
-            f"{self.name}_primary_endpoint", self.primary.name.apply(lambda name: f"{name}:{self.primary_config.port}")
+            f"{self.name}_node_ports",
+            [_published_client_port(self.config, self._node_name(i), i) for i in range(node_count)],
         )
+        pulumi.export(f"{self.name}_slot_ranges", [list(r) for r in _cluster_slot_ranges(self.primary_count)])
+        if self.exporters:
+            pulumi.export(f"{self.name}_metrics_host_endpoints", self.metrics_host_endpoints)
+            pulumi.export(f"{self.name}_metrics_network_endpoints", self.metrics_network_endpoints)
 
-        replica_endpoints = []
-        for i, replica in enumerate(self.replicas):
-            replica_external_port = self.replica_config.port + self.replica_port_offset + i
-            pulumi.export(f"{self.name}_replica_{i}_host", replica.name)
-            pulumi.export(f"{self.name}_replica_{i}_port", replica_external_port)
-            replica_endpoints.append(replica.name.apply(lambda name, port=replica_external_port: f"{name}:{port}"))
 
-        pulumi.export(f"{self.name}_replica_endpoints", replica_endpoints)
+class ValkeyBenchmark:
+    """One-shot ``valkey-benchmark`` run against a deployed Valkey topology.
+
+    The benchmark container joins the network namespace of the target's entry container (the
+    standalone container, the replica set primary or the first cluster node), so it works for
+    every topology without extra networks and measures Valkey rather than Docker's port
+    forwarding. Ops/sec and latency percentiles per test are exported as stack outputs and
+    written to ``<generated_config_dir>/<name>/benchmark.json``.
 
+    The run is repeated whenever its parameters change or the target container is replaced,
+    so a tuning change followed by ``pulumi up`` yields comparable numbers.
+    """
 
-def create_standalone_valkey(name: str, **kwargs) -> ValkeyStandalone:
+    def __init__(
+        self,
+        name: str,
+        target: ValkeyStandalone | ValkeyReplicaSet | ValkeyCluster,
+        clients: int = 50,
+        requests: int = 100000,
+        pipeline: int = 1,
+        data_size: int = 3,
+        tests: list[str] | None = None,
+        keyspace: int | None = None,
+        threads: int | None = None,
+    ):
+        self.name = name
+        self.target = target
+        self.clients = clients
+        self.requests = requests
+        self.pipeline = pipeline
+        self.data_size = data_size
+        self.tests = list(tests or DEFAULT_BENCHMARK_TESTS)
+        self.keyspace = keyspace
+        self.threads = threads
+        if min(clients, requests, pipeline, data_size) < 1:
+            raise ValueError("Benchmark clients, requests, pipeline and data_size must be positive")
+        self._deploy()
+
+    def _target_container(self) -> tuple[docker.Container, Config, list[pulumi.Resource]]:
+        """Return the container to benchmark, its Config and the resources to wait for."""
+        if isinstance(self.target, ValkeyCluster):
+            return self.target.nodes[0], self.target.config, [*self.target.nodes, self.target.bootstrap]
+        if isinstance(self.target, ValkeyReplicaSet):
+            return self.target.primary, self.target.primary_config, [self.target.primary]
+        if isinstance(self.target, ValkeyStandalone):
+            return self.target.container, self.target.config, [self.target.container]
+        raise TypeError(f"Cannot benchmark {type(self.target).__name__}")
+
+    def _record_results(self, logs: str | None) -> dict[str, dict[str, float]]:
+        """Parse the benchmark output and persist it; empty during preview."""
+        if not logs:
+            return {}
+        results = parse_benchmark_csv(logs)
+        write_benchmark_results(results, self.config.generated_config_dir, self.name)
+        return results
+
+    def _deploy(self):
+        """Deploy the benchmark container."""
+        target, self.config, depends_on = self._target_container()
+        script = _benchmark_script(
+            _client_port(self.config),
+            _tls_client_args(self.config),
+            self.clients,
+            self.requests,
+            self.pipeline,
+            self.data_size,
+            self.tests,
+            self.keyspace,
+            self.threads,
+            cluster=isinstance(self.target, ValkeyCluster),
+            wait_timeout=self.config.startup_timeout,
+        )
+        image = _remote_image(self.config.image)
+
+        self.container = docker.Container(
+            self.name,
+            name=self.name,
+            image=image.repo_digest,
+            command=["/bin/bash", "-c", script],
+            envs=_env_args(
+                {
+                    "VALKEY_BENCHMARK_AUTH": self.config.password,
+                    # Replacing the target re-runs the benchmark against the new container
+                    "VALKEY_BENCHMARK_TARGET_ID": target.id,
+                }
+            ),
+            network_mode=target.name.apply(lambda target_name: f"container:{target_name}"),
+            volumes=_file_mounts(self.config),
+            attach=True,
+            logs=True,
+            must_run=False,
+            restart="no",
+            opts=pulumi.ResourceOptions(depends_on=depends_on),
+        )
+
+        self.results = self.container.container_logs.apply(self._record_results)
+        pulumi.export(f"{self.name}_results", self.results)
+        pulumi.export(
+            f"{self.name}_results_file",
+            os.path.join(os.path.abspath(self.config.generated_config_dir), self.name, BENCHMARK_RESULTS_FILENAME),
+        )
+
+
+class ValkeyBackup:
+    """Scheduled, compressed RDB backups of a standalone instance or a replica set.
+
+    A sidecar joins the network namespace of the backed-up container. For a replica set that is
+    a replica, ``backup_replica`` or the last one, never the primary, so the fork and the disk
+    writes stay off the primary's latency path. On the ``backup_schedule`` cron schedule (UTC)
+    the sidecar streams a full RDB from it through gzip into ``backup_dir`` (a host directory)
+    or a ``<name>_backups`` volume, and keeps the ``backup_keep`` newest generations. With
+    ``backup_s3_endpoint`` an ``mc mirror --watch`` container uploads every new generation to
+    the S3-compatible bucket, and deletes the ones pruned locally. Settings are read from the
+    target's Config (``primary_config`` for replica sets).
+    """
+
+    def __init__(self, name: str, target: ValkeyStandalone | ValkeyReplicaSet):
+        self.name = name
+        self.target = target
+        self.source, self.config, self.source_config = self._source()
+        self.schedule = parse_cron(self.config.backup_schedule)
+        if self.config.backup_keep < 1:
+            raise ValueError(f"{name}: backup_keep must be at least 1")
+        self.s3 = bool(self.config.backup_s3_endpoint)
+        if self.s3 and not (
+            self.config.backup_s3_bucket and self.config.backup_s3_access_key and self.config.backup_s3_secret_key
+        ):
+            raise ValueError(
+                f"{name}: backup_s3_endpoint requires backup_s3_bucket, backup_s3_access_key and backup_s3_secret_key"
+            )
+        self._deploy()
+
+    def _source(self) -> tuple[docker.Container, Config, Config]:
+        """Return the container to back up, the Config with the backup settings and the source's Config."""
+        if isinstance(self.target, ValkeyReplicaSet):
+            config = self.target.primary_config
+            if not self.target.replicas:
+                raise ValueError(f"{self.name}: a replica set without replicas cannot be backed up off the primary")
+            index = config.backup_replica if config.backup_replica is not None else len(self.target.replicas) - 1
+            if not 0 <= index < len(self.target.replicas):
+                raise ValueError(f"{self.name}: backup_replica {index} is not a replica index")
+            return self.target.replicas[index], config, self.target._replica_config_for(index)
+        if isinstance(self.target, ValkeyStandalone):
+            return self.target.container, self.target.config, self.target.config
+        raise TypeError(f"Cannot back up {type(self.target).__name__}")
+
+    def _deploy(self):
+        """Deploy the backup sidecar and, for S3 targets, the uploader."""
+        config = self.config
+        if config.backup_dir:
+            storage = _bind_mount(BACKUP_MOUNT_PATH, config.backup_dir)
+            self.location = os.path.abspath(config.backup_dir)
+            self.volume = None
+        else:
+            self.volume = docker.Volume(f"{self.name}_backups", name=f"{self.name}_backups", driver="local")
+            storage = _volume_mount(BACKUP_MOUNT_PATH, self.volume)
+            self.location = f"volume:{self.name}_backups"
+
+        prefix = self.target.name
+        script = _backup_script(
+            self.schedule, _client_port(self.source_config), _cli_args(self.source_config), prefix, config.backup_keep
+        )
+        image = _remote_image(self.source_config.image)
+        self.container = docker.Container(
+            self.name,
+            name=self.name,
+            image=image.repo_digest,
+            command=["/bin/bash", "-c", script],
+            envs=_env_args(
+                {
+                    "VALKEY_PASSWORD": self.source_config.password,
+                    # A replaced source container takes its network namespace with it
+                    "VALKEY_BACKUP_SOURCE_ID": self.source.id,
+                }
+            ),
+            network_mode=self.source.name.apply(lambda source_name: f"container:{source_name}"),
+            volumes=[storage, *_file_mounts(self.source_config)],
+            restart=config.restart_policy,
+            opts=pulumi.ResourceOptions(depends_on=[self.source]),
+        )
+
+        self.uploader = None
+        if self.s3:
+            remote = f"backup/{config.backup_s3_bucket}/{config.backup_s3_prefix or prefix}"
+            scheme, _, endpoint = config.backup_s3_endpoint.rpartition("://")
+            self.uploader = docker.Container(
+                f"{self.name}-upload",
+                name=f"{self.name}-upload",
+                image=_remote_image(config.backup_upload_image).repo_digest,
+                # The image's entrypoint is mc; hidden files are the sidecar's partial writes
+                command=["mirror", "--watch", "--remove", "--overwrite", "--exclude", ".*", BACKUP_MOUNT_PATH, remote],
+                envs=[
+                    pulumi.Output.all(config.backup_s3_access_key, config.backup_s3_secret_key).apply(
+                        lambda keys: f"MC_HOST_backup={scheme or 'https'}://{keys[0]}:{keys[1]}@{endpoint}"
+                    )
+                ],
+                volumes=[
+                    docker.ContainerVolumeArgs(
+                        container_path=BACKUP_MOUNT_PATH,
+                        host_path=storage.host_path,
+                        volume_name=storage.volume_name,
+                        read_only=True,
+                    )
+                ],
+                restart=config.restart_policy,
+            )
+            self.location = f"s3://{config.backup_s3_bucket}/{config.backup_s3_prefix or prefix}"
+
+        pulumi.export(f"{self.name}_location", self.location)
+        pulumi.export(f"{self.name}_latest", f"{self.location}/{BACKUP_LATEST_FILENAME}")
+
+
+def create_standalone_valkey(name: str, host_tuning: ValkeyHostTuning | None = None, **kwargs) -> ValkeyStandalone:
     """Helper function to create a standalone Valkey deployment.
 
     Args:
         name: Name of the Valkey deployment
+        host_tuning: Host tuning to apply before Valkey starts (optional)
         **kwargs: Configuration options for Config
 
     Returns:
@@ -418,7 +2534,7 @@ def create_standalone_valkey(name: str, **kwargs) -> ValkeyStandalone:
 
     """
     config = Config(**kwargs)
-    return ValkeyStandalone(name, config)
+    return ValkeyStandalone(name, config, host_tuning)
 
 
 def create_valkey_replica_set(
@@ -427,6 +2543,7 @@ def create_valkey_replica_set(
     replica_port_offset: int | None = None,
     primary_config: dict[str, Any] | None = None,
     replica_config: dict[str, Any] | None = None,
+    host_tuning: ValkeyHostTuning | None = None,
 ) -> ValkeyReplicaSet:
     """Helper function to create a Valkey replica set deployment.
 
@@ -436,6 +2553,7 @@ def create_valkey_replica_set(
         replica_port_offset: Port offset for replicas (optional, reads from config)
         primary_config: Configuration dict for primary
         replica_config: Configuration dict for replicas
+        host_tuning: Host tuning to apply before Valkey starts (optional)
 
     Returns:
         ValkeyReplicaSet instance
@@ -451,7 +2569,174 @@ def create_valkey_replica_set(
     primary_config = Config(**primary_kwargs)
     replica_config = Config(**replica_kwargs)
 
-    return ValkeyReplicaSet(name, primary_config, replica_config, replica_count, replica_port_offset)
+    return ValkeyReplicaSet(name, primary_config, replica_config, replica_count, replica_port_offset, host_tuning)
+
+
+def create_valkey_sentinel_replica_set(
+    name: str,
+    replica_count: int | None = None,
+    replica_port_offset: int | None = None,
+    primary_config: dict[str, Any] | None = None,
+    replica_config: dict[str, Any] | None = None,
+    host_tuning: ValkeyHostTuning | None = None,
+    sentinel_count: int | None = None,
+) -> ValkeySentinelReplicaSet:
+    """Helper function to create a Valkey replica set with Sentinel failover.
+
+    Args:
+        name: Name of the Valkey replica set
+        replica_count: Number of replica containers (optional, reads from config)
+        replica_port_offset: Port offset for replicas (optional, reads from config)
+        primary_config: Configuration dict for primary (also holds the Sentinel settings)
+        replica_config: Configuration dict for replicas
+        host_tuning: Host tuning to apply before Valkey starts (optional)
+        sentinel_count: Number of Sentinel containers (optional, reads from config)
+
+    Returns:
+        ValkeySentinelReplicaSet instance
+
+    """
+    primary_kwargs = primary_config or {}
+    replica_kwargs = replica_config or {}
+
+    # Ensure passwords are synchronized if not explicitly set
+    if "password" not in primary_kwargs and "password" in replica_kwargs:
+        primary_kwargs["password"] = replica_kwargs["password"]
+
+    return ValkeySentinelReplicaSet(
+        name,
+        Config(**primary_kwargs),
+        Config(**replica_kwargs),
+        replica_count,
+        replica_port_offset,
+        host_tuning,
+        sentinel_count,
+    )
+
+
+def create_valkey_cluster(
+    name: str,
+    primary_count: int | None = None,
+    replicas_per_primary: int | None = None,
+    host_tuning: ValkeyHostTuning | None = None,
+    **kwargs,
+) -> ValkeyCluster:
+    """Helper function to create a sharded Valkey Cluster deployment.
+
+    Args:
+        name: Name of the Valkey cluster
+        primary_count: Number of primaries (optional, reads from config)
+        replicas_per_primary: Number of replicas per primary (optional, reads from config)
+        host_tuning: Host tuning to apply before Valkey starts (optional)
+        **kwargs: Configuration options for Config
+
+    Returns:
+        ValkeyCluster instance
+
+    """
+    config = Config(**kwargs)
+    return ValkeyCluster(name, config, primary_count, replicas_per_primary, host_tuning)
+
+
+def _deployment_kind(config: Config) -> str:
+    """Pick the topology to deploy for a Config.
+
+    ``cluster_enabled`` selects a sharded cluster, then ``sentinel_enabled`` a replica set
+    watched by Sentinel, then a ``replica_count`` above zero a replica set; otherwise a
+    standalone instance.
+    """
+    if config.cluster_enabled:
+        return "cluster"
+    if config.sentinel_enabled:
+        return "sentinel-replica-set"
+    if config.replica_count is not None and config.replica_count > 0:
+        return "replica-set"
+    return "standalone"
+
+
+def create_fleet(
+    instances: list[FleetInstance], host_tuning: ValkeyHostTuning | None = None
+) -> dict[str, ValkeyStandalone | ValkeyReplicaSet | ValkeyCluster]:
+    """Deploy every instance of a fleet in one program run.
+
+    Instances share no resources apart from images and ``host_tuning``, so Pulumi creates
+    them in parallel.
+
+    Args:
+        instances: Fleet instances, see ``valkey_pulumi.fleet.parse_fleet``
+        host_tuning: Host tuning to apply before any Valkey container starts (optional)
+
+    Returns:
+        The deployments keyed by instance name
+
+    Raises:
+        ValueError: If an instance without ``kind`` resolves to a standalone instance or a
+            cluster but has ``primary`` or ``replica`` settings.
+
+    """
+    deployments: dict[str, ValkeyStandalone | ValkeyReplicaSet | ValkeyCluster] = {}
+    # Resolve every kind first, so an invalid instance fails the run before anything is deployed
+    kinds = {
+        instance.name: instance.kind or _deployment_kind(Config(**instance.primary_settings()))
+        for instance in instances
+    }
+    for instance in instances:
+        if (instance.primary or instance.replica) and kinds[instance.name] not in REPLICA_SET_KINDS:
+            raise ValueError(
+                f"fleet instance '{instance.name}': 'primary' and 'replica' settings need a replica set kind, "
+                f"but it resolves to '{kinds[instance.name]}'"
+            )
+    for instance in instances:
+        kind = kinds[instance.name]
+        if kind == "cluster":
+            deployments[instance.name] = create_valkey_cluster(
+                instance.name, host_tuning=host_tuning, **instance.settings
+            )
+        elif kind == "sentinel-replica-set":
+            deployments[instance.name] = create_valkey_sentinel_replica_set(
+                instance.name,
+                primary_config=instance.primary_settings(),
+                replica_config=instance.replica_settings(),
+                host_tuning=host_tuning,
+            )
+        elif kind == "replica-set":
+            deployments[instance.name] = create_valkey_replica_set(
+                instance.name,
+                primary_config=instance.primary_settings(),
+                replica_config=instance.replica_settings(),
+                host_tuning=host_tuning,
+            )
+        else:
+            deployments[instance.name] = create_standalone_valkey(
+                instance.name, host_tuning=host_tuning, **instance.settings
+            )
+
+    pulumi.export("fleet", kinds)
+    return deployments
+
+
+def _deploy_single(config: Config, host_tuning: ValkeyHostTuning | None) -> None:
+    """Deploy the one standalone instance, replica set or cluster the stack configuration describes."""
+    kind = _deployment_kind(config)
+    if kind == "cluster":
+        pulumi.log.info(
+            f"Deploying Valkey Cluster with {config.cluster_primary_count} primaries "
+            f"and {config.cluster_replicas_per_primary} replicas per primary"
+        )
+        create_valkey_cluster("valkey-cluster", host_tuning=host_tuning)
+    elif kind == "sentinel-replica-set":
+        pulumi.log.info(
+            f"Deploying Valkey Replica Set with {config.replica_count} replicas and {config.sentinel_count} Sentinels"
+        )
+        create_valkey_sentinel_replica_set(
+            "valkey-replica-set", replica_count=config.replica_count, host_tuning=host_tuning
+        )
+    elif kind == "replica-set":
+        pulumi.log.info(f"Deploying Valkey Replica Set with {config.replica_count} replicas")
+        create_valkey_replica_set("valkey-replica-set", replica_count=config.replica_count, host_tuning=host_tuning)
+    else:
+        pulumi.log.info("Deploying Valkey Standalone")
+        create_standalone_valkey("valkey-standalone", host_tuning=host_tuning)
 
 
 def main():
@@ -459,16 +2744,23 @@ def main():
     # Load configuration
     config = Config()
 
-    # Determine deployment strategy
-    # If 'replica_count' is specified and greater than 0, we deploy a replica set.
-    # Otherwise, we deploy a standalone instance.
+    # Host-wide kernel settings are applied once, before any Valkey container starts
+    host_tuning = ValkeyHostTuning("valkey-host-tuning", config) if config.host_tuning_enabled else None
 
-    if config.replica_count is not None and config.replica_count > 0:
-        pulumi.log.info(f"Deploying Valkey Replica Set with {config.replica_count} replicas")
-        create_valkey_replica_set("valkey-replica-set", replica_count=config.replica_count)
+    # A fleet deploys many named instances; the rest of the valkey namespace is their shared default
+    if config.fleet and config.fleet_file:
+        raise ValueError("Set either valkey:fleet or valkey:fleet_file, not both")
+    if config.fleet or config.fleet_file:
+        instances = parse_fleet(load_fleet_file(config.fleet_file) if config.fleet_file else config.fleet)
+        pulumi.log.info(f"Deploying a fleet of {len(instances)} Valkey deployments")
+        create_fleet(instances, host_tuning)
     else:
-        pulumi.log.info("Deploying Valkey Standalone")
-        create_standalone_valkey("valkey-standalone")
+        _deploy_single(config, host_tuning)
+
+    # Every deployment has asked for its ports by now; anything else belongs to removed containers
+    port_allocations = release_unused_ports()
+    if port_allocations:
+        pulumi.export("port_allocations", port_allocations)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""Cron schedules for the backup sidecar.
+
+``ValkeyBackup`` runs a shell loop inside the Valkey image, which has no cron daemon. The
+schedule is expanded here into the explicit minutes, hours, days, months and weekdays it
+matches, and the loop only compares the current time against those lists.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+# (name, first, last) of the five cron fields
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+BACKUP_LATEST_FILENAME = "LATEST"
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """The values each field of a five-field cron schedule matches."""
+
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: tuple[int, ...]
+    months: tuple[int, ...]
+    weekdays: tuple[int, ...]
+    # cron matches either day field when both are restricted, and both otherwise; like cron, a
+    # field starting with "*" (such as "*/2") does not count as restricted
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    def matches(self, moment: datetime) -> bool:
+        """Return whether the schedule fires in the minute of ``moment``."""
+        if moment.minute not in self.minutes or moment.hour not in self.hours or moment.month not in self.months:
+            return False
+        day = moment.day in self.days
+        weekday = moment.isoweekday() % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day or weekday
+        return day and weekday
+
+
+def _expand_field(text: str, name: str, first: int, last: int) -> tuple[int, ...]:
+    """Expand one cron field (``*``, ``a``, ``a-b``, ``*/n``, ``a-b/n`` and lists of them)."""
+    values: set[int] = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        try:
+            step = int(step_text) if step_text else 1
+            if spec == "*":
+                low, high = first, last
+            elif "-" in spec:
+                low, high = (int(bound) for bound in spec.split("-", 1))
+            else:
+                low = int(spec)
+                high = last if step_text else low
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} field '{text}'") from None
+        if step < 1 or not first <= low <= high <= last:
+            raise ValueError(f"Invalid cron {name} field '{text}': values must be within {first}-{last}")
+        values.update(range(low, high + 1, step))
+    return tuple(sorted(values))
+
+
+def parse_cron(schedule: str) -> CronSchedule:
+    """Parse a five-field cron schedule such as ``"0 2 * * *"``.
+
+    Day of week 7 is Sunday, like 0. Names (``MON``, ``JAN``) and ``@daily``-style macros are
+    not supported.
+
+    Raises:
+        ValueError: If the schedule does not have five valid fields.
+
+    """
+    fields = str(schedule).split()
+    if len(fields) != len(CRON_FIELDS):
+        raise ValueError(f"Invalid cron schedule '{schedule}': expected 5 fields, got {len(fields)}")
+    minutes, hours, days, months, weekdays = (
+        _expand_field(text, name, first, last) for text, (name, first, last) in zip(fields, CRON_FIELDS, strict=True)
+    )
+    return CronSchedule(
+        minutes=minutes,
+        hours=hours,
+        days=days,
+        months=months,
+        weekdays=tuple(sorted({weekday % 7 for weekday in weekdays})),
+        days_restricted=not fields[2].startswith("*"),
+        weekdays_restricted=not fields[4].startswith("*"),
+    )
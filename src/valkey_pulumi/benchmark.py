@@ -0,0 +1,49 @@
+"""Parsing and persistence of ``valkey-benchmark`` results.
+
+``ValkeyBenchmark`` runs ``valkey-benchmark --csv`` in a one-shot container; the helpers here
+turn its output into per-test throughput and latency figures and store them next to the other
+generated files so runs can be compared across tuning changes.
+"""
+
+import csv
+import json
+import os
+from typing import Any
+
+from valkey_pulumi.files import write_generated_file
+
+BENCHMARK_RESULTS_FILENAME = "benchmark.json"
+DEFAULT_BENCHMARK_TESTS = ("set", "get")
+
+
+def parse_benchmark_csv(output: str) -> dict[str, dict[str, float]]:
+    """Parse ``valkey-benchmark --csv`` output into per-test metrics.
+
+    Lines before the ``"test",...`` header (image banners, warnings) are ignored. Each row
+    becomes ``{"rps": ..., "avg_latency_ms": ..., "p50_latency_ms": ..., ...}`` keyed by the
+    test name as printed by valkey-benchmark (e.g. ``"SET"``).
+
+    Raises:
+        ValueError: If the output contains no CSV header.
+
+    """
+    lines = output.splitlines()
+    header = next((i for i, line in enumerate(lines) if line.lstrip().startswith('"test"')), None)
+    if header is None:
+        raise ValueError("valkey-benchmark output contains no CSV results")
+
+    results: dict[str, dict[str, float]] = {}
+    for row in csv.DictReader(line.strip() for line in lines[header:] if line.strip()):
+        test = row.pop("test")
+        try:
+            results[test] = {column: float(value) for column, value in row.items()}
+        except (TypeError, ValueError):
+            # Trailing log lines are not part of the table
+            continue
+    return results
+
+
+def write_benchmark_results(results: dict[str, Any], directory: str, name: str) -> str:
+    """Write benchmark results as JSON under ``<directory>/<name>/`` and return the file path."""
+    path = os.path.join(os.path.abspath(directory), name, BENCHMARK_RESULTS_FILENAME)
+    return write_generated_file(path, json.dumps(results, indent=2, sort_keys=True) + "\n")
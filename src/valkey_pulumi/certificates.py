@@ -0,0 +1,48 @@
+"""Generated TLS material.
+
+With ``tls_generate`` the deployment creates a private CA and one certificate per Valkey
+container as ``pulumi_tls`` resources. Each container's CA certificate, certificate and key are
+written to ``<generated_config_dir>/<container>/tls/`` and that directory is mounted as a whole,
+at the same path, so ``tls_ca_file``, ``tls_cert_file`` and ``tls_key_file`` resolve inside the
+container exactly as they do on the host.
+"""
+
+import os
+
+from valkey_pulumi.config import Config
+from valkey_pulumi.files import write_generated_file
+
+TLS_DIRNAME = "tls"
+TLS_CA_FILENAME = "ca.crt"
+TLS_CERT_FILENAME = "valkey.crt"
+TLS_KEY_FILENAME = "valkey.key"
+# The key is readable by its owner and one group only. Bitnami images run Valkey as user 1001
+# in group 0 (root), so the key is given to that group; other images reading it join the group.
+TLS_KEY_GROUP = 0
+TLS_KEY_MODE = 0o640
+# Key usages of container certificates: the same certificate serves Valkey and its helper clients
+TLS_CERT_USES = ("digital_signature", "key_encipherment", "server_auth", "client_auth")
+# The CA outlives the certificates it signs, so renewing them never needs a new trust anchor
+TLS_CA_VALIDITY_FACTOR = 10
+
+
+def tls_material_dir(config: Config, name: str) -> str:
+    """Return the absolute host directory holding the generated TLS material of a container."""
+    return os.path.join(os.path.abspath(config.generated_config_dir), name, TLS_DIRNAME)
+
+
+def write_tls_material(directory: str, ca_cert_pem: str, cert_pem: str, key_pem: str) -> str:
+    """Write a container's CA certificate, certificate and key and return the directory.
+
+    Files are only rewritten when their contents change. The certificates are world-readable;
+    the key gets ``TLS_KEY_MODE`` and ``TLS_KEY_GROUP`` so the containers' non-root user can read
+    it and other host users cannot.
+
+    Raises:
+        PermissionError: If the host user running Pulumi cannot give the key to ``TLS_KEY_GROUP``.
+
+    """
+    write_generated_file(os.path.join(directory, TLS_CA_FILENAME), ca_cert_pem, 0o644)
+    write_generated_file(os.path.join(directory, TLS_CERT_FILENAME), cert_pem, 0o644)
+    write_generated_file(os.path.join(directory, TLS_KEY_FILENAME), key_pem, TLS_KEY_MODE, TLS_KEY_GROUP)
+    return directory
@@ -3,6 +3,12 @@
 This module contains the main configuration classes used for Valkey deployment with Pulumi.
 """
 
+import functools
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
 import pulumi
 
 
@@ -27,24 +33,42 @@ DEFAULT_VALKEY_CONFIG = {
     "aof_enabled": True,
     "rdb_policy": None,
     "rdb_policy_disabled": False,
+    "persistence_preset": None,
     # Networking
     "primary_host": None,
     "primary_port_number": 6379,
     "port": 6379,
     "allow_remote_connections": True,
+    "port_range": None,
+    "port_allocations_file": None,
+    "network_mode": "bridge",
+    "host_address": "127.0.0.1",
     # Replication
     "replication_mode": None,
     "replica_ip": None,
     "replica_port": None,
     "primary_password": None,
+    "repl_diskless_sync": None,
+    "repl_diskless_sync_delay": None,
+    "repl_diskless_load": None,
+    "repl_backlog_size": None,
+    "repl_backlog_ttl": None,
+    "repl_backlog_write_rate": None,
+    "repl_backlog_disconnect_seconds": None,
     # Authentication
     "password": None,
     "allow_empty_password": False,
+    "client_user": None,
     # Security
     "acl_file": None,
     # Performance
     "io_threads_do_reads": None,
     "io_threads": None,
+    "tuning_profile": None,
+    "tuning_overrides": {},
+    "maxmemory": None,
+    "maxmemory_policy": None,
+    "tcp_backlog": None,
     # TLS/SSL
     "tls_enabled": False,
     "tls_port_number": 6379,
@@ -55,23 +79,314 @@ DEFAULT_VALKEY_CONFIG = {
     "tls_key_file_pass": None,
     "tls_dh_params_file": None,
     "tls_auth_clients": True,
+    "tls_generate": False,
+    "tls_cert_validity_hours": 8760,
+    "tls_replication": None,
+    "tls_cluster": None,
+    "tls_protocols": None,
+    "tls_ciphers": None,
+    "tls_ciphersuites": None,
+    "tls_prefer_server_ciphers": None,
+    "tls_session_caching": None,
+    "tls_session_cache_size": None,
+    "tls_session_cache_timeout": None,
     # Configuration Files
     "valkey_config_file": None,
+    "generated_config_dir": ".valkey-pulumi",
     # Pulumi-specific deployment settings
     "persistence_enabled": True,
     "volume_name": None,
     "host_data_path": None,
+    "host_data_paths": (),
+    "data_placement": None,
+    "tmpfs_size": None,
+    "aof_placement": None,
+    "aof_host_path": None,
+    "seed_rdb_file": None,
+    "seed_volume": None,
     "restart_policy": "unless-stopped",
     "replica_count": 1,
     "replica_port_offset": 1,
+    "replica_sync_concurrency": 1,
+    "replica_sync_timeout": 600,
+    "healthcheck_enabled": True,
+    "healthcheck_interval": 2,
+    "healthcheck_timeout": 5,
+    "healthcheck_retries": 3,
+    "startup_timeout": 300,
+    "update_strategy": "replace",
+    "handoff_timeout": 30,
+    # Container resources
+    "cpuset_cpus": None,
+    "node_cpusets": (),
+    "cpus": None,
+    "cpu_shares": None,
+    "memory_limit": None,
+    "memory_reservation": None,
+    "swap_disabled": False,
+    "nofile_ulimit": None,
+    "shm_size": None,
+    "maxmemory_headroom_percent": 25,
+    # Host kernel tuning
+    "host_tuning_enabled": False,
+    "host_tuning_image": "docker.io/library/busybox:stable",
+    "transparent_hugepages": "never",
+    "vm_overcommit_memory": 1,
+    "somaxconn": None,
+    # Metrics exporter
+    "exporter_enabled": False,
+    "exporter_image": "docker.io/oliver006/redis_exporter:latest",
+    "exporter_port": 9121,
+    "exporter_user": None,
+    "exporter_password": None,
+    # Scheduled backups
+    "backup_enabled": False,
+    "backup_schedule": "0 2 * * *",
+    "backup_keep": 7,
+    "backup_replica": None,
+    "backup_dir": None,
+    "backup_s3_endpoint": None,
+    "backup_s3_bucket": None,
+    "backup_s3_prefix": None,
+    "backup_s3_access_key": None,
+    "backup_s3_secret_key": None,
+    "backup_upload_image": "docker.io/minio/mc:latest",
     # Sentinel configuration
     "valkey_sentinel_primary_name": None,
     "valkey_sentinel_host": None,
     "valkey_sentinel_port_number": 26379,
+    "sentinel_enabled": False,
+    "sentinel_count": 3,
+    "sentinel_quorum": None,
+    "sentinel_down_after_milliseconds": 5000,
+    "sentinel_failover_timeout": 60000,
+    "sentinel_parallel_syncs": 1,
+    # Cluster configuration
+    "cluster_enabled": False,
+    "cluster_primary_count": 3,
+    "cluster_replicas_per_primary": 1,
+    "cluster_node_timeout": 15000,
+    # Fleet of named deployments
+    "fleet": {},
+    "fleet_file": None,
     # For truly custom/unsupported environment variables
     "extra_env_vars": {},
 }
 
+# Expected type of each field: selects the typed Pulumi getter and validates values
+CONFIG_FIELD_TYPES: dict[str, type] = {
+    "image": str,
+    "database": str,
+    "valkey_data_dir": str,
+    "valkey_overrides_file": str,
+    "disable_commands": list,
+    "extra_flags": list,
+    "aof_enabled": bool,
+    "rdb_policy": str,
+    "rdb_policy_disabled": bool,
+    "persistence_preset": str,
+    "primary_host": str,
+    "primary_port_number": int,
+    "port": int,
+    "allow_remote_connections": bool,
+    "port_range": str,
+    "port_allocations_file": str,
+    "network_mode": str,
+    "host_address": str,
+    "replication_mode": str,
+    "replica_ip": str,
+    "replica_port": int,
+    "primary_password": str,
+    "repl_diskless_sync": bool,
+    "repl_diskless_sync_delay": int,
+    "repl_diskless_load": str,
+    "repl_backlog_size": str,
+    "repl_backlog_ttl": int,
+    "repl_backlog_write_rate": str,
+    "repl_backlog_disconnect_seconds": int,
+    "password": str,
+    "allow_empty_password": bool,
+    "client_user": str,
+    "acl_file": str,
+    "io_threads_do_reads": bool,
+    "io_threads": str,  # A thread count or "auto"
+    "tuning_profile": str,
+    "tuning_overrides": dict,
+    "maxmemory": str,
+    "maxmemory_policy": str,
+    "tcp_backlog": int,
+    "tls_enabled": bool,
+    "tls_port_number": int,
+    "tls_cert_file": str,
+    "tls_key_file": str,
+    "tls_ca_file": str,
+    "tls_ca_dir": str,
+    "tls_key_file_pass": str,
+    "tls_dh_params_file": str,
+    "tls_auth_clients": bool,
+    "tls_generate": bool,
+    "tls_cert_validity_hours": int,
+    "tls_replication": bool,
+    "tls_cluster": bool,
+    "tls_protocols": str,
+    "tls_ciphers": str,
+    "tls_ciphersuites": str,
+    "tls_prefer_server_ciphers": bool,
+    "tls_session_caching": bool,
+    "tls_session_cache_size": int,
+    "tls_session_cache_timeout": int,
+    "valkey_config_file": str,
+    "generated_config_dir": str,
+    "persistence_enabled": bool,
+    "volume_name": str,
+    "host_data_path": str,
+    "host_data_paths": list,
+    "data_placement": str,
+    "tmpfs_size": str,
+    "aof_placement": str,
+    "aof_host_path": str,
+    "seed_rdb_file": str,
+    "seed_volume": str,
+    "restart_policy": str,
+    "replica_count": int,
+    "replica_port_offset": int,
+    "replica_sync_concurrency": int,
+    "replica_sync_timeout": int,
+    "healthcheck_enabled": bool,
+    "healthcheck_interval": int,
+    "healthcheck_timeout": int,
+    "healthcheck_retries": int,
+    "startup_timeout": int,
+    "update_strategy": str,
+    "handoff_timeout": int,
+    "cpuset_cpus": str,
+    "node_cpusets": list,
+    "cpus": str,
+    "cpu_shares": int,
+    "memory_limit": str,
+    "memory_reservation": str,
+    "swap_disabled": bool,
+    "nofile_ulimit": int,
+    "shm_size": str,
+    "maxmemory_headroom_percent": int,
+    "host_tuning_enabled": bool,
+    "host_tuning_image": str,
+    "transparent_hugepages": str,
+    "vm_overcommit_memory": int,
+    "somaxconn": int,
+    "exporter_enabled": bool,
+    "exporter_image": str,
+    "exporter_port": int,
+    "exporter_user": str,
+    "exporter_password": str,
+    "backup_enabled": bool,
+    "backup_schedule": str,
+    "backup_keep": int,
+    "backup_replica": int,
+    "backup_dir": str,
+    "backup_s3_endpoint": str,
+    "backup_s3_bucket": str,
+    "backup_s3_prefix": str,
+    "backup_s3_access_key": str,
+    "backup_s3_secret_key": str,
+    "backup_upload_image": str,
+    "valkey_sentinel_primary_name": str,
+    "valkey_sentinel_host": str,
+    "valkey_sentinel_port_number": int,
+    "sentinel_enabled": bool,
+    "sentinel_count": int,
+    "sentinel_quorum": int,
+    "sentinel_down_after_milliseconds": int,
+    "sentinel_failover_timeout": int,
+    "sentinel_parallel_syncs": int,
+    "cluster_enabled": bool,
+    "cluster_primary_count": int,
+    "cluster_replicas_per_primary": int,
+    "cluster_node_timeout": int,
+    "fleet": dict,
+    "fleet_file": str,
+    "extra_env_vars": dict,
+}
+
+# Fields read with get_secret so their values stay encrypted in state
+SECRET_CONFIG_FIELDS = frozenset(
+    {"primary_password", "password", "tls_key_file_pass", "exporter_password", "backup_s3_secret_key"}
+)
+
+
+def _freeze(value: Any) -> Any:
+    """Return an immutable copy of a config value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _validate_field(field: str, value: Any) -> Any:
+    """Check a resolved config value against its declared type, coercing where unambiguous."""
+    if value is None or isinstance(value, pulumi.Output):
+        return value
+    expected = CONFIG_FIELD_TYPES[field]
+    if expected is list and isinstance(value, str):
+        # Allow "FLUSHDB,FLUSHALL" or "--foo --bar" in YAML as well as proper lists
+        return [item for item in re.split(r"[,\s]+", value) if item]
+    if expected is list and isinstance(value, tuple):
+        return value
+    if expected is int and isinstance(value, bool):
+        raise ValueError(f"valkey:{field} must be an integer, got {value!r}")
+    if expected is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Sizes such as maxmemory and CPU quotas may be given as plain numbers
+        return str(value)
+    if not isinstance(value, expected):
+        raise ValueError(f"valkey:{field} must be of type {expected.__name__}, got {value!r}")
+    return value
+
+
+def _read_field(pulumi_config: pulumi.Config, field: str) -> Any:
+    """Read a top-level project config key with the getter matching its type."""
+    if field in SECRET_CONFIG_FIELDS:
+        return pulumi_config.get_secret(field)
+    expected = CONFIG_FIELD_TYPES[field]
+    if expected is bool:
+        return pulumi_config.get_bool(field)
+    if expected is int:
+        return pulumi_config.get_int(field)
+    if expected in (list, dict):
+        return pulumi_config.get_object(field)
+    return pulumi_config.get(field)
+
+
+@functools.cache
+def resolve_stack_config() -> Mapping[str, Any]:
+    """Resolve the stack's Valkey configuration once and return an immutable snapshot.
+
+    Every field is looked up as a top-level project key first, then in the ``valkey``
+    namespace object, then in ``DEFAULT_VALKEY_CONFIG``. The result is cached for the
+    lifetime of the program, so building many ``Config`` instances does not repeat
+    the lookups. Call ``resolve_stack_config.cache_clear()`` to force a re-read.
+
+    Raises:
+        ValueError: If the ``valkey`` namespace is not a mapping or a value has the wrong type.
+
+    """
+    pulumi_config = pulumi.Config()
+    valkey_config = pulumi_config.get_object("valkey") or {}
+    if not isinstance(valkey_config, dict):
+        raise ValueError("valkey config namespace must be a mapping")
+
+    unknown = sorted(set(valkey_config) - set(DEFAULT_VALKEY_CONFIG))
+    if unknown:
+        pulumi.log.warn(f"Ignoring unknown valkey config keys: {', '.join(unknown)}")
+
+    snapshot = {
+        field: _freeze(
+            _validate_field(field, _coalesce(_read_field(pulumi_config, field), valkey_config.get(field), default))
+        )
+        for field, default in DEFAULT_VALKEY_CONFIG.items()
+    }
+    return MappingProxyType(snapshot)
+
 
 class Config:
     """Configuration class for Valkey deployment."""
@@ -89,24 +404,42 @@ class Config:
         aof_enabled: bool | None = None,
         rdb_policy: str | None = None,
         rdb_policy_disabled: bool | None = None,
+        persistence_preset: str | None = None,
         # Networking
         primary_host: str | None = None,
         primary_port_number: int | None = None,
         port: int | None = None,
         allow_remote_connections: bool | None = None,
+        port_range: str | None = None,
+        port_allocations_file: str | None = None,
+        network_mode: str | None = None,
+        host_address: str | None = None,
         # Replication
         replication_mode: str | None = None,
         replica_ip: str | None = None,
         replica_port: int | None = None,
         primary_password: str | None = None,
+        repl_diskless_sync: bool | None = None,
+        repl_diskless_sync_delay: int | None = None,
+        repl_diskless_load: str | None = None,
+        repl_backlog_size: str | int | None = None,
+        repl_backlog_ttl: int | None = None,
+        repl_backlog_write_rate: str | int | None = None,
+        repl_backlog_disconnect_seconds: int | None = None,
         # Authentication
         password: str | None = None,
         allow_empty_password: bool | None = None,
+        client_user: str | None = None,
         # Security
         acl_file: str | None = None,
         # Performance
         io_threads_do_reads: bool | None = None,
-        io_threads: int | None = None,
+        io_threads: int | str | None = None,
+        tuning_profile: str | None = None,
+        tuning_overrides: dict[str, Any] | None = None,
+        maxmemory: str | int | None = None,
+        maxmemory_policy: str | None = None,
+        tcp_backlog: int | None = None,
         # TLS/SSL
         tls_enabled: bool | None = None,
         tls_port_number: int | None = None,
@@ -117,286 +450,276 @@ class Config:
         tls_key_file_pass: str | None = None,
         tls_dh_params_file: str | None = None,
         tls_auth_clients: bool | None = None,
+        tls_generate: bool | None = None,
+        tls_cert_validity_hours: int | None = None,
+        tls_replication: bool | None = None,
+        tls_cluster: bool | None = None,
+        tls_protocols: str | None = None,
+        tls_ciphers: str | None = None,
+        tls_ciphersuites: str | None = None,
+        tls_prefer_server_ciphers: bool | None = None,
+        tls_session_caching: bool | None = None,
+        tls_session_cache_size: int | None = None,
+        tls_session_cache_timeout: int | None = None,
         # Configuration Files
         valkey_config_file: str | None = None,
+        generated_config_dir: str | None = None,
         # Pulumi-specific deployment settings
         persistence_enabled: bool | None = None,
         volume_name: str | None = None,
         host_data_path: str | None = None,
+        host_data_paths: list[str] | None = None,
+        data_placement: str | None = None,
+        tmpfs_size: str | int | None = None,
+        aof_placement: str | None = None,
+        aof_host_path: str | None = None,
+        seed_rdb_file: str | None = None,
+        seed_volume: str | None = None,
         restart_policy: str | None = None,
         replica_count: int | None = None,
         replica_port_offset: int | None = None,
+        replica_sync_concurrency: int | None = None,
+        replica_sync_timeout: int | None = None,
+        healthcheck_enabled: bool | None = None,
+        healthcheck_interval: int | None = None,
+        healthcheck_timeout: int | None = None,
+        healthcheck_retries: int | None = None,
+        startup_timeout: int | None = None,
+        update_strategy: str | None = None,
+        handoff_timeout: int | None = None,
+        # Container resources
+        cpuset_cpus: str | None = None,
+        node_cpusets: list[str] | None = None,
+        cpus: str | float | None = None,
+        cpu_shares: int | None = None,
+        memory_limit: str | int | None = None,
+        memory_reservation: str | int | None = None,
+        swap_disabled: bool | None = None,
+        nofile_ulimit: int | None = None,
+        shm_size: str | int | None = None,
+        maxmemory_headroom_percent: int | None = None,
+        # Host kernel tuning
+        host_tuning_enabled: bool | None = None,
+        host_tuning_image: str | None = None,
+        transparent_hugepages: str | None = None,
+        vm_overcommit_memory: int | None = None,
+        somaxconn: int | None = None,
+        # Metrics exporter
+        exporter_enabled: bool | None = None,
+        exporter_image: str | None = None,
+        exporter_port: int | None = None,
+        exporter_user: str | None = None,
+        exporter_password: str | None = None,
+        # Scheduled backups
+        backup_enabled: bool | None = None,
+        backup_schedule: str | None = None,
+        backup_keep: int | None = None,
+        backup_replica: int | None = None,
+        backup_dir: str | None = None,
+        backup_s3_endpoint: str | None = None,
+        backup_s3_bucket: str | None = None,
+        backup_s3_prefix: str | None = None,
+        backup_s3_access_key: str | None = None,
+        backup_s3_secret_key: str | None = None,
+        backup_upload_image: str | None = None,
         # Sentinel configuration
         valkey_sentinel_primary_name: str | None = None,
         valkey_sentinel_host: str | None = None,
         valkey_sentinel_port_number: int | None = None,
+        sentinel_enabled: bool | None = None,
+        sentinel_count: int | None = None,
+        sentinel_quorum: int | None = None,
+        sentinel_down_after_milliseconds: int | None = None,
+        sentinel_failover_timeout: int | None = None,
+        sentinel_parallel_syncs: int | None = None,
+        # Cluster configuration
+        cluster_enabled: bool | None = None,
+        cluster_primary_count: int | None = None,
+        cluster_replicas_per_primary: int | None = None,
+        cluster_node_timeout: int | None = None,
+        # Fleet of named deployments
+        fleet: dict[str, Any] | None = None,
+        fleet_file: str | None = None,
         # Custom environment variables
         extra_env_vars: dict[str, str] | None = None,
     ):
-        pulumi_config = pulumi.Config()
-        valkey_config = pulumi_config.get_object("valkey") or {}
+        stack_config = resolve_stack_config()
 
         # Basic Configuration
-        self.image = _coalesce(
-            image, pulumi_config.get("image"), valkey_config.get("image"), DEFAULT_VALKEY_CONFIG["image"]
-        )
-        self.database = _coalesce(
-            database, pulumi_config.get("database"), valkey_config.get("database"), DEFAULT_VALKEY_CONFIG["database"]
-        )
-        self.valkey_data_dir = _coalesce(
-            valkey_data_dir,
-            pulumi_config.get("valkey_data_dir"),
-            valkey_config.get("valkey_data_dir"),
-            DEFAULT_VALKEY_CONFIG["valkey_data_dir"],
-        )
-        self.valkey_overrides_file = _coalesce(
-            valkey_overrides_file,
-            pulumi_config.get("valkey_overrides_file"),
-            valkey_config.get("valkey_overrides_file"),
-            DEFAULT_VALKEY_CONFIG["valkey_overrides_file"],
-        )
-        self.disable_commands = _coalesce(
-            disable_commands,
-            pulumi_config.get_object("disable_commands"),
-            valkey_config.get("disable_commands"),
-            DEFAULT_VALKEY_CONFIG["disable_commands"],
-        )
-        value = _coalesce(
-            extra_flags,
-            pulumi_config.get_object("extra_flags"),
-            valkey_config.get("extra_flags"),
-            DEFAULT_VALKEY_CONFIG["extra_flags"],
-        )
-        self.extra_flags = tuple(value if isinstance(value, (list, tuple)) else ())
+        self.image = _coalesce(image, stack_config["image"])
+        self.database = _coalesce(database, stack_config["database"])
+        self.valkey_data_dir = _coalesce(valkey_data_dir, stack_config["valkey_data_dir"])
+        self.valkey_overrides_file = _coalesce(valkey_overrides_file, stack_config["valkey_overrides_file"])
+        self.disable_commands = _coalesce(disable_commands, stack_config["disable_commands"])
+        self.extra_flags = tuple(_coalesce(extra_flags, stack_config["extra_flags"]))
 
         # Persistence
-        self.aof_enabled = _coalesce(
-            aof_enabled,
-            pulumi_config.get_bool("aof_enabled"),
-            valkey_config.get("aof_enabled"),
-            DEFAULT_VALKEY_CONFIG["aof_enabled"],
-        )
-        self.rdb_policy = _coalesce(
-            rdb_policy,
-            pulumi_config.get("rdb_policy"),
-            valkey_config.get("rdb_policy"),
-            DEFAULT_VALKEY_CONFIG["rdb_policy"],
-        )
-        self.rdb_policy_disabled = _coalesce(
-            rdb_policy_disabled,
-            pulumi_config.get_bool("rdb_policy_disabled"),
-            valkey_config.get("rdb_policy_disabled"),
-            DEFAULT_VALKEY_CONFIG["rdb_policy_disabled"],
-        )
+        self.aof_enabled = _coalesce(aof_enabled, stack_config["aof_enabled"])
+        self.rdb_policy = _coalesce(rdb_policy, stack_config["rdb_policy"])
+        self.rdb_policy_disabled = _coalesce(rdb_policy_disabled, stack_config["rdb_policy_disabled"])
+        self.persistence_preset = _coalesce(persistence_preset, stack_config["persistence_preset"])
 
         # Networking
-        self.primary_host = _coalesce(
-            primary_host,
-            pulumi_config.get("primary_host"),
-            valkey_config.get("primary_host"),
-            DEFAULT_VALKEY_CONFIG["primary_host"],
-        )
-        self.primary_port_number = _coalesce(
-            primary_port_number,
-            pulumi_config.get_int("primary_port_number"),
-            valkey_config.get("primary_port_number"),
-            DEFAULT_VALKEY_CONFIG["primary_port_number"],
-        )
-        self.port = _coalesce(
-            port, pulumi_config.get_int("port"), valkey_config.get("port"), DEFAULT_VALKEY_CONFIG["port"]
-        )
-        self.allow_remote_connections = _coalesce(
-            allow_remote_connections,
-            pulumi_config.get_bool("allow_remote_connections"),
-            valkey_config.get("allow_remote_connections"),
-            DEFAULT_VALKEY_CONFIG["allow_remote_connections"],
-        )
+        self.primary_host = _coalesce(primary_host, stack_config["primary_host"])
+        self.primary_port_number = _coalesce(primary_port_number, stack_config["primary_port_number"])
+        self.port = _coalesce(port, stack_config["port"])
+        self.allow_remote_connections = _coalesce(allow_remote_connections, stack_config["allow_remote_connections"])
+        self.port_range = _coalesce(port_range, stack_config["port_range"])
+        self.port_allocations_file = _coalesce(port_allocations_file, stack_config["port_allocations_file"])
+        self.network_mode = _coalesce(network_mode, stack_config["network_mode"])
+        self.host_address = _coalesce(host_address, stack_config["host_address"])
 
         # Replication
-        self.replication_mode = _coalesce(
-            replication_mode,
-            pulumi_config.get("replication_mode"),
-            valkey_config.get("replication_mode"),
-            DEFAULT_VALKEY_CONFIG["replication_mode"],
-        )
-        self.replica_ip = _coalesce(
-            replica_ip,
-            pulumi_config.get("replica_ip"),
-            valkey_config.get("replica_ip"),
-            DEFAULT_VALKEY_CONFIG["replica_ip"],
-        )
-        self.replica_port = _coalesce(
-            replica_port,
-            pulumi_config.get_int("replica_port"),
-            valkey_config.get("replica_port"),
-            DEFAULT_VALKEY_CONFIG["replica_port"],
-        )
-        self.primary_password = _coalesce(
-            primary_password,
-            pulumi_config.get_secret("primary_password"),
-            valkey_config.get("primary_password"),
-            DEFAULT_VALKEY_CONFIG["primary_password"],
+        self.replication_mode = _coalesce(replication_mode, stack_config["replication_mode"])
+        self.replica_ip = _coalesce(replica_ip, stack_config["replica_ip"])
+        self.replica_port = _coalesce(replica_port, stack_config["replica_port"])
+        self.primary_password = _coalesce(primary_password, stack_config["primary_password"])
+        self.repl_diskless_sync = _coalesce(repl_diskless_sync, stack_config["repl_diskless_sync"])
+        self.repl_diskless_sync_delay = _coalesce(repl_diskless_sync_delay, stack_config["repl_diskless_sync_delay"])
+        self.repl_diskless_load = _coalesce(repl_diskless_load, stack_config["repl_diskless_load"])
+        self.repl_backlog_size = _coalesce(repl_backlog_size, stack_config["repl_backlog_size"])
+        self.repl_backlog_ttl = _coalesce(repl_backlog_ttl, stack_config["repl_backlog_ttl"])
+        self.repl_backlog_write_rate = _coalesce(repl_backlog_write_rate, stack_config["repl_backlog_write_rate"])
+        self.repl_backlog_disconnect_seconds = _coalesce(
+            repl_backlog_disconnect_seconds, stack_config["repl_backlog_disconnect_seconds"]
         )
 
         # Authentication
-        self.password = _coalesce(
-            password,
-            pulumi_config.get_secret("password"),
-            valkey_config.get("password"),
-            DEFAULT_VALKEY_CONFIG["password"],
-        )
-        self.allow_empty_password = _coalesce(
-            allow_empty_password,
-            pulumi_config.get_bool("allow_empty_password"),
-            valkey_config.get("allow_empty_password"),
-            DEFAULT_VALKEY_CONFIG["allow_empty_password"],
-        )
+        self.password = _coalesce(password, stack_config["password"])
+        self.allow_empty_password = _coalesce(allow_empty_password, stack_config["allow_empty_password"])
+        self.client_user = _coalesce(client_user, stack_config["client_user"])
 
         # Security
-        self.acl_file = _coalesce(
-            acl_file, pulumi_config.get("acl_file"), valkey_config.get("acl_file"), DEFAULT_VALKEY_CONFIG["acl_file"]
-        )
+        self.acl_file = _coalesce(acl_file, stack_config["acl_file"])
 
         # Performance
-        self.io_threads_do_reads = _coalesce(
-            io_threads_do_reads,
-            pulumi_config.get_bool("io_threads_do_reads"),
-            valkey_config.get("io_threads_do_reads"),
-            DEFAULT_VALKEY_CONFIG["io_threads_do_reads"],
-        )
-        self.io_threads = _coalesce(
-            io_threads,
-            pulumi_config.get_int("io_threads"),
-            valkey_config.get("io_threads"),
-            DEFAULT_VALKEY_CONFIG["io_threads"],
-        )
+        self.io_threads_do_reads = _coalesce(io_threads_do_reads, stack_config["io_threads_do_reads"])
+        self.io_threads = _coalesce(io_threads, stack_config["io_threads"])
+        self.tuning_profile = _coalesce(tuning_profile, stack_config["tuning_profile"])
+        self.tuning_overrides = dict(_coalesce(tuning_overrides, stack_config["tuning_overrides"]))
+        self.maxmemory = _coalesce(maxmemory, stack_config["maxmemory"])
+        self.maxmemory_policy = _coalesce(maxmemory_policy, stack_config["maxmemory_policy"])
+        self.tcp_backlog = _coalesce(tcp_backlog, stack_config["tcp_backlog"])
 
         # TLS/SSL
-        self.tls_enabled = _coalesce(
-            tls_enabled,
-            pulumi_config.get_bool("tls_enabled"),
-            valkey_config.get("tls_enabled"),
-            DEFAULT_VALKEY_CONFIG["tls_enabled"],
-        )
-        self.tls_port_number = _coalesce(
-            tls_port_number,
-            pulumi_config.get_int("tls_port_number"),
-            valkey_config.get("tls_port_number"),
-            DEFAULT_VALKEY_CONFIG["tls_port_number"],
-        )
-        self.tls_cert_file = _coalesce(
-            tls_cert_file,
-            pulumi_config.get("tls_cert_file"),
-            valkey_config.get("tls_cert_file"),
-            DEFAULT_VALKEY_CONFIG["tls_cert_file"],
-        )
-        self.tls_key_file = _coalesce(
-            tls_key_file,
-            pulumi_config.get("tls_key_file"),
-            valkey_config.get("tls_key_file"),
-            DEFAULT_VALKEY_CONFIG["tls_key_file"],
-        )
-        self.tls_ca_file = _coalesce(
-            tls_ca_file,
-            pulumi_config.get("tls_ca_file"),
-            valkey_config.get("tls_ca_file"),
-            DEFAULT_VALKEY_CONFIG["tls_ca_file"],
-        )
-        self.tls_ca_dir = _coalesce(
-            tls_ca_dir,
-            pulumi_config.get("tls_ca_dir"),
-            valkey_config.get("tls_ca_dir"),
-            DEFAULT_VALKEY_CONFIG["tls_ca_dir"],
-        )
-        self.tls_key_file_pass = _coalesce(
-            tls_key_file_pass,
-            pulumi_config.get_secret("tls_key_file_pass"),
-            valkey_config.get("tls_key_file_pass"),
-            DEFAULT_VALKEY_CONFIG["tls_key_file_pass"],
-        )
-        self.tls_dh_params_file = _coalesce(
-            tls_dh_params_file,
-            pulumi_config.get("tls_dh_params_file"),
-            valkey_config.get("tls_dh_params_file"),
-            DEFAULT_VALKEY_CONFIG["tls_dh_params_file"],
-        )
-        self.tls_auth_clients = _coalesce(
-            tls_auth_clients,
-            pulumi_config.get_bool("tls_auth_clients"),
-            valkey_config.get("tls_auth_clients"),
-            DEFAULT_VALKEY_CONFIG["tls_auth_clients"],
-        )
+        self.tls_enabled = _coalesce(tls_enabled, stack_config["tls_enabled"])
+        self.tls_port_number = _coalesce(tls_port_number, stack_config["tls_port_number"])
+        self.tls_cert_file = _coalesce(tls_cert_file, stack_config["tls_cert_file"])
+        self.tls_key_file = _coalesce(tls_key_file, stack_config["tls_key_file"])
+        self.tls_ca_file = _coalesce(tls_ca_file, stack_config["tls_ca_file"])
+        self.tls_ca_dir = _coalesce(tls_ca_dir, stack_config["tls_ca_dir"])
+        self.tls_key_file_pass = _coalesce(tls_key_file_pass, stack_config["tls_key_file_pass"])
+        self.tls_dh_params_file = _coalesce(tls_dh_params_file, stack_config["tls_dh_params_file"])
+        self.tls_auth_clients = _coalesce(tls_auth_clients, stack_config["tls_auth_clients"])
+        self.tls_generate = _coalesce(tls_generate, stack_config["tls_generate"])
+        self.tls_cert_validity_hours = _coalesce(tls_cert_validity_hours, stack_config["tls_cert_validity_hours"])
+        self.tls_replication = _coalesce(tls_replication, stack_config["tls_replication"])
+        self.tls_cluster = _coalesce(tls_cluster, stack_config["tls_cluster"])
+        self.tls_protocols = _coalesce(tls_protocols, stack_config["tls_protocols"])
+        self.tls_ciphers = _coalesce(tls_ciphers, stack_config["tls_ciphers"])
+        self.tls_ciphersuites = _coalesce(tls_ciphersuites, stack_config["tls_ciphersuites"])
+        self.tls_prefer_server_ciphers = _coalesce(tls_prefer_server_ciphers, stack_config["tls_prefer_server_ciphers"])
+        self.tls_session_caching = _coalesce(tls_session_caching, stack_config["tls_session_caching"])
+        self.tls_session_cache_size = _coalesce(tls_session_cache_size, stack_config["tls_session_cache_size"])
+        self.tls_session_cache_timeout = _coalesce(tls_session_cache_timeout, stack_config["tls_session_cache_timeout"])
 
         # Configuration Files
-        self.valkey_config_file = _coalesce(
-            valkey_config_file,
-            pulumi_config.get("valkey_config_file"),
-            valkey_config.get("valkey_config_file"),
-            DEFAULT_VALKEY_CONFIG["valkey_config_file"],
-        )
+        self.valkey_config_file = _coalesce(valkey_config_file, stack_config["valkey_config_file"])
+        self.generated_config_dir = _coalesce(generated_config_dir, stack_config["generated_config_dir"])
 
         # Pulumi-specific deployment settings
-        self.persistence_enabled = _coalesce(
-            persistence_enabled,
-            pulumi_config.get_bool("persistence_enabled"),
-            valkey_config.get("persistence_enabled"),
-            DEFAULT_VALKEY_CONFIG["persistence_enabled"],
-        )
-        self.volume_name = _coalesce(
-            volume_name,
-            pulumi_config.get("volume_name"),
-            valkey_config.get("volume_name"),
-            DEFAULT_VALKEY_CONFIG["volume_name"],
-        )
-        self.host_data_path = _coalesce(
-            host_data_path,
-            pulumi_config.get("host_data_path"),
-            valkey_config.get("host_data_path"),
-            DEFAULT_VALKEY_CONFIG["host_data_path"],
-        )
-        self.restart_policy = _coalesce(
-            restart_policy,
-            pulumi_config.get("restart_policy"),
-            valkey_config.get("restart_policy"),
-            DEFAULT_VALKEY_CONFIG["restart_policy"],
-        )
-        self.replica_count = _coalesce(
-            replica_count,
-            pulumi_config.get_int("replica_count"),
-            valkey_config.get("replica_count"),
-            DEFAULT_VALKEY_CONFIG["replica_count"],
-        )
-        self.replica_port_offset = _coalesce(
-            replica_port_offset,
-            pulumi_config.get_int("replica_port_offset"),
-            valkey_config.get("replica_port_offset"),
-            DEFAULT_VALKEY_CONFIG["replica_port_offset"],
+        self.persistence_enabled = _coalesce(persistence_enabled, stack_config["persistence_enabled"])
+        self.volume_name = _coalesce(volume_name, stack_config["volume_name"])
+        self.host_data_path = _coalesce(host_data_path, stack_config["host_data_path"])
+        self.host_data_paths = tuple(_coalesce(host_data_paths, stack_config["host_data_paths"]))
+        self.data_placement = _coalesce(data_placement, stack_config["data_placement"])
+        self.tmpfs_size = _coalesce(tmpfs_size, stack_config["tmpfs_size"])
+        self.aof_placement = _coalesce(aof_placement, stack_config["aof_placement"])
+        self.aof_host_path = _coalesce(aof_host_path, stack_config["aof_host_path"])
+        self.seed_rdb_file = _coalesce(seed_rdb_file, stack_config["seed_rdb_file"])
+        self.seed_volume = _coalesce(seed_volume, stack_config["seed_volume"])
+        self.restart_policy = _coalesce(restart_policy, stack_config["restart_policy"])
+        self.replica_count = _coalesce(replica_count, stack_config["replica_count"])
+        self.replica_port_offset = _coalesce(replica_port_offset, stack_config["replica_port_offset"])
+        self.replica_sync_concurrency = _coalesce(replica_sync_concurrency, stack_config["replica_sync_concurrency"])
+        self.replica_sync_timeout = _coalesce(replica_sync_timeout, stack_config["replica_sync_timeout"])
+        self.healthcheck_enabled = _coalesce(healthcheck_enabled, stack_config["healthcheck_enabled"])
+        self.healthcheck_interval = _coalesce(healthcheck_interval, stack_config["healthcheck_interval"])
+        self.healthcheck_timeout = _coalesce(healthcheck_timeout, stack_config["healthcheck_timeout"])
+        self.healthcheck_retries = _coalesce(healthcheck_retries, stack_config["healthcheck_retries"])
+        self.startup_timeout = _coalesce(startup_timeout, stack_config["startup_timeout"])
+        self.update_strategy = _coalesce(update_strategy, stack_config["update_strategy"])
+        self.handoff_timeout = _coalesce(handoff_timeout, stack_config["handoff_timeout"])
+
+        # Container resources
+        self.cpuset_cpus = _coalesce(cpuset_cpus, stack_config["cpuset_cpus"])
+        self.node_cpusets = tuple(_coalesce(node_cpusets, stack_config["node_cpusets"]))
+        self.cpus = _coalesce(cpus, stack_config["cpus"])
+        self.cpu_shares = _coalesce(cpu_shares, stack_config["cpu_shares"])
+        self.memory_limit = _coalesce(memory_limit, stack_config["memory_limit"])
+        self.memory_reservation = _coalesce(memory_reservation, stack_config["memory_reservation"])
+        self.swap_disabled = _coalesce(swap_disabled, stack_config["swap_disabled"])
+        self.nofile_ulimit = _coalesce(nofile_ulimit, stack_config["nofile_ulimit"])
+        self.shm_size = _coalesce(shm_size, stack_config["shm_size"])
+        self.maxmemory_headroom_percent = _coalesce(
+            maxmemory_headroom_percent, stack_config["maxmemory_headroom_percent"]
         )
 
+        # Host kernel tuning
+        self.host_tuning_enabled = _coalesce(host_tuning_enabled, stack_config["host_tuning_enabled"])
+        self.host_tuning_image = _coalesce(host_tuning_image, stack_config["host_tuning_image"])
+        self.transparent_hugepages = _coalesce(transparent_hugepages, stack_config["transparent_hugepages"])
+        self.vm_overcommit_memory = _coalesce(vm_overcommit_memory, stack_config["vm_overcommit_memory"])
+        self.somaxconn = _coalesce(somaxconn, stack_config["somaxconn"])
+
+        # Metrics exporter
+        self.exporter_enabled = _coalesce(exporter_enabled, stack_config["exporter_enabled"])
+        self.exporter_image = _coalesce(exporter_image, stack_config["exporter_image"])
+        self.exporter_port = _coalesce(exporter_port, stack_config["exporter_port"])
+        self.exporter_user = _coalesce(exporter_user, stack_config["exporter_user"])
+        self.exporter_password = _coalesce(exporter_password, stack_config["exporter_password"])
+
+        # Scheduled backups
+        self.backup_enabled = _coalesce(backup_enabled, stack_config["backup_enabled"])
+        self.backup_schedule = _coalesce(backup_schedule, stack_config["backup_schedule"])
+        self.backup_keep = _coalesce(backup_keep, stack_config["backup_keep"])
+        self.backup_replica = _coalesce(backup_replica, stack_config["backup_replica"])
+        self.backup_dir = _coalesce(backup_dir, stack_config["backup_dir"])
+        self.backup_s3_endpoint = _coalesce(backup_s3_endpoint, stack_config["backup_s3_endpoint"])
+        self.backup_s3_bucket = _coalesce(backup_s3_bucket, stack_config["backup_s3_bucket"])
+        self.backup_s3_prefix = _coalesce(backup_s3_prefix, stack_config["backup_s3_prefix"])
+        self.backup_s3_access_key = _coalesce(backup_s3_access_key, stack_config["backup_s3_access_key"])
+        self.backup_s3_secret_key = _coalesce(backup_s3_secret_key, stack_config["backup_s3_secret_key"])
+        self.backup_upload_image = _coalesce(backup_upload_image, stack_config["backup_upload_image"])
+
         # Sentinel configuration
         self.valkey_sentinel_primary_name = _coalesce(
-            valkey_sentinel_primary_name,
-            pulumi_config.get("valkey_sentinel_primary_name"),
-            valkey_config.get("valkey_sentinel_primary_name"),
-            DEFAULT_VALKEY_CONFIG["valkey_sentinel_primary_name"],
-        )
-        self.valkey_sentinel_host = _coalesce(
-            valkey_sentinel_host,
-            pulumi_config.get("valkey_sentinel_host"),
-            valkey_config.get("valkey_sentinel_host"),
-            DEFAULT_VALKEY_CONFIG["valkey_sentinel_host"],
+            valkey_sentinel_primary_name, stack_config["valkey_sentinel_primary_name"]
         )
+        self.valkey_sentinel_host = _coalesce(valkey_sentinel_host, stack_config["valkey_sentinel_host"])
         self.valkey_sentinel_port_number = _coalesce(
-            valkey_sentinel_port_number,
-            pulumi_config.get_int("valkey_sentinel_port_number"),
-            valkey_config.get("valkey_sentinel_port_number"),
-            DEFAULT_VALKEY_CONFIG["valkey_sentinel_port_number"],
+            valkey_sentinel_port_number, stack_config["valkey_sentinel_port_number"]
+        )
+        self.sentinel_enabled = _coalesce(sentinel_enabled, stack_config["sentinel_enabled"])
+        self.sentinel_count = _coalesce(sentinel_count, stack_config["sentinel_count"])
+        self.sentinel_quorum = _coalesce(sentinel_quorum, stack_config["sentinel_quorum"])
+        self.sentinel_down_after_milliseconds = _coalesce(
+            sentinel_down_after_milliseconds, stack_config["sentinel_down_after_milliseconds"]
         )
+        self.sentinel_failover_timeout = _coalesce(sentinel_failover_timeout, stack_config["sentinel_failover_timeout"])
+        self.sentinel_parallel_syncs = _coalesce(sentinel_parallel_syncs, stack_config["sentinel_parallel_syncs"])
 
-        # Extra environment variables (truly custom ones)
-        config_extra_env_vars = (
-            pulumi_config.get_object("extra_env_vars")
-            or valkey_config.get("extra_env_vars")
-            or DEFAULT_VALKEY_CONFIG["extra_env_vars"]
+        # Cluster configuration
+        self.cluster_enabled = _coalesce(cluster_enabled, stack_config["cluster_enabled"])
+        self.cluster_primary_count = _coalesce(cluster_primary_count, stack_config["cluster_primary_count"])
+        self.cluster_replicas_per_primary = _coalesce(
+            cluster_replicas_per_primary, stack_config["cluster_replicas_per_primary"]
         )
-        self.extra_env_vars = extra_env_vars or config_extra_env_vars
+        self.cluster_node_timeout = _coalesce(cluster_node_timeout, stack_config["cluster_node_timeout"])
+
+        # Fleet of named deployments
+        self.fleet = dict(_coalesce(fleet, stack_config["fleet"]))
+        self.fleet_file = _coalesce(fleet_file, stack_config["fleet_file"])
+
+        # Extra environment variables (truly custom ones)
+        self.extra_env_vars = dict(extra_env_vars or stack_config["extra_env_vars"])
@@ -3,6 +3,9 @@
 Select an example by setting VALKEY_EXAMPLE to one of:
   - standalone (default)
   - replica_set
+  - cluster
+  - benchmark
+  - fleet
   - tls
   - acl
 """
@@ -15,6 +18,9 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from valkey_pulumi.examples.acl_example import deploy_acl_valkey
+from valkey_pulumi.examples.benchmark import deploy_benchmarked_valkey
+from valkey_pulumi.examples.cluster import deploy_valkey_cluster
+from valkey_pulumi.examples.fleet import deploy_valkey_fleet
 from valkey_pulumi.examples.replica_set import deploy_valkey_replica_set
 from valkey_pulumi.examples.standalone import deploy_standalone_valkey
 from valkey_pulumi.examples.tls_example import deploy_tls_valkey
@@ -29,6 +35,9 @@ def main():
     Available examples:
         - standalone: Deploys a single Valkey instance
         - replica_set: Deploys Valkey with replica configuration
+        - cluster: Deploys a sharded Valkey Cluster
+        - benchmark: Deploys Valkey and runs valkey-benchmark against it
+        - fleet: Deploys several named instances from one fleet spec
         - tls: Deploys Valkey with TLS encryption
         - acl: Deploys Valkey with Access Control Lists (ACL)
 
@@ -43,6 +52,12 @@ def main():
 
     if choice == "replica_set":
         deploy_valkey_replica_set()
+    elif choice == "cluster":
+        deploy_valkey_cluster()
+    elif choice == "benchmark":
+        deploy_benchmarked_valkey()
+    elif choice == "fleet":
+        deploy_valkey_fleet()
     elif choice == "tls":
         deploy_tls_valkey()
     elif choice == "acl":
@@ -0,0 +1,38 @@
+"""Example: Benchmark a Valkey deployment using Pulumi.
+
+This example demonstrates how to deploy a standalone Valkey instance and measure it with
+valkey-benchmark, so tuning changes can be compared with numbers.
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path to import the valkey module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from valkey_pulumi import ValkeyBenchmark, create_standalone_valkey
+
+
+def deploy_benchmarked_valkey():
+    """Deploy a standalone Valkey instance and run a pipelined SET/GET benchmark against it.
+
+    Results are exported as `valkey-benchmark_results` and written to
+    `.valkey-pulumi/valkey-benchmark/benchmark.json`.
+    """
+    valkey = create_standalone_valkey("valkey-bench-target", io_threads="auto", tuning_profile="throughput")
+    benchmark = ValkeyBenchmark(
+        "valkey-benchmark",
+        valkey,
+        clients=50,
+        requests=200000,
+        pipeline=16,
+        data_size=64,
+        tests=["set", "get", "incr", "lpush"],
+        keyspace=100000,
+    )
+
+    return valkey, benchmark
+
+
+if __name__ == "__main__":
+    deploy_benchmarked_valkey()
@@ -0,0 +1,41 @@
+"""Example: Deploy a sharded Valkey Cluster using Pulumi.
+
+This example demonstrates how to deploy a Valkey Cluster with several primaries,
+each followed by its own replicas, so that writes scale horizontally.
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path to import the valkey module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from valkey_pulumi import create_valkey_cluster
+
+
+def deploy_valkey_cluster():
+    """Deploy a Valkey Cluster using Pulumi configuration.
+
+    Shard counts are read from `cluster_primary_count` and `cluster_replicas_per_primary`
+    in the current stack config unless explicitly provided.
+    """
+    cluster = create_valkey_cluster("valkey-cluster")
+
+    return cluster
+
+
+def deploy_valkey_cluster_with_overrides():
+    """Deploy a six-primary Valkey Cluster without replicas (for development)."""
+    cluster = create_valkey_cluster(
+        "valkey-cluster-dev",
+        primary_count=6,
+        replicas_per_primary=0,
+        allow_empty_password=True,
+        persistence_enabled=False,
+    )
+
+    return cluster
+
+
+if __name__ == "__main__":
+    deploy_valkey_cluster()
@@ -0,0 +1,42 @@
+"""Example: Deploy a fleet of Valkey instances from one spec using Pulumi.
+
+This example demonstrates how to deploy several independent caches, a replica set and a
+cluster in a single stack, sharing defaults and overriding them per instance.
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path to import the valkey module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from valkey_pulumi import create_fleet
+from valkey_pulumi.fleet import parse_fleet
+
+
+def deploy_valkey_fleet():
+    """Deploy two standalone caches, a replica set and a three-shard cluster.
+
+    The same spec can live in the stack config under `valkey:fleet`, or in a YAML file
+    named by `valkey:fleet_file`.
+    """
+    spec = {
+        "defaults": {"allow_empty_password": True, "memory_limit": "512mb", "persistence_preset": "none"},
+        "instances": {
+            "sessions": {"kind": "standalone", "port": 6400},
+            "rate-limits": {"kind": "standalone", "port": 6401, "tuning_profile": "low-latency"},
+            "catalog": {
+                "kind": "replica-set",
+                "port": 6410,
+                "replica_count": 2,
+                "replica_port_offset": 1,
+                "primary": {"persistence_preset": "aof-everysec"},
+            },
+            "search": {"kind": "cluster", "port": 7000, "cluster_primary_count": 3, "cluster_replicas_per_primary": 0},
+        },
+    }
+    return create_fleet(parse_fleet(spec))
+
+
+if __name__ == "__main__":
+    deploy_valkey_fleet()
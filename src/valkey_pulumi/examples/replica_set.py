@@ -11,7 +11,7 @@ import sys
 # Add the parent directory to the path to import the valkey module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from valkey_pulumi import create_valkey_replica_set
+from valkey_pulumi import create_valkey_replica_set, create_valkey_sentinel_replica_set
 
 
 def deploy_valkey_replica_set():
@@ -75,6 +75,26 @@ def deploy_simple_replica_set():
     return replica_set
 
 
+def deploy_sentinel_replica_set():
+    """Deploy a Valkey replica set with three Sentinels for automatic failover."""
+    primary_config = {
+        "password": "my_password",
+        "valkey_sentinel_primary_name": "valkey-primary",
+        "sentinel_down_after_milliseconds": 5000,
+        "sentinel_failover_timeout": 30000,
+    }
+
+    replica_set = create_valkey_sentinel_replica_set(
+        "valkey-sentinel-replica-set",
+        replica_count=2,
+        primary_config=primary_config,
+        replica_config={"password": "my_password"},
+        sentinel_count=3,
+    )
+
+    return replica_set
+
+
 if __name__ == "__main__":
     # Deploy the Valkey replica set
     deploy_valkey_replica_set()
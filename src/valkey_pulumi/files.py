@@ -0,0 +1,50 @@
+"""Files a deployment generates on the Pulumi host.
+
+valkey.conf, topology manifests, peer lists, TLS material and benchmark results live under
+``generated_config_dir``. Running containers bind-mount several of them, so they are rewritten
+in place, and only when their contents change. Previews (``pulumi preview`` and offline plans)
+compute the paths but leave the files alone: a preview must not change what live containers see.
+"""
+
+import os
+
+import pulumi
+
+
+def write_generated_file(path: str, content: str, mode: int | None = None, group: int | None = None) -> str:
+    """Write ``content`` to ``path`` unless it is already there, and return the path.
+
+    Args:
+        path: Absolute file path; missing directories are created
+        content: File contents
+        mode: Permission bits to give the file, instead of the umask default
+        group: Group ID to give the file, instead of the creating user's group
+
+    """
+    if pulumi.runtime.is_dry_run():
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        status = os.stat(path)
+        with open(path) as existing:
+            if (
+                existing.read() == content
+                and (mode is None or status.st_mode & 0o777 == mode)
+                and (group is None or status.st_gid == group)
+            ):
+                return path
+    # Rewrite in place: a bind-mounted file keeps its inode, so running containers see the update.
+    # A new file is created with ``mode`` so its contents are never readable with wider permissions.
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666 if mode is None else mode)
+    with os.fdopen(descriptor, "w") as written:
+        if group is not None:
+            try:
+                os.fchown(written.fileno(), -1, group)
+            except PermissionError as error:
+                raise PermissionError(
+                    f"Cannot give {path} to group {group}: run Pulumi as root or as a member of that group"
+                ) from error
+        if mode is not None:
+            os.fchmod(written.fileno(), mode)
+        written.write(content)
+    return path
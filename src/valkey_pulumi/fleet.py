@@ -0,0 +1,144 @@
+"""Fleet specs: many named Valkey deployments in one stack.
+
+A fleet spec comes from the ``fleet`` config key or from the YAML file named by ``fleet_file``::
+
+    defaults:                  # applied to every instance, on top of the valkey namespace
+      memory_limit: 1gb
+    instances:
+      sessions:
+        kind: standalone
+        port: 6400
+      catalog:
+        kind: replica-set
+        port: 6410
+        replica_count: 2
+        replica:               # replica-only settings
+          memory_limit: 2gb
+      search:
+        kind: cluster
+        port: 7000
+        cluster_primary_count: 3
+
+Instance settings are ``Config`` fields. Without ``kind``, an instance is deployed the way
+``main()`` picks a topology: ``cluster_enabled``, then ``sentinel_enabled``, then
+``replica_count`` (1 by default, so such an instance is a replica set).
+"""
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import yaml
+
+from valkey_pulumi.config import DEFAULT_VALKEY_CONFIG, _validate_field
+
+FLEET_KINDS = ("standalone", "replica-set", "sentinel-replica-set", "cluster")
+REPLICA_SET_KINDS = ("replica-set", "sentinel-replica-set")
+# Fleet settings only make sense at the top of the stack configuration
+NON_INSTANCE_FIELDS = ("fleet", "fleet_file")
+# Docker container names: the instance name prefixes every resource it creates
+_INSTANCE_NAME = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_.-]*$")
+
+
+@dataclass(frozen=True)
+class FleetInstance:
+    """One named deployment of a fleet."""
+
+    name: str
+    kind: str | None
+    settings: dict[str, Any] = field(default_factory=dict)
+    primary: dict[str, Any] = field(default_factory=dict)
+    replica: dict[str, Any] = field(default_factory=dict)
+
+    def primary_settings(self) -> dict[str, Any]:
+        """Config settings for the primary of a replica set, or for every container otherwise."""
+        return {**self.settings, **self.primary}
+
+    def replica_settings(self) -> dict[str, Any]:
+        """Config settings for the replicas of a replica set."""
+        return {**self.settings, **self.replica}
+
+
+def _plain(value: Any) -> Any:
+    """Return a mutable copy of a (possibly frozen) config value."""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, tuple | list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _settings(context: str, settings: Any) -> dict[str, Any]:
+    """Validate a mapping of Config settings and return a plain copy."""
+    if not isinstance(settings, Mapping):
+        raise ValueError(f"{context} must be a mapping")
+    checked = {}
+    for key, value in settings.items():
+        if key not in DEFAULT_VALKEY_CONFIG or key in NON_INSTANCE_FIELDS:
+            raise ValueError(f"{context}: unknown setting '{key}'")
+        try:
+            checked[key] = _validate_field(key, _plain(value))
+        except ValueError as error:
+            raise ValueError(f"{context}: {error}") from error
+    return checked
+
+
+def _not_a_replica_set(kind: str | None, settings: Mapping[str, Any]) -> bool:
+    """Return whether an instance is a standalone instance or a cluster by its own settings.
+
+    Without ``kind`` the stack configuration can still make an instance a replica set; that
+    case is checked once the kind is resolved, by ``create_fleet``.
+    """
+    if kind is not None:
+        return True
+    if settings.get("cluster_enabled"):
+        return True
+    return settings.get("sentinel_enabled") is False and settings.get("replica_count") == 0
+
+
+def parse_fleet(spec: Mapping[str, Any]) -> list[FleetInstance]:
+    """Turn a fleet spec into its instances, with ``defaults`` merged into every instance.
+
+    Raises:
+        ValueError: If the spec has no instances, an instance name is not a valid container
+            name, a kind is unknown, a setting is unknown or has the wrong type, or an instance
+            has ``primary`` or ``replica`` settings without being a replica set.
+
+    """
+    spec = _plain(spec)
+    unknown = sorted(set(spec) - {"defaults", "instances"})
+    if unknown:
+        raise ValueError(f"Unknown fleet keys: {', '.join(unknown)}")
+    defaults = _settings("fleet defaults", spec.get("defaults") or {})
+    instances = spec.get("instances") or {}
+    if not isinstance(instances, Mapping) or not instances:
+        raise ValueError("A fleet needs at least one entry under 'instances'")
+
+    parsed = []
+    for name, entry in instances.items():
+        context = f"fleet instance '{name}'"
+        if not _INSTANCE_NAME.match(str(name)):
+            raise ValueError(f"{context}: name must be a valid container name")
+        if entry is not None and not isinstance(entry, Mapping):
+            raise ValueError(f"{context} must be a mapping")
+        entry = dict(entry or {})
+        kind = entry.pop("kind", None)
+        if kind is not None and kind not in FLEET_KINDS:
+            raise ValueError(f"{context}: unknown kind '{kind}'. Available: {', '.join(FLEET_KINDS)}")
+        primary = _settings(f"{context} primary", entry.pop("primary", None) or {})
+        replica = _settings(f"{context} replica", entry.pop("replica", None) or {})
+        settings = {**defaults, **_settings(context, entry)}
+        if (primary or replica) and kind not in REPLICA_SET_KINDS and _not_a_replica_set(kind, {**settings, **primary}):
+            raise ValueError(f"{context}: 'primary' and 'replica' settings need a replica set kind")
+        parsed.append(FleetInstance(str(name), kind, settings, primary, replica))
+    return parsed
+
+
+def load_fleet_file(path: str) -> dict[str, Any]:
+    """Read a fleet spec from a YAML file."""
+    with open(path) as fleet_file:
+        spec = yaml.safe_load(fleet_file) or {}
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Fleet file {path} must contain a mapping")
+    return spec
@@ -0,0 +1,357 @@
+"""Offline deployment plans.
+
+``plan_deployment`` runs a deployment function (``main``, ``create_valkey_replica_set(...)``, ...)
+against in-process Pulumi mocks and records every resource it registers. The components run
+unchanged, so the plan matches what ``pulumi up`` would create, but nothing talks to the Docker
+daemon or the Pulumi engine. Like ``pulumi preview``, a plan leaves generated files (valkey.conf,
+the topology manifest, TLS material) alone: their paths appear in the plan, but nothing on disk
+is rewritten.
+
+``valkey-pulumi-plan`` prints the plan for a stack file::
+
+    valkey-pulumi-plan Pulumi.prod.yaml
+    valkey-pulumi-plan Pulumi.prod.yaml --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import pulumi
+import yaml
+
+from valkey_pulumi.__main__ import (
+    _PORT_ALLOCATORS,
+    _REMOTE_IMAGES,
+    _TLS_AUTHORITIES,
+    _TLS_MATERIAL,
+    _cpuset_size,
+    main,
+)
+from valkey_pulumi.config import resolve_stack_config
+from valkey_pulumi.tuning import parse_size
+
+DEFAULT_PROJECT = "valkey"
+DEFAULT_STACK = "plan"
+
+# Pulumi type tokens of the resources the components create
+RESOURCE_KINDS = {
+    "docker:index/container:Container": "container",
+    "docker:index/volume:Volume": "volume",
+    "docker:index/network:Network": "network",
+    "docker:index/remoteImage:RemoteImage": "image",
+}
+# Outputs of generated TLS material, which only exist once pulumi up creates it
+TLS_MATERIAL_OUTPUTS = {
+    "tls:index/privateKey:PrivateKey": "privateKeyPem",
+    "tls:index/selfSignedCert:SelfSignedCert": "certPem",
+    "tls:index/certRequest:CertRequest": "certRequestPem",
+    "tls:index/locallySignedCert:LocallySignedCert": "certPem",
+}
+
+
+@dataclass(frozen=True)
+class PlannedResource:
+    """A resource the deployment would register, with its inputs as Pulumi sees them (camelCase keys)."""
+
+    type: str
+    name: str
+    inputs: dict[str, Any]
+
+    @property
+    def kind(self) -> str:
+        """Short resource kind: ``container``, ``volume``, ``network`` or ``image``."""
+        return RESOURCE_KINDS.get(self.type, self.type)
+
+
+@dataclass
+class PlanFootprint:
+    """Host resources a plan reserves.
+
+    Memory and CPU are the sums of the container limits; containers without a limit are listed
+    separately because they can use the whole host. ``tmpfs_bytes`` is already part of the
+    memory the containers can use on top of their limits.
+    """
+
+    containers: int = 0
+    memory_bytes: int = 0
+    unbounded_memory: list[str] = field(default_factory=list)
+    cpus: float = 0.0
+    unbounded_cpu: list[str] = field(default_factory=list)
+    tmpfs_bytes: int = 0
+    volumes: list[str] = field(default_factory=list)
+    bind_mounts: list[str] = field(default_factory=list)
+    port_conflicts: dict[int, list[str]] = field(default_factory=dict)
+
+
+@dataclass
+class DeploymentPlan:
+    """The resources a deployment would create and the warnings it would log."""
+
+    resources: list[PlannedResource] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    def of_kind(self, kind: str) -> list[PlannedResource]:
+        """Return the planned resources of one kind, sorted by name."""
+        return [resource for resource in self.resources if resource.kind == kind]
+
+    @property
+    def containers(self) -> list[PlannedResource]:
+        """Planned docker.Container resources."""
+        return self.of_kind("container")
+
+    @property
+    def volumes(self) -> list[PlannedResource]:
+        """Planned docker.Volume resources."""
+        return self.of_kind("volume")
+
+    @property
+    def networks(self) -> list[PlannedResource]:
+        """Planned docker.Network resources."""
+        return self.of_kind("network")
+
+    @property
+    def images(self) -> list[PlannedResource]:
+        """Planned docker.RemoteImage resources."""
+        return self.of_kind("image")
+
+    def container(self, name: str) -> PlannedResource:
+        """Return the planned container called ``name``.
+
+        Raises:
+            KeyError: If the plan has no such container.
+
+        """
+        for resource in self.containers:
+            if resource.name == name:
+                return resource
+        raise KeyError(name)
+
+    def env(self, name: str) -> dict[str, str]:
+        """Return the environment of the planned container called ``name`` as a mapping."""
+        return dict(env.split("=", 1) for env in self.container(name).inputs.get("envs", []))
+
+    def host_ports(self) -> dict[int, list[str]]:
+        """Map every published host port to the containers that publish it."""
+        ports: dict[int, list[str]] = {}
+        for resource in self.containers:
+            for port in resource.inputs.get("ports", []):
+                ports.setdefault(int(port.get("external", port["internal"])), []).append(resource.name)
+        return dict(sorted(ports.items()))
+
+    def footprint(self) -> PlanFootprint:
+        """Sum the memory, CPU and storage the planned containers reserve."""
+        footprint = PlanFootprint()
+        for resource in self.containers:
+            inputs = resource.inputs
+            # One-shot jobs (cluster bootstrap, benchmark, host tuning) do not keep running
+            if inputs.get("mustRun") is False:
+                continue
+            footprint.containers += 1
+
+            if inputs.get("memory"):
+                footprint.memory_bytes += int(inputs["memory"]) * 1024**2
+            else:
+                footprint.unbounded_memory.append(resource.name)
+
+            if inputs.get("cpus"):
+                footprint.cpus += float(inputs["cpus"])
+            elif inputs.get("cpuSet"):
+                footprint.cpus += _cpuset_size(inputs["cpuSet"])
+            else:
+                footprint.unbounded_cpu.append(resource.name)
+
+            for options in (inputs.get("tmpfs") or {}).values():
+                size = next((opt.split("=", 1)[1] for opt in options.split(",") if opt.startswith("size=")), None)
+                if size:
+                    footprint.tmpfs_bytes += parse_size(size)
+
+            for mount in inputs.get("volumes", []):
+                if mount.get("hostPath") and not mount.get("readOnly"):
+                    footprint.bind_mounts.append(mount["hostPath"])
+
+        footprint.volumes = [resource.inputs.get("name", resource.name) for resource in self.volumes]
+        footprint.port_conflicts = {port: names for port, names in self.host_ports().items() if len(names) > 1}
+        return footprint
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plan, its warnings and its footprint as JSON-serializable data."""
+        return {
+            "resources": [
+                {"kind": resource.kind, "name": resource.name, "inputs": resource.inputs} for resource in self.resources
+            ],
+            "warnings": self.warnings,
+            "footprint": vars(self.footprint()),
+        }
+
+    def format(self) -> str:
+        """Render the plan as a human-readable summary."""
+        lines = []
+        for kind in ("network", "image", "volume"):
+            for resource in self.of_kind(kind):
+                lines.append(f"{kind:<9} {resource.name}")
+        for resource in self.containers:
+            inputs = resource.inputs
+            ports = ", ".join(
+                f"{int(p.get('external', p['internal']))}->{int(p['internal'])}" for p in inputs.get("ports", [])
+            )
+            limits = [
+                f"memory={int(inputs['memory'])}MB" if inputs.get("memory") else None,
+                f"cpus={inputs['cpus']}" if inputs.get("cpus") else None,
+                f"cpuset={inputs['cpuSet']}" if inputs.get("cpuSet") else None,
+            ]
+            details = " ".join(item for item in [ports, *limits] if item)
+            lines.append(f"container {resource.name} [{inputs.get('image', '?')}] {details}".rstrip())
+
+        footprint = self.footprint()
+        lines.append("")
+        lines.append(f"Long-running containers: {footprint.containers}")
+        memory = f"Memory: {footprint.memory_bytes / 1024**3:.2f} GiB"
+        if footprint.unbounded_memory:
+            memory += f" + unlimited ({', '.join(footprint.unbounded_memory)})"
+        lines.append(memory)
+        cpu = f"CPU: {footprint.cpus:g}"
+        if footprint.unbounded_cpu:
+            cpu += f" + unlimited ({', '.join(footprint.unbounded_cpu)})"
+        lines.append(cpu)
+        lines.append(f"tmpfs: {footprint.tmpfs_bytes / 1024**3:.2f} GiB")
+        lines.append(f"Docker volumes: {len(footprint.volumes)}")
+        lines.append(f"Bind mounts: {len(footprint.bind_mounts)}")
+        for port, names in footprint.port_conflicts.items():
+            lines.append(f"Port conflict: {port} is published by {', '.join(names)}")
+        for warning in self.warnings:
+            lines.append(f"warning: {warning}")
+        return "\n".join(lines)
+
+
+class _PlanMocks(pulumi.runtime.Mocks):
+    """Pulumi mocks that record every registered resource."""
+
+    def __init__(self):
+        self.resources: list[PlannedResource] = []
+
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        self.resources.append(PlannedResource(args.typ, args.name, dict(args.inputs)))
+        outputs = dict(args.inputs)
+        if args.typ == "docker:index/remoteImage:RemoteImage":
+            # Containers are created from the digest, which only the registry knows
+            outputs["repoDigest"] = args.inputs["name"]
+        if args.typ in TLS_MATERIAL_OUTPUTS:
+            outputs[TLS_MATERIAL_OUTPUTS[args.typ]] = f"(planned {args.name})\n"
+        return [f"{args.name}_id", outputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        return {}
+
+
+class _WarningCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def _config_values(stack_config: Mapping[str, Any], project: str) -> dict[str, str]:
+    """Turn a stack file's ``config`` mapping into the namespaced string values Pulumi expects."""
+    values = {}
+    for key, value in stack_config.items():
+        name = key if ":" in key else f"{project}:{key}"
+        if isinstance(value, dict) and "secure" in value:
+            raise ValueError(f"Cannot plan with encrypted config value '{key}'; pass the plaintext config instead")
+        values[name] = value if isinstance(value, str) else json.dumps(value)
+    return values
+
+
+def plan_deployment(
+    deploy: Callable[[], Any] = main,
+    stack_config: Mapping[str, Any] | None = None,
+    project: str = DEFAULT_PROJECT,
+    stack: str = DEFAULT_STACK,
+) -> DeploymentPlan:
+    """Run ``deploy`` against Pulumi mocks and return the resources it would create.
+
+    Args:
+        deploy: Deployment function, ``main`` by default
+        stack_config: Contents of a stack file's ``config`` mapping; keys without a namespace
+            belong to ``project``
+        project: Pulumi project name
+        stack: Pulumi stack name
+
+    Returns:
+        The planned resources sorted by name and the warnings the deployment logged
+
+    """
+    mocks = _PlanMocks()
+    collector = _WarningCollector()
+    logger = logging.getLogger(f"{__name__}.{stack}")
+    logger.propagate = False
+    logger.addHandler(collector)
+
+    # A preview: generated files and port allocations are computed but not written
+    dry_run = pulumi.runtime.is_dry_run()
+    pulumi.runtime.set_mocks(mocks, project=project, stack=stack, preview=True, logger=logger)
+    pulumi.runtime.set_all_config(_config_values(stack_config or {}, project))
+    # Caches hold resources and config of a previous program run
+    resolve_stack_config.cache_clear()
+    _REMOTE_IMAGES.clear()
+    _PORT_ALLOCATORS.clear()
+    _TLS_AUTHORITIES.clear()
+    _TLS_MATERIAL.clear()
+    try:
+        pulumi.runtime.test(deploy)()
+    finally:
+        logger.removeHandler(collector)
+        pulumi.runtime.settings.SETTINGS.dry_run = dry_run
+        resolve_stack_config.cache_clear()
+        _REMOTE_IMAGES.clear()
+        _PORT_ALLOCATORS.clear()
+        _TLS_AUTHORITIES.clear()
+        _TLS_MATERIAL.clear()
+    # Registration order depends on when each resource's inputs resolve
+    return DeploymentPlan(sorted(mocks.resources, key=lambda resource: resource.name), collector.messages)
+
+
+def load_stack_config(path: str) -> dict[str, Any]:
+    """Read the ``config`` mapping of a Pulumi stack file."""
+    with open(path) as stack_file:
+        document = yaml.safe_load(stack_file) or {}
+    return document.get("config") or {}
+
+
+def _project_name(stack_file: str) -> str:
+    """Read the project name from the Pulumi.yaml next to ``stack_file``."""
+    project_file = os.path.join(os.path.dirname(os.path.abspath(stack_file)), "Pulumi.yaml")
+    if not os.path.exists(project_file):
+        return DEFAULT_PROJECT
+    with open(project_file) as project:
+        return (yaml.safe_load(project) or {}).get("name", DEFAULT_PROJECT)
+
+
+def cli(argv: list[str] | None = None) -> int:
+    """Print the plan for a Pulumi stack file."""
+    parser = argparse.ArgumentParser(
+        prog="valkey-pulumi-plan", description="Show what a stack would deploy without Docker or the Pulumi engine."
+    )
+    parser.add_argument("stack_file", help="Pulumi stack file, e.g. Pulumi.dev.yaml")
+    parser.add_argument("--json", action="store_true", help="print the plan as JSON")
+    args = parser.parse_args(argv)
+
+    stack = os.path.basename(args.stack_file).removeprefix("Pulumi.").removesuffix(".yaml") or DEFAULT_STACK
+    plan = plan_deployment(main, load_stack_config(args.stack_file), _project_name(args.stack_file), stack)
+    if args.json:
+        json.dump(plan.to_dict(), sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+    else:
+        print(plan.format())
+    return 1 if plan.footprint().port_conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
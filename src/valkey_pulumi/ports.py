@@ -0,0 +1,146 @@
+"""Host port allocation for dense multi-instance hosts.
+
+With ``port_range`` set, every published port (client, TLS, Sentinel, exporter) is
+taken from the range instead of the fixed ``port + offset`` layout. Assignments are keyed by
+``<container>/<purpose>`` and kept in a JSON file under ``generated_config_dir``, so a container
+keeps its ports across runs and adding a deployment never moves an existing one.
+
+Several stacks can share the file (and the host): each keeps its assignments under its own
+``<project>/<stack>`` scope and only ever releases those, while every scope's ports count as
+taken. Changes re-read the file under an exclusive lock and replace it atomically, so stacks
+updating at the same time never hand out a port twice or leave a truncated file.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+
+PORT_ALLOCATIONS_FILENAME = "ports.json"
+PORT_ALLOCATIONS_VERSION = 2
+
+
+def parse_port_range(value: str) -> tuple[int, int]:
+    """Parse a ``"first-last"`` port range.
+
+    Raises:
+        ValueError: If the range is malformed, empty or outside 1-65535.
+
+    """
+    try:
+        first, last = (int(part) for part in str(value).split("-", 1))
+    except ValueError:
+        raise ValueError(f"Invalid port range '{value}', expected 'first-last' such as '20000-20999'") from None
+    if not 1 <= first <= last <= 65535:
+        raise ValueError(f"Invalid port range '{value}': ports must satisfy 1 <= first <= last <= 65535")
+    return first, last
+
+
+class PortAllocator:
+    """Hand out host ports from a range and remember them in a JSON file.
+
+    ``assignments`` holds the ports of ``scope``. With ``read_only`` (previews and plans) the
+    file is read but never written.
+    """
+
+    def __init__(self, path: str, scope: str, read_only: bool = False):
+        self.path = os.path.abspath(path)
+        self.scope = scope
+        self.read_only = read_only
+        stacks, unscoped = self._read()
+        self.assignments: dict[str, int] = stacks.pop(scope, {})
+        self.other_scopes: dict[str, dict[str, int]] = stacks
+        # Version 1 files were not scoped; their entries are adopted by whichever stack asks for them
+        self.unscoped: dict[str, int] = unscoped
+        self.requested: set[str] = set()
+
+    def allocate(self, key: str, port_range: tuple[int, int]) -> int:
+        """Return the port assigned to ``key``, assigning the lowest free port in ``port_range`` if needed.
+
+        An existing assignment is kept as long as it still lies inside ``port_range``.
+
+        Raises:
+            ValueError: If every port in the range is taken.
+
+        """
+        first, last = port_range
+        self.requested.add(key)
+        if key not in self.assignments and key in self.unscoped:
+            self.assignments[key] = self.unscoped.pop(key)
+        port = self.assignments.get(key)
+        if port is not None and first <= port <= last:
+            return port
+
+        with self._update():
+            taken = {assigned for other, assigned in self.assignments.items() if other != key}
+            taken.update(self.unscoped.values())
+            for ports in self.other_scopes.values():
+                taken.update(ports.values())
+            port = next((candidate for candidate in range(first, last + 1) if candidate not in taken), None)
+            if port is None:
+                raise ValueError(f"Port range {first}-{last} has no free port left for {key}")
+            self.assignments[key] = port
+        return port
+
+    def release_unrequested(self) -> list[str]:
+        """Forget assignments of this scope nobody asked for in this run and return their keys."""
+        released = sorted(set(self.assignments) - self.requested)
+        if released:
+            with self._update():
+                for key in released:
+                    del self.assignments[key]
+        return released
+
+    def _read(self) -> tuple[dict[str, dict[str, int]], dict[str, int]]:
+        """Return the assignments of every scope and the unscoped ones stored in the file."""
+        if not os.path.exists(self.path):
+            return {}, {}
+        with open(self.path) as allocations:
+            document = json.load(allocations)
+        unscoped = document["ports"] if document.get("version", 1) == 1 else document.get("unscoped", {})
+        stacks = {
+            name: {key: int(port) for key, port in ports.items()} for name, ports in document.get("stacks", {}).items()
+        }
+        return stacks, {key: int(port) for key, port in unscoped.items()}
+
+    @contextlib.contextmanager
+    def _update(self) -> Iterator[None]:
+        """Change the assignments of this scope against the other scopes' latest ones, then save them.
+
+        The file is re-read under an exclusive lock on ``<path>.lock``, which is held until the
+        new contents have replaced it. With ``read_only`` changes stay in memory.
+        """
+        if self.read_only:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            stacks, unscoped = self._read()
+            stacks.pop(self.scope, None)
+            self.other_scopes = stacks
+            self.unscoped = {key: port for key, port in unscoped.items() if key not in self.assignments}
+            yield
+            self._save()
+
+    def _save(self) -> None:
+        stacks = {**self.other_scopes, self.scope: self.assignments}
+        document: dict[str, object] = {
+            "version": PORT_ALLOCATIONS_VERSION,
+            "stacks": {name: dict(sorted(ports.items())) for name, ports in sorted(stacks.items()) if ports},
+        }
+        if self.unscoped:
+            document["unscoped"] = dict(sorted(self.unscoped.items()))
+        # Readers see either the old file or the new one, never a partly written one
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".ports-", suffix=".json")
+        try:
+            with os.fdopen(descriptor, "w") as allocations:
+                os.fchmod(allocations.fileno(), 0o644)
+                json.dump(document, allocations, indent=2)
+                allocations.write("\n")
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
@@ -0,0 +1,53 @@
+"""Machine-readable topology manifests for client-side routing.
+
+Components describe their endpoints (role, ports, TLS, auth user and recommended read weights)
+in a JSON document that application clients can load instead of hand-maintained host lists.
+"""
+
+import json
+import os
+from typing import Any
+
+from valkey_pulumi.files import write_generated_file
+
+TOPOLOGY_MANIFEST_FILENAME = "topology.json"
+TOPOLOGY_MANIFEST_VERSION = 1
+PEER_LIST_FILENAME = "peers"
+
+
+def read_weights(replica_cpus: list[int]) -> tuple[int, list[int]]:
+    """Recommend relative read weights for a primary and its replicas.
+
+    Reads go to replicas in proportion to the CPUs each one is allocated, and the primary only
+    serves reads when there are no replicas.
+
+    Returns:
+        ``(primary_weight, replica_weights)``
+
+    """
+    if not replica_cpus:
+        return 1, []
+    return 0, [max(cpus, 1) for cpus in replica_cpus]
+
+
+def _write_if_changed(directory: str, name: str, filename: str, content: str) -> str:
+    """Write ``content`` to ``<directory>/<name>/<filename>`` unless it is already there; return the path."""
+    return write_generated_file(os.path.join(os.path.abspath(directory), name, filename), content)
+
+
+def write_topology_manifest(manifest: dict[str, Any], directory: str, name: str) -> str:
+    """Write a topology manifest under ``<directory>/<name>/`` and return its absolute path.
+
+    The file is only rewritten when its contents change.
+    """
+    content = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    return _write_if_changed(directory, name, TOPOLOGY_MANIFEST_FILENAME, content)
+
+
+def write_peer_list(endpoints: list[str], directory: str, name: str) -> str:
+    """Write the replica endpoints of a replica set, one per line, under ``<directory>/<name>/``.
+
+    Rolling updates mount this file into the primary and the rejoin job, which read the current
+    replicas from it; unlike container inputs it can change without replacing either.
+    """
+    return _write_if_changed(directory, name, PEER_LIST_FILENAME, "".join(f"{endpoint}\n" for endpoint in endpoints))
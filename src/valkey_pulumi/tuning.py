@@ -0,0 +1,360 @@
+"""Performance tuning profiles and generated Valkey configuration files.
+
+Most performance-related directives (memory policy, event loop frequency, buffer limits,
+lazy freeing, defragmentation) have no Bitnami environment variable. This module merges a
+named tuning profile, explicit ``Config`` fields and per-key overrides into a ``valkey.conf``
+that is mounted into the container.
+"""
+
+import hashlib
+import os
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from valkey_pulumi.config import Config
+from valkey_pulumi.files import write_generated_file
+
+_LAZYFREE_ALL = {
+    "lazyfree-lazy-eviction": "yes",
+    "lazyfree-lazy-expire": "yes",
+    "lazyfree-lazy-server-del": "yes",
+    "lazyfree-lazy-user-del": "yes",
+    "lazyfree-lazy-user-flush": "yes",
+    "replica-lazy-flush": "yes",
+}
+
+# Reviewed baselines; values are strings, or lists for directives that may repeat
+TUNING_PROFILES: dict[str, dict[str, str | list[str]]] = {
+    # Evicting cache: never refuse writes, free memory off the main thread
+    "cache-lru": {
+        "maxmemory-policy": "allkeys-lru",
+        "maxmemory-samples": "10",
+        **_LAZYFREE_ALL,
+        "activedefrag": "yes",
+        "hz": "10",
+        "dynamic-hz": "yes",
+        "tcp-backlog": "511",
+        "tcp-keepalive": "60",
+        "client-output-buffer-limit": ["normal 0 0 0", "replica 256mb 64mb 60", "pubsub 32mb 8mb 60"],
+    },
+    # Short, predictable command latency: small defrag slices, more frequent timers
+    "low-latency": {
+        "maxmemory-policy": "allkeys-lru",
+        **_LAZYFREE_ALL,
+        "activedefrag": "yes",
+        "active-defrag-cycle-min": "1",
+        "active-defrag-cycle-max": "10",
+        "hz": "50",
+        "dynamic-hz": "yes",
+        "tcp-backlog": "1024",
+        "tcp-keepalive": "30",
+        "latency-tracking": "yes",
+        "client-output-buffer-limit": ["normal 0 0 0", "replica 256mb 64mb 60", "pubsub 32mb 8mb 60"],
+    },
+    # Bulk throughput: deep accept queue, generous replica buffers, no defrag overhead
+    "throughput": {
+        "maxmemory-policy": "allkeys-lru",
+        **_LAZYFREE_ALL,
+        "activedefrag": "no",
+        "hz": "10",
+        "dynamic-hz": "yes",
+        "tcp-backlog": "4096",
+        "tcp-keepalive": "300",
+        "client-output-buffer-limit": ["normal 0 0 0", "replica 1gb 256mb 120", "pubsub 64mb 16mb 120"],
+    },
+    # Datastore: refuse writes instead of evicting, keep fsync work incremental
+    "durable": {
+        "maxmemory-policy": "noeviction",
+        "lazyfree-lazy-server-del": "yes",
+        "lazyfree-lazy-user-del": "yes",
+        "activedefrag": "yes",
+        "hz": "10",
+        "dynamic-hz": "yes",
+        "tcp-backlog": "511",
+        "tcp-keepalive": "60",
+        "aof-rewrite-incremental-fsync": "yes",
+        "rdb-save-incremental-fsync": "yes",
+        "client-output-buffer-limit": ["normal 0 0 0", "replica 512mb 128mb 120", "pubsub 32mb 8mb 60"],
+    },
+}
+
+_AOF_COMMON = {
+    "appendonly": "yes",
+    "aof-use-rdb-preamble": "yes",
+    "auto-aof-rewrite-percentage": "100",
+    "auto-aof-rewrite-min-size": "64mb",
+    "aof-rewrite-incremental-fsync": "yes",
+    "rdb-save-incremental-fsync": "yes",
+    # The AOF with an RDB preamble already covers restarts; skip periodic snapshots
+    "save": '""',
+}
+
+# Coherent persistence settings; "replica-only-persistence" is resolved per container
+PERSISTENCE_PRESETS: dict[str, dict[str, str]] = {
+    # Pure cache: nothing is written to disk
+    "none": {"appendonly": "no", "save": '""'},
+    # Periodic snapshots only: cheapest writes, minutes of data at risk
+    "rdb-only": {
+        "appendonly": "no",
+        "save": "3600 1 300 100 60 10000",
+        "rdb-save-incremental-fsync": "yes",
+    },
+    # At most about a second of writes at risk; fsync is skipped during rewrites to avoid stalls
+    "aof-everysec": {**_AOF_COMMON, "appendfsync": "everysec", "no-appendfsync-on-rewrite": "yes"},
+    # Every write is fsynced before it is acknowledged
+    "aof-always": {**_AOF_COMMON, "appendfsync": "always", "no-appendfsync-on-rewrite": "no"},
+}
+REPLICA_ONLY_PERSISTENCE = "replica-only-persistence"
+
+GENERATED_CONFIG_FILENAME = "valkey.conf"
+REPL_DISKLESS_LOAD_MODES = ("disabled", "on-empty-db", "swapdb")
+# Valkey's built-in repl-backlog-size; the sizing helper never goes below it
+DEFAULT_REPL_BACKLOG_SIZE = 1024**2
+# Valkey's built-in tcp-backlog and the net.core.somaxconn a fresh network namespace gets on Linux 5.4+
+VALKEY_DEFAULT_TCP_BACKLOG = 511
+LINUX_DEFAULT_SOMAXCONN = 4096
+
+# Valkey size units: k/m/g are powers of 1000, kb/mb/gb are powers of 1024
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1000,
+    "kb": 1024,
+    "m": 1000**2,
+    "mb": 1024**2,
+    "g": 1000**3,
+    "gb": 1024**3,
+}
+
+
+def parse_size(value: str | int) -> int:
+    """Parse a Valkey-style memory size (``"512mb"``, ``"2gb"``, ``1073741824``) into bytes.
+
+    Raises:
+        ValueError: If the value is not a recognised size.
+
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", str(value))
+    if not match or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def derived_maxmemory(config: Config) -> int | None:
+    """Return ``maxmemory`` in bytes derived from the container memory limit, if one is set.
+
+    ``maxmemory_headroom_percent`` of the limit is left for fork copy-on-write during
+    persistence, fragmentation and client buffers, so the kernel OOM killer is never the
+    eviction policy.
+    """
+    if config.memory_limit is None:
+        return None
+    headroom = min(max(config.maxmemory_headroom_percent, 0), 90)
+    return parse_size(config.memory_limit) * (100 - headroom) // 100
+
+
+def repl_backlog_size_for(write_rate: str | int, disconnect_seconds: int, safety_factor: float = 2.0) -> int:
+    """Size the replication backlog to ride out a replica disconnect without a full resync.
+
+    A replica can resume with a partial resync as long as everything written while it was
+    away still fits in the backlog, i.e. ``write_rate * disconnect_seconds``. The result is
+    multiplied by ``safety_factor`` for write bursts and rounded up to whole megabytes.
+
+    Args:
+        write_rate: Replication stream bytes per second (e.g. ``"8mb"``)
+        disconnect_seconds: Longest disconnect that must not trigger a full resync
+        safety_factor: Headroom multiplier for bursts
+
+    Returns:
+        The backlog size in bytes
+
+    """
+    needed = parse_size(write_rate) * disconnect_seconds * safety_factor
+    megabytes = -(-int(needed) // 1024**2)
+    return max(megabytes * 1024**2, DEFAULT_REPL_BACKLOG_SIZE)
+
+
+def _directive_value(value: Any) -> str | list[str]:
+    """Normalize an override value to the string form used in valkey.conf."""
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, (list, tuple)):
+        return [str(_directive_value(item)) for item in value]
+    return str(value)
+
+
+def tls_directives(config: Config) -> dict[str, str]:
+    """Collect the TLS protocol, cipher and session cache directives of a Config.
+
+    The Bitnami image only configures the TLS port and files; these settings go to valkey.conf.
+    Session caching (on by default in Valkey) lets reconnecting clients resume a session and
+    skip the full handshake. Unset fields keep Valkey's defaults.
+    """
+    settings = {
+        "tls-replication": config.tls_replication,
+        "tls-cluster": config.tls_cluster,
+        "tls-protocols": config.tls_protocols,
+        "tls-ciphers": config.tls_ciphers,
+        "tls-ciphersuites": config.tls_ciphersuites,
+        "tls-prefer-server-ciphers": config.tls_prefer_server_ciphers,
+        "tls-session-caching": config.tls_session_caching,
+        "tls-session-cache-size": config.tls_session_cache_size,
+        "tls-session-cache-timeout": config.tls_session_cache_timeout,
+    }
+    directives = {}
+    for directive, value in settings.items():
+        if value is None:
+            continue
+        value = _directive_value(value)
+        # Lists such as "TLSv1.2 TLSv1.3" are one argument
+        directives[directive] = f'"{value}"' if " " in value else value
+    return directives
+
+
+def config_directives(config: Config) -> dict[str, str | list[str]]:
+    """Collect the valkey.conf directives implied by a Config.
+
+    The tuning profile and persistence preset are applied first, then explicit fields such as
+    ``maxmemory`` (derived from ``memory_limit`` when not set) and the replication settings
+    (``repl-backlog-size`` derived from the expected write rate when not set), then the TLS
+    settings of TLS-enabled Configs, then ``tuning_overrides``. Override
+    keys may use underscores instead of hyphens, and an override of ``None`` removes a
+    directive set by the profile.
+
+    Raises:
+        ValueError: If ``tuning_profile``, ``persistence_preset`` or ``repl_diskless_load`` is
+            not a known value.
+
+    """
+    directives: dict[str, str | list[str]] = {}
+    if config.tuning_profile:
+        if config.tuning_profile not in TUNING_PROFILES:
+            raise ValueError(
+                f"Unknown tuning profile '{config.tuning_profile}'. Available: {', '.join(sorted(TUNING_PROFILES))}"
+            )
+        directives.update(TUNING_PROFILES[config.tuning_profile])
+    if config.persistence_preset:
+        # Unresolved replica-only persistence describes a primary: it keeps nothing on disk
+        preset = "none" if config.persistence_preset == REPLICA_ONLY_PERSISTENCE else config.persistence_preset
+        if preset not in PERSISTENCE_PRESETS:
+            available = [*sorted(PERSISTENCE_PRESETS), REPLICA_ONLY_PERSISTENCE]
+            raise ValueError(
+                f"Unknown persistence preset '{config.persistence_preset}'. Available: {', '.join(available)}"
+            )
+        directives.update(PERSISTENCE_PRESETS[preset])
+
+    if config.maxmemory is not None:
+        directives["maxmemory"] = _directive_value(config.maxmemory)
+    elif config.memory_limit is not None:
+        directives["maxmemory"] = f"{derived_maxmemory(config) // 1024**2}mb"
+    if config.maxmemory_policy is not None:
+        directives["maxmemory-policy"] = config.maxmemory_policy
+    if config.tcp_backlog is not None:
+        directives["tcp-backlog"] = str(config.tcp_backlog)
+
+    if config.repl_diskless_sync is not None:
+        directives["repl-diskless-sync"] = _directive_value(config.repl_diskless_sync)
+    if config.repl_diskless_sync_delay is not None:
+        directives["repl-diskless-sync-delay"] = str(config.repl_diskless_sync_delay)
+    if config.repl_diskless_load is not None:
+        if config.repl_diskless_load not in REPL_DISKLESS_LOAD_MODES:
+            raise ValueError(
+                f"Invalid repl_diskless_load '{config.repl_diskless_load}'. "
+                f"Available: {', '.join(REPL_DISKLESS_LOAD_MODES)}"
+            )
+        directives["repl-diskless-load"] = config.repl_diskless_load
+    if config.repl_backlog_size is not None:
+        directives["repl-backlog-size"] = _directive_value(config.repl_backlog_size)
+    elif config.repl_backlog_write_rate is not None and config.repl_backlog_disconnect_seconds is not None:
+        size = repl_backlog_size_for(config.repl_backlog_write_rate, config.repl_backlog_disconnect_seconds)
+        directives["repl-backlog-size"] = f"{size // 1024**2}mb"
+    if config.repl_backlog_ttl is not None:
+        directives["repl-backlog-ttl"] = str(config.repl_backlog_ttl)
+
+    if config.tls_enabled:
+        directives.update(tls_directives(config))
+
+    overrides: Mapping[str, Any] = config.tuning_overrides or {}
+    for key, value in overrides.items():
+        directive = key.replace("_", "-").lower()
+        if value is None:
+            directives.pop(directive, None)
+        else:
+            directives[directive] = _directive_value(value)
+    return directives
+
+
+def tcp_backlog_exceeds_somaxconn(config: Config) -> tuple[int, int] | None:
+    """Check the effective ``tcp-backlog`` against the ``somaxconn`` the container will see.
+
+    The kernel silently truncates the accept queue to ``net.core.somaxconn``, so a larger
+    ``tcp-backlog`` only looks tuned.
+
+    Returns:
+        ``(tcp_backlog, somaxconn)`` when the backlog is too large, otherwise None
+
+    """
+    backlog = int(config_directives(config).get("tcp-backlog", VALKEY_DEFAULT_TCP_BACKLOG))
+    somaxconn = config.somaxconn if config.somaxconn is not None else LINUX_DEFAULT_SOMAXCONN
+    if backlog > somaxconn:
+        return backlog, somaxconn
+    return None
+
+
+def effective_aof_enabled(config: Config) -> bool | None:
+    """Return whether AOF is on, letting ``appendonly`` from the generated config win over ``aof_enabled``."""
+    appendonly = config_directives(config).get("appendonly")
+    if appendonly is None:
+        return config.aof_enabled
+    return appendonly == "yes"
+
+
+def render_valkey_conf(config: Config) -> str | None:
+    """Render the generated valkey.conf for a Config.
+
+    The contents of ``valkey_config_file`` (if any) come first so that the generated
+    directives, which Valkey applies last, win over hand-written ones.
+
+    Returns:
+        The file contents, or None when the Config does not need a generated file
+
+    """
+    directives = config_directives(config)
+    if not directives:
+        return None
+
+    lines = ["# Generated by valkey-pulumi. Do not edit; change the stack configuration instead."]
+    if config.tuning_profile:
+        lines.append(f"# Tuning profile: {config.tuning_profile}")
+    if config.valkey_config_file:
+        with open(os.path.abspath(config.valkey_config_file)) as user_file:
+            lines.extend(["", f"# Included from {config.valkey_config_file}", user_file.read().rstrip("\n"), ""])
+    for directive, value in directives.items():
+        for item in value if isinstance(value, list) else [value]:
+            lines.append(f"{directive} {item}")
+    return "\n".join(lines) + "\n"
+
+
+def config_digest(config: Config) -> str | None:
+    """Return a short digest of the generated valkey.conf, or None if nothing is generated."""
+    content = render_valkey_conf(config)
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def write_valkey_conf(config: Config, name: str) -> str | None:
+    """Write the generated valkey.conf for a container and return its absolute host path.
+
+    Files live under ``<generated_config_dir>/<name>/`` and are only rewritten when their
+    contents change.
+    """
+    content = render_valkey_conf(config)
+    if content is None:
+        return None
+
+    path = os.path.join(os.path.abspath(config.generated_config_dir), name, GENERATED_CONFIG_FILENAME)
+    return write_generated_file(path, content)
@@ -1,6 +1,48 @@
+import pulumi
 import pytest
 
+from valkey_pulumi.__main__ import _PORT_ALLOCATORS, _REMOTE_IMAGES, _TLS_AUTHORITIES, _TLS_MATERIAL
+from valkey_pulumi.config import resolve_stack_config
+
 
 @pytest.fixture
 def data():
     return True
+
+
+@pytest.fixture(autouse=True)
+def fresh_stack_state():
+    resolve_stack_config.cache_clear()
+    _REMOTE_IMAGES.clear()
+    _PORT_ALLOCATORS.clear()
+    _TLS_AUTHORITIES.clear()
+    _TLS_MATERIAL.clear()
+    yield
+    resolve_stack_config.cache_clear()
+    _REMOTE_IMAGES.clear()
+    _PORT_ALLOCATORS.clear()
+    _TLS_AUTHORITIES.clear()
+    _TLS_MATERIAL.clear()
+
+
+class RecordingMocks(pulumi.runtime.Mocks):
+    """Pulumi mocks that remember every resource registered by a program."""
+
+    def __init__(self):
+        self.resources = {}
+
+    def new_resource(self, args):
+        self.resources[args.name] = args
+        return [f"{args.name}_id", args.inputs]
+
+    def call(self, args):
+        return {}
+
+
+@pytest.fixture
+def pulumi_mocks(monkeypatch, tmp_path):
+    # Generated files land under the working directory
+    monkeypatch.chdir(tmp_path)
+    mocks = RecordingMocks()
+    pulumi.runtime.set_mocks(mocks, preview=False)
+    return mocks
@@ -64,7 +64,7 @@ else:
 
 
 def _env_dict(envs):
-    return {env.name: env.value for env in envs}
+    return dict(env.split("=", 1) for env in envs)
 
 
 def test_package_has_version():
@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+
+import pulumi
+import pytest
+
+from valkey_pulumi import ValkeyBenchmark, create_valkey_cluster, create_valkey_replica_set
+from valkey_pulumi.__main__ import _benchmark_script
+from valkey_pulumi.benchmark import parse_benchmark_csv, write_benchmark_results
+
+CSV_OUTPUT = """valkey 07:12:01.12 INFO  ==> ** Starting Valkey setup **
+"test","rps","avg_latency_ms","min_latency_ms","p50_latency_ms","p95_latency_ms","p99_latency_ms","max_latency_ms"
+"SET","98039.22","0.272","0.080","0.263","0.375","0.455","1.191"
+"GET","104166.67","0.255","0.072","0.247","0.343","0.415","0.919"
+"""
+
+
+def test_parse_benchmark_csv_skips_banner_lines():
+    results = parse_benchmark_csv(CSV_OUTPUT)
+
+    assert set(results) == {"SET", "GET"}
+    assert results["SET"]["rps"] == pytest.approx(98039.22)
+    assert results["GET"]["p99_latency_ms"] == pytest.approx(0.415)
+
+
+def test_parse_benchmark_csv_requires_results():
+    with pytest.raises(ValueError, match="no CSV results"):
+        parse_benchmark_csv("Could not connect to Valkey at 127.0.0.1:6379")
+
+
+def test_write_benchmark_results(tmp_path):
+    path = write_benchmark_results(parse_benchmark_csv(CSV_OUTPUT), str(tmp_path), "bench")
+
+    with open(path) as results_file:
+        assert json.load(results_file)["SET"]["p50_latency_ms"] == pytest.approx(0.263)
+
+
+@pulumi.runtime.test
+def test_benchmark_joins_the_primary_network_namespace(pulumi_mocks):
+    replica_set = create_valkey_replica_set("rs", replica_count=1, primary_config={"password": "s3cret"})
+    benchmark = ValkeyBenchmark("rs-bench", replica_set, clients=100, pipeline=16, tests=["set", "get", "lpush"])
+
+    def check(_):
+        inputs = pulumi_mocks.resources["rs-bench"].inputs
+        assert inputs["networkMode"] == "container:rs-primary"
+        script = inputs["command"][-1]
+        assert "-c 100" in script
+        assert "-P 16" in script
+        assert "-t set,get,lpush" in script
+        assert "s3cret" not in script
+        assert "VALKEY_BENCHMARK_AUTH=s3cret" in inputs["envs"]
+
+    return benchmark.container.id.apply(check)
+
+
+@pulumi.runtime.test
+def test_benchmark_uses_cluster_mode_against_clusters(pulumi_mocks):
+    cluster = create_valkey_cluster("shards", primary_count=3, replicas_per_primary=0, allow_empty_password=True)
+    benchmark = ValkeyBenchmark("shards-bench", cluster)
+
+    def check(_):
+        inputs = pulumi_mocks.resources["shards-bench"].inputs
+        assert inputs["networkMode"] == "container:shards-node-0"
+        assert inputs["command"][-1].rstrip().endswith("--cluster")
+
+    return benchmark.container.id.apply(check)
+
+
+def _fake_tools(tmp_path, reply):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "valkey-cli").write_text(f'#!/bin/sh\necho "${{VALKEYCLI_AUTH-unset}}" > "$AUTH_LOG"\necho {reply}\n')
+    (bin_dir / "valkey-benchmark").write_text("#!/bin/sh\necho benchmarked\n")
+    for tool in bin_dir.iterdir():
+        tool.chmod(0o755)
+    return {"PATH": f"{bin_dir}:{os.environ['PATH']}", "AUTH_LOG": str(tmp_path / "auth"), "VALKEY_BENCHMARK_AUTH": ""}
+
+
+def test_benchmark_script_waits_without_an_empty_password(tmp_path):
+    script = _benchmark_script(6379, [], 10, 100, 1, 3, ["set"], wait_timeout=5)
+
+    result = subprocess.run(["bash", "-c", script], env=_fake_tools(tmp_path, "PONG"), capture_output=True, text=True)
+
+    assert result.stdout.strip() == "benchmarked"
+    assert (tmp_path / "auth").read_text().strip() == "unset"
+
+
+def test_benchmark_script_gives_up_on_an_unreachable_target(tmp_path):
+    script = _benchmark_script(6379, [], 10, 100, 1, 3, ["set"], wait_timeout=0)
+
+    result = subprocess.run(["bash", "-c", script], env=_fake_tools(tmp_path, "ERR"), capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert "did not answer PING within 0s" in result.stderr
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from valkey_pulumi import create_standalone_valkey, create_valkey_replica_set
+from valkey_pulumi.certificates import TLS_KEY_GROUP, write_tls_material
+from valkey_pulumi.plan import plan_deployment
+
+pytest.importorskip("pulumi_tls")
+
+TLS = {"tls_enabled": True, "tls_generate": True, "tls_port_number": 6380, "allow_empty_password": True}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_generated_material_is_mounted_as_one_directory():
+    def deploy():
+        create_valkey_replica_set(
+            "rs",
+            replica_count=1,
+            primary_config={**TLS, "exporter_enabled": True},
+            replica_config={**TLS, "tls_replication": True},
+        )
+
+    plan = plan_deployment(deploy)
+
+    types = [resource.type for resource in plan.resources if resource.type.startswith("tls:")]
+    # One CA, and a key, request and certificate per Valkey container
+    assert types.count("tls:index/selfSignedCert:SelfSignedCert") == 1
+    assert types.count("tls:index/locallySignedCert:LocallySignedCert") == 2
+    tls_dir = os.path.abspath(".valkey-pulumi/rs-primary/tls")
+    tls_mounts = [m for m in plan.container("rs-primary").inputs["volumes"] if "/tls" in m["containerPath"]]
+    assert tls_mounts == [{"containerPath": tls_dir, "hostPath": tls_dir, "readOnly": True}]
+    assert plan.env("rs-primary")["VALKEY_TLS_CERT_FILE"] == f"{tls_dir}/valkey.crt"
+    # The exporter reuses the certificate of the container it scrapes
+    assert plan.env("rs-primary-exporter")["REDIS_EXPORTER_TLS_CLIENT_KEY_FILE"] == f"{tls_dir}/valkey.key"
+    assert plan.container("rs-primary-exporter").inputs["groupAdds"] == [str(TLS_KEY_GROUP)]
+    assert plan.env("rs-replica-0")["VALKEY_TLS_CA_FILE"].endswith("/rs-replica-0/tls/ca.crt")
+    # With tls_replication, replicas sync from the primary's TLS port
+    assert plan.env("rs-replica-0")["VALKEY_PRIMARY_PORT_NUMBER"] == "6380"
+
+
+def test_generated_material_cannot_be_mixed_with_own_files():
+    with pytest.raises(ValueError, match="tls_generate cannot be combined"):
+        plan_deployment(lambda: create_standalone_valkey("cache", tls_cert_file="valkey.crt", **TLS))
+
+
+def test_planning_leaves_existing_material_alone(tmp_path):
+    tls_dir = tmp_path / ".valkey-pulumi" / "cache" / "tls"
+    tls_dir.mkdir(parents=True)
+    existing = {name: f"live {name}\n".encode() for name in ("ca.crt", "valkey.crt", "valkey.key")}
+    for name, content in existing.items():
+        (tls_dir / name).write_bytes(content)
+
+    plan = plan_deployment(lambda: create_standalone_valkey("cache", **TLS))
+
+    assert plan.env("cache")["VALKEY_TLS_KEY_FILE"] == str(tls_dir / "valkey.key")
+    assert {path.name: path.read_bytes() for path in tls_dir.iterdir()} == existing
+
+
+def test_key_is_only_readable_by_its_group(monkeypatch, tmp_path):
+    groups = []
+    monkeypatch.setattr(os, "fchown", lambda fd, uid, gid: groups.append(gid))
+
+    write_tls_material(str(tmp_path), "ca\n", "cert\n", "key\n")
+
+    assert {path.name: path.stat().st_mode & 0o777 for path in tmp_path.iterdir()} == {
+        "ca.crt": 0o644,
+        "valkey.crt": 0o644,
+        "valkey.key": 0o640,
+    }
+    assert groups == [TLS_KEY_GROUP]
+
+
+def test_key_group_that_cannot_be_set_is_an_error(monkeypatch, tmp_path):
+    def refuse(fd, uid, gid):
+        raise PermissionError("Operation not permitted")
+
+    monkeypatch.setattr(os, "fchown", refuse)
+
+    with pytest.raises(PermissionError, match="run Pulumi as root or as a member of that group"):
+        write_tls_material(str(tmp_path), "ca\n", "cert\n", "key\n")
@@ -0,0 +1,122 @@
+import os
+import subprocess
+
+import pulumi
+import pytest
+
+from valkey_pulumi import create_valkey_cluster
+from valkey_pulumi.__main__ import CLUSTER_HASH_SLOTS, _cluster_bootstrap_script, _cluster_slot_ranges
+from valkey_pulumi.plan import plan_deployment
+
+
+def test_slot_ranges_cover_all_slots_evenly():
+    ranges = _cluster_slot_ranges(3)
+
+    assert ranges == [(0, 5461), (5462, 10922), (10923, 16383)]
+    assert sum(last - first + 1 for first, last in ranges) == CLUSTER_HASH_SLOTS
+
+
+def test_slot_ranges_reject_empty_cluster():
+    with pytest.raises(ValueError):
+        _cluster_slot_ranges(0)
+
+
+def test_bootstrap_script_assigns_slots_and_replicas():
+    script = _cluster_bootstrap_script(["n0", "n1"], {"n2": "n0", "n3": "n1"}, 6379)
+
+    assert "cli n0 CLUSTER ADDSLOTSRANGE 0 8191" in script
+    assert "cli n1 CLUSTER ADDSLOTSRANGE 8192 16383" in script
+    assert 'cli n3 CLUSTER MEET "$seed_ip" 6379' in script
+    assert "primary_id=$(cli n1 CLUSTER MYID" in script
+    assert "cluster_slots_assigned:16384" in script
+
+
+# A stand-in valkey-cli keeping each node's slots, primary and the seed's known nodes in files
+FAKE_CLUSTER_CLI = r"""#!/bin/bash
+while [ "$1" != "-h" ]; do shift; done
+host=$2
+shift 4
+echo "$host $*" >> "$CLUSTER_LOG"
+cd "$CLUSTER_STATE"
+case "$1 ${2:-}" in
+  "PING ") echo PONG ;;
+  "CLUSTER MYID") echo "id-$host" ;;
+  "CLUSTER INFO") printf "cluster_slots_assigned:0\ncluster_known_nodes:%s\ncluster_state:ok\n" "$(($(wc -l < known) + 1))" ;;
+  "CLUSTER NODES")
+    echo "id-$host $host:6379@16379 myself,master $(cat "$host.primary" 2>/dev/null || echo -) 0 0 1 connected" \
+      "$(cat "$host.slots" 2>/dev/null)"
+    if [ "$host" = n0 ]; then sed 's/$/ peer:6379@16379 master - 0 0 1 connected/' known; fi
+    ;;
+  "CLUSTER ADDSLOTSRANGE") echo "$3-$4" > "$host.slots" && echo OK ;;
+  "CLUSTER MEET") echo "id-$host" >> known && echo OK ;;
+  "CLUSTER REPLICATE") echo "$3" > "$host.primary" && echo OK ;;
+esac
+"""
+
+
+def test_bootstrap_script_resumes_a_partial_bootstrap(tmp_path):
+    state = tmp_path / "state"
+    state.mkdir()
+    # An earlier run gave n0 its slots, met n2 and attached n3, then stopped
+    (state / "n0.slots").write_text("0-8191\n")
+    (state / "known").write_text("id-n2\n")
+    (state / "n3.primary").write_text("id-n1\n")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "valkey-cli").write_text(FAKE_CLUSTER_CLI)
+    (bin_dir / "getent").write_text('#!/bin/sh\necho "10.0.0.2 $2"\n')
+    for tool in bin_dir.iterdir():
+        tool.chmod(0o755)
+    env = {"PATH": f"{bin_dir}:{os.environ['PATH']}", "CLUSTER_STATE": str(state), "CLUSTER_LOG": str(tmp_path / "log")}
+
+    script = _cluster_bootstrap_script(["n0", "n1"], {"n2": "n0", "n3": "n1"}, 6379)
+    subprocess.run(["bash", "-c", script], env=env, check=True, timeout=30)
+
+    commands = (tmp_path / "log").read_text().splitlines()
+    steps = ("ADDSLOTSRANGE", "MEET", "REPLICATE")
+    changes = [command for command in commands if any(f" CLUSTER {step} " in command for step in steps)]
+    assert changes == [
+        "n1 CLUSTER ADDSLOTSRANGE 8192 16383",
+        "n1 CLUSTER MEET 10.0.0.2 6379",
+        "n3 CLUSTER MEET 10.0.0.2 6379",
+        "n2 CLUSTER REPLICATE id-n0",
+    ]
+
+
+@pulumi.runtime.test
+def test_cluster_creates_nodes_and_bootstrap(pulumi_mocks):
+    cluster = create_valkey_cluster("shard", primary_count=3, replicas_per_primary=1, allow_empty_password=True)
+
+    def check(_):
+        names = set(pulumi_mocks.resources)
+        assert {f"shard-node-{i}" for i in range(6)} <= names
+        assert "shard-bootstrap" in names
+        node_envs = pulumi_mocks.resources["shard-node-0"].inputs["envs"]
+        assert any("--cluster-enabled yes" in env for env in node_envs)
+        assert cluster.seed_nodes[0] == "shard-node-0:6379"
+
+    return cluster.bootstrap.id.apply(check)
+
+
+def test_seed_nodes_use_the_tls_port():
+    clusters = []
+    tls = {"tls_cert_file": "valkey.crt", "tls_key_file": "valkey.key", "tls_ca_file": "ca.crt"}
+
+    plan_deployment(
+        lambda: clusters.append(
+            create_valkey_cluster(
+                "secure", primary_count=3, allow_empty_password=True, tls_enabled=True, tls_port_number=6380, **tls
+            )
+        )
+    )
+
+    assert clusters[0].seed_nodes[0] == "secure-node-0:6380"
+
+
+def test_replica_only_persistence_persists_one_replica_per_shard(pulumi_mocks):
+    cluster = create_valkey_cluster(
+        "durable", primary_count=3, replicas_per_primary=2, persistence_preset="replica-only-persistence"
+    )
+
+    persisting = [i for i in range(9) if cluster._node_config(i).persistence_preset == "aof-everysec"]
+    assert persisting == [3, 5, 7]
@@ -0,0 +1,555 @@
+import json
+import os
+import subprocess
+
+import pulumi
+import pulumi_docker
+import pytest
+
+from valkey_pulumi import (
+    ValkeyHostTuning,
+    create_standalone_valkey,
+    create_valkey_cluster,
+    create_valkey_replica_set,
+    create_valkey_sentinel_replica_set,
+)
+from valkey_pulumi.__main__ import (
+    IO_THREADS_RECOMMENDED_MAX,
+    PEERS_MOUNT_PATH,
+    _effective_io_threads,
+    _sync_waves,
+    _valkey_cli_function,
+)
+from valkey_pulumi.config import Config
+from valkey_pulumi.plan import plan_deployment
+
+
+def _of_type(mocks, typ):
+    return {name: args for name, args in mocks.resources.items() if args.typ == typ}
+
+
+@pulumi.runtime.test
+def test_remote_images_are_shared_across_the_stack(pulumi_mocks):
+    replica_set = create_valkey_replica_set("rs", replica_count=3)
+    standalone = create_standalone_valkey("solo")
+    other = create_standalone_valkey("other", image="docker.io/bitnami/valkey:8.1")
+
+    def check(_):
+        images = _of_type(pulumi_mocks, "docker:index/remoteImage:RemoteImage")
+        assert sorted(args.inputs["name"] for args in images.values()) == [
+            "docker.io/bitnami/valkey:8.1",
+            "docker.io/bitnami/valkey:latest",
+        ]
+
+    return pulumi.Output.all(replica_set.primary.id, standalone.container.id, other.container.id).apply(check)
+
+
+def test_remote_images_are_named_by_digest_and_keep_their_old_names(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    aliases = {}
+    remote_image = pulumi_docker.RemoteImage
+
+    def recording(resource_name, opts=None, **kwargs):
+        aliases[kwargs["name"]] = [alias.name for alias in opts.aliases]
+        return remote_image(resource_name, opts=opts, **kwargs)
+
+    monkeypatch.setattr(pulumi_docker, "RemoteImage", recording)
+
+    def deploy():
+        settings = {"allow_empty_password": True, "image": "a/b:c"}
+        create_valkey_replica_set("rs", replica_count=2, primary_config=settings, replica_config=dict(settings))
+        create_standalone_valkey("solo", allow_empty_password=True, image="a-b-c")
+
+    plan = plan_deployment(deploy)
+
+    names = [r.name for r in plan.resources if r.type == "docker:index/remoteImage:RemoteImage"]
+    # Both references sanitize to "a-b-c"; the digest keeps their resources apart
+    assert len(names) == len(set(names)) == 2
+    assert all(name.startswith("a-b-c-") for name in names)
+    assert aliases == {
+        "a/b:c": ["rs_primary_image", "rs-replica-0_image", "rs-replica-1_image"],
+        "a-b-c": ["solo_image"],
+    }
+
+
+@pulumi.runtime.test
+def test_resource_controls_are_applied_per_container(pulumi_mocks):
+    replica_set = create_valkey_replica_set(
+        "pinned",
+        replica_count=2,
+        primary_config={"memory_limit": "2gb", "swap_disabled": True, "nofile_ulimit": 65536},
+        replica_config={"node_cpusets": ["0-1", "2-3", "4-5"], "memory_limit": "1gb"},
+    )
+
+    def check(_):
+        primary = pulumi_mocks.resources["pinned-primary"].inputs
+        assert primary["memory"] == 2048
+        assert primary["memorySwap"] == 2048
+        assert primary["ulimits"] == [{"name": "nofile", "soft": 65536, "hard": 65536}]
+        assert pulumi_mocks.resources["pinned-replica-0"].inputs["cpuSet"] == "2-3"
+        assert pulumi_mocks.resources["pinned-replica-1"].inputs["cpuSet"] == "4-5"
+
+    return pulumi.Output.all(*[r.id for r in replica_set.replicas], replica_set.primary.id).apply(check)
+
+
+def test_auto_io_threads_follow_each_container_cpuset():
+    config = Config(io_threads="auto", node_cpusets=["0", "1-4", "0-7,16-23"])
+    assert _effective_io_threads(config, 0) == 1
+    assert _effective_io_threads(config, 1) == 3
+    assert _effective_io_threads(config, 2) == IO_THREADS_RECOMMENDED_MAX
+    assert _effective_io_threads(Config(io_threads="auto", cpus=2.5)) == 2
+    assert _effective_io_threads(Config(io_threads=4, cpus=1)) == 4
+    assert _effective_io_threads(Config()) is None
+
+
+@pulumi.runtime.test
+def test_auto_io_threads_are_computed_per_replica(pulumi_mocks):
+    replica_set = create_valkey_replica_set(
+        "threads",
+        replica_count=2,
+        replica_config={"io_threads": "auto", "node_cpusets": ["0-1", "2-5", "6-13"]},
+    )
+
+    def check(_):
+        def io_threads(name):
+            envs = pulumi_mocks.resources[name].inputs["envs"]
+            return [env for env in envs if env.startswith("VALKEY_IO_THREADS=")]
+
+        assert io_threads("threads-replica-0") == ["VALKEY_IO_THREADS=3"]
+        assert io_threads("threads-replica-1") == ["VALKEY_IO_THREADS=6"]
+
+    return pulumi.Output.all(*[r.id for r in replica_set.replicas]).apply(check)
+
+
+@pulumi.runtime.test
+def test_host_tuning_runs_before_valkey(pulumi_mocks, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(pulumi.log, "warn", lambda message, *args, **kwargs: warnings.append(message))
+    host_tuning = ValkeyHostTuning("host", Config(somaxconn=1024))
+    standalone = create_standalone_valkey("tuned", host_tuning=host_tuning, somaxconn=1024, tcp_backlog=2048)
+
+    def check(_):
+        init = pulumi_mocks.resources["host"].inputs
+        assert init["privileged"] is True
+        assert init["networkMode"] == "host"
+        script = init["command"][-1]
+        assert "echo never > /sys/kernel/mm/transparent_hugepage/enabled" in script
+        assert "sysctl -w vm.overcommit_memory=1" in script
+        assert "sysctl -w net.core.somaxconn=1024" in script
+
+        container = pulumi_mocks.resources["tuned"]
+        assert container.inputs["sysctls"] == {"net.core.somaxconn": "1024"}
+        assert any("tcp-backlog 2048 exceeds net.core.somaxconn 1024" in w for w in warnings)
+
+    return pulumi.Output.all(host_tuning.container.id, standalone.container.id).apply(check)
+
+
+def test_host_tuning_rejects_unknown_thp_mode(pulumi_mocks):
+    with pytest.raises(ValueError, match="transparent_hugepages"):
+        ValkeyHostTuning("host", Config(transparent_hugepages="sometimes"))
+
+
+@pulumi.runtime.test
+def test_metrics_exporter_per_replica_set_member(pulumi_mocks):
+    replica_set = create_valkey_replica_set(
+        "observed",
+        replica_count=2,
+        primary_config={"exporter_enabled": True, "password": "s3cret", "exporter_user": "metrics"},
+        replica_config={"exporter_enabled": True, "password": "s3cret", "exporter_user": "metrics"},
+    )
+
+    def check(_):
+        exporters = {name: args.inputs for name, args in pulumi_mocks.resources.items() if name.endswith("-exporter")}
+        assert sorted(exporters) == [
+            "observed-primary-exporter",
+            "observed-replica-0-exporter",
+            "observed-replica-1-exporter",
+        ]
+        replica_env = exporters["observed-replica-1-exporter"]["envs"]
+        assert "REDIS_ADDR=redis://observed-replica-1:6379" in replica_env
+        assert "REDIS_USER=metrics" in replica_env
+        assert "REDIS_PASSWORD=s3cret" in replica_env
+        assert exporters["observed-replica-1-exporter"]["ports"][0]["external"] == 9123
+        # Scraped from the host on the published port, on the network on the exporter port
+        assert replica_set.metrics_host_endpoints == ["localhost:9121", "localhost:9122", "localhost:9123"]
+        assert replica_set.metrics_network_endpoints == [
+            "observed-primary-exporter:9121",
+            "observed-replica-0-exporter:9121",
+            "observed-replica-1-exporter:9121",
+        ]
+
+    return pulumi.Output.all(*[exporter.id for exporter in replica_set.exporters]).apply(check)
+
+
+@pulumi.runtime.test
+def test_standalone_exporter_joins_a_dedicated_network(pulumi_mocks):
+    standalone = create_standalone_valkey("metered", exporter_enabled=True, allow_empty_password=True)
+
+    def check(_):
+        valkey = pulumi_mocks.resources["metered"].inputs
+        assert valkey["networksAdvanced"][0]["aliases"] == ["metered"]
+        exporter = pulumi_mocks.resources["metered-exporter"].inputs
+        assert "REDIS_ADDR=redis://metered:6379" in exporter["envs"]
+
+    return standalone.exporter.id.apply(check)
+
+
+def test_sync_waves_respect_concurrency():
+    assert _sync_waves(5, 2) == [range(0, 2), range(2, 4), range(4, 5)]
+    assert _sync_waves(3, 0) == [range(0, 3)]
+    assert _sync_waves(0, 1) == []
+
+
+def _replica_inputs(mocks, name):
+    inputs = dict(mocks.resources[name].inputs)
+    inputs.pop("image", None)
+    return inputs
+
+
+@pulumi.runtime.test
+def test_scaling_keeps_existing_replicas_unchanged(pulumi_mocks):
+    small = create_valkey_replica_set("small", replica_count=2, replica_config={"replica_sync_concurrency": 1})
+    large = create_valkey_replica_set("large", replica_count=4, replica_config={"replica_sync_concurrency": 1})
+
+    def check(_):
+        for i in range(2):
+            small_inputs = _replica_inputs(pulumi_mocks, f"small-replica-{i}")
+            large_inputs = _replica_inputs(pulumi_mocks, f"large-replica-{i}")
+            small_env = [env.replace("small", "large") for env in small_inputs.pop("envs")]
+            assert small_env == large_inputs.pop("envs")
+            for key in ("ports", "healthcheck", "wait", "waitTimeout", "cpuSet"):
+                assert small_inputs.get(key) == large_inputs.get(key)
+        healthcheck = pulumi_mocks.resources["large-replica-3"].inputs["healthcheck"]
+        assert "master_link_status:up" in healthcheck["tests"][1]
+        assert pulumi_mocks.resources["large-replica-3"].inputs["wait"] is True
+        assert [list(wave) for wave in large.sync_waves] == [[0], [1], [2], [3]]
+
+    return pulumi.Output.all(*[r.id for r in small.replicas + large.replicas]).apply(check)
+
+
+def test_containers_wait_until_ready(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def deploy():
+        create_valkey_sentinel_replica_set("ha", replica_count=1, primary_config={"startup_timeout": 900})
+        create_standalone_valkey("plain", healthcheck_enabled=False, allow_empty_password=True)
+
+    plan = plan_deployment(deploy)
+
+    primary = plan.container("ha-primary").inputs
+    assert "^loading:0" in primary["healthcheck"]["tests"][1]
+    assert "master_link_status" not in primary["healthcheck"]["tests"][1]
+    assert primary["healthcheck"]["startPeriod"] == "900s"
+    assert (primary["wait"], primary["waitTimeout"]) == (True, 900)
+    replica = plan.container("ha-replica-0").inputs
+    assert "^loading:0" in replica["healthcheck"]["tests"][1]
+    assert replica["waitTimeout"] == 600
+    assert "-p 26379 PING" in plan.container("ha-sentinel-0").inputs["healthcheck"]["tests"][1]
+    assert "healthcheck" not in plan.container("plain").inputs
+    assert "wait" not in plan.container("plain").inputs
+
+
+def _fake_cli_env(tmp_path, password):
+    """Put a stand-in valkey-cli on PATH that records the password it was given in ``tmp_path/auth``."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_cli = bin_dir / "valkey-cli"
+    fake_cli.write_text('#!/bin/sh\necho "${VALKEYCLI_AUTH-unset}" > "$AUTH_LOG"\nprintf "PONG\\nloading:0\\n"\n')
+    fake_cli.chmod(0o755)
+    env = {"PATH": f"{bin_dir}:{os.environ['PATH']}", "AUTH_LOG": str(tmp_path / "auth")}
+    if password is not None:
+        env["VALKEY_PASSWORD"] = password
+    return env
+
+
+@pytest.mark.parametrize("password", [None, "", "s3cret"])
+def test_readiness_probe_only_authenticates_with_a_password(monkeypatch, tmp_path, password):
+    monkeypatch.chdir(tmp_path)
+    plan = plan_deployment(lambda: create_standalone_valkey("open", allow_empty_password=True))
+    probe = plan.container("open").inputs["healthcheck"]["tests"][1]
+
+    subprocess.run(["sh", "-c", probe], env=_fake_cli_env(tmp_path, password), check=True)
+    assert (tmp_path / "auth").read_text().strip() == (password or "unset")
+
+
+@pytest.mark.parametrize("password", ["", "s3cret"])
+def test_rolling_job_cli_only_authenticates_with_a_password(tmp_path, password):
+    script = f"set -euo pipefail\n{_valkey_cli_function('--no-auth-warning')}\ncli PING"
+
+    subprocess.run(["bash", "-c", script], env=_fake_cli_env(tmp_path, password), check=True)
+    assert (tmp_path / "auth").read_text().strip() == (password or "unset")
+
+
+@pulumi.runtime.test
+def test_replica_set_writes_topology_manifest(pulumi_mocks, tmp_path):
+    replica_set = create_valkey_replica_set(
+        "routed",
+        replica_count=2,
+        primary_config={"password": "s3cret", "client_user": "app"},
+        replica_config={"password": "s3cret", "node_cpusets": ["0-1", "2-5", "6-7"]},
+    )
+
+    def check(_):
+        manifest = json.loads((tmp_path / ".valkey-pulumi" / "routed" / "topology.json").read_text())
+        assert manifest["auth"] == {"user": "app", "password_required": True}
+        assert manifest["primary"]["read_weight"] == 0
+        assert manifest["primary"]["read_only"] is False
+        assert [(r["host"], r["published_port"], r["read_weight"]) for r in manifest["replicas"]] == [
+            ("routed-replica-0", 6380, 4),
+            ("routed-replica-1", 6381, 2),
+        ]
+        assert all(r["read_only"] for r in manifest["replicas"])
+
+    return pulumi.Output.all(*[r.id for r in replica_set.replicas]).apply(check)
+
+
+@pulumi.runtime.test
+def test_tmpfs_placement_is_sized_from_maxmemory(pulumi_mocks):
+    standalone = create_standalone_valkey(
+        "cache", data_placement="tmpfs", maxmemory="1gb", aof_enabled=False, allow_empty_password=True
+    )
+
+    def check(_):
+        inputs = pulumi_mocks.resources["cache"].inputs
+        assert inputs["tmpfs"] == {"/bitnami/valkey/data": f"rw,size={1024**3}"}
+        assert not any(v.get("containerPath") == "/bitnami/valkey/data" for v in inputs.get("volumes", []))
+        assert "cache_data" not in pulumi_mocks.resources
+
+    return standalone.container.id.apply(check)
+
+
+@pulumi.runtime.test
+def test_bind_placement_separates_aof_from_rdb(pulumi_mocks):
+    replica_set = create_valkey_replica_set(
+        "split",
+        replica_count=1,
+        primary_config={"data_placement": "bind", "host_data_path": "/nvme0/valkey", "aof_placement": "volume"},
+        replica_config={
+            "data_placement": "bind",
+            "host_data_path": "/nvme0/valkey",
+            "aof_placement": "bind",
+            "aof_host_path": "/nvme1/aof",
+        },
+    )
+
+    def check(_):
+        def mounts(name):
+            return {
+                v["containerPath"]: v.get("hostPath") or v.get("volumeName")
+                for v in pulumi_mocks.resources[name].inputs["volumes"]
+            }
+
+        assert mounts("split-primary") == {
+            "/bitnami/valkey/data": "/nvme0/valkey/split-primary",
+            "/bitnami/valkey/data/appendonlydir": "split-primary_aof",
+        }
+        assert mounts("split-replica-0") == {
+            "/bitnami/valkey/data": "/nvme0/valkey/split-replica-0",
+            "/bitnami/valkey/data/appendonlydir": "/nvme1/aof/split-replica-0",
+        }
+
+    return pulumi.Output.all(replica_set.primary.id, *[r.id for r in replica_set.replicas]).apply(check)
+
+
+def test_bind_placement_requires_a_host_path(pulumi_mocks):
+    with pytest.raises(ValueError, match="requires host_data_path"):
+        create_standalone_valkey("nowhere", data_placement="bind")
+
+
+@pulumi.runtime.test
+def test_replica_set_data_paths_are_per_container_and_round_robin(pulumi_mocks):
+    disks = {"host_data_paths": ["/disk0", "/disk1"]}
+    replica_set = create_valkey_replica_set("rr", replica_count=3, primary_config=disks, replica_config=disks)
+    legacy = create_valkey_replica_set(
+        "legacy",
+        replica_count=1,
+        primary_config={"host_data_path": "/data"},
+        replica_config={"host_data_path": "/data"},
+    )
+
+    def check(_):
+        def data_path(name):
+            volumes = pulumi_mocks.resources[name].inputs["volumes"]
+            return next(v["hostPath"] for v in volumes if v["containerPath"] == "/bitnami/valkey/data")
+
+        assert [data_path(n) for n in ["rr-primary", "rr-replica-0", "rr-replica-1", "rr-replica-2"]] == [
+            "/disk0/rr-primary",
+            "/disk1/rr-replica-0",
+            "/disk0/rr-replica-1",
+            "/disk1/rr-replica-2",
+        ]
+        assert data_path("legacy-primary") == "/data/legacy-primary"
+        assert data_path("legacy-replica-0") == "/data/legacy-replica-0"
+
+    resources = [replica_set.primary, *replica_set.replicas, legacy.primary, *legacy.replicas]
+    return pulumi.Output.all(*[r.id for r in resources]).apply(check)
+
+
+@pulumi.runtime.test
+def test_replica_only_persistence_keeps_one_copy_on_disk(pulumi_mocks, tmp_path):
+    preset = {"persistence_preset": "replica-only-persistence", "restart_policy": "no"}
+    replica_set = create_valkey_replica_set("durable", replica_count=2, primary_config=preset, replica_config=preset)
+
+    def check(_):
+        def appendonly(name):
+            conf = (tmp_path / ".valkey-pulumi" / name / "valkey.conf").read_text()
+            return next(line.split()[1] for line in conf.splitlines() if line.startswith("appendonly "))
+
+        assert appendonly("durable-primary") == "no"
+        assert appendonly("durable-replica-0") == "yes"
+        assert appendonly("durable-replica-1") == "no"
+
+    return pulumi.Output.all(replica_set.primary.id, *[r.id for r in replica_set.replicas]).apply(check)
+
+
+def test_host_network_replica_set_listens_on_host_ports(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    settings = {
+        "network_mode": "host",
+        "host_address": "10.0.0.5",
+        "port_range": "23000-23099",
+        "somaxconn": 4096,
+        "exporter_enabled": True,
+    }
+    replica_sets = []
+    plan = plan_deployment(
+        lambda: replica_sets.append(
+            create_valkey_replica_set(
+                "hostnet", replica_count=2, primary_config=dict(settings), replica_config=dict(settings)
+            )
+        )
+    )
+
+    assert not plan.networks
+    assert not plan.host_ports()
+    for container in plan.containers:
+        assert container.inputs["networkMode"] == "host"
+        assert "sysctls" not in container.inputs
+    primary = plan.env("hostnet-primary")
+    replica = plan.env("hostnet-replica-1")
+    assert primary["VALKEY_PORT_NUMBER"] == "23000"
+    assert replica["VALKEY_PRIMARY_HOST"] == "10.0.0.5"
+    assert replica["VALKEY_PRIMARY_PORT_NUMBER"] == "23000"
+    assert replica["VALKEY_REPLICA_IP"] == "10.0.0.5"
+    assert replica["VALKEY_REPLICA_PORT"] == replica["VALKEY_PORT_NUMBER"] != "23000"
+    assert (
+        f"-p {replica['VALKEY_PORT_NUMBER']} " in plan.container("hostnet-replica-1").inputs["healthcheck"]["tests"][1]
+    )
+    assert plan.env("hostnet-replica-1-exporter")["REDIS_ADDR"] == f"redis://10.0.0.5:{replica['VALKEY_PORT_NUMBER']}"
+    exporter_port = plan.env("hostnet-replica-1-exporter")["REDIS_EXPORTER_WEB_LISTEN_ADDRESS"].lstrip(":")
+    assert replica_sets[0].metrics_host_endpoints[2] == f"localhost:{exporter_port}"
+    assert replica_sets[0].metrics_network_endpoints[2] == f"10.0.0.5:{exporter_port}"
+    assert any("somaxconn is not applied" in warning for warning in plan.warnings)
+
+
+def test_host_network_without_port_range_uses_the_fixed_layout(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    plan = plan_deployment(
+        lambda: create_valkey_replica_set(
+            "fixed", replica_count=2, primary_config={"network_mode": "host"}, replica_config={"network_mode": "host"}
+        )
+    )
+
+    assert plan.env("fixed-primary")["VALKEY_PORT_NUMBER"] == "6379"
+    assert plan.env("fixed-replica-1")["VALKEY_PORT_NUMBER"] == "6381"
+    assert plan.env("fixed-replica-1")["VALKEY_PRIMARY_HOST"] == "127.0.0.1"
+
+
+def test_host_network_is_rejected_where_unsupported(pulumi_mocks):
+    with pytest.raises(ValueError, match="does not support network_mode 'host'"):
+        create_valkey_cluster("c", network_mode="host")
+    with pytest.raises(ValueError, match="Unknown network_mode"):
+        create_standalone_valkey("s", network_mode="overlay")
+    with pytest.raises(ValueError, match="same network_mode"):
+        create_valkey_replica_set("r", primary_config={"network_mode": "host"})
+
+
+def test_rolling_update_hands_the_primary_role_off(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    deployed = {}
+
+    def plan(replica_count=2, image="docker.io/bitnami/valkey:8.0"):
+        settings = {"update_strategy": "rolling", "image": image, "allow_empty_password": True}
+
+        def deploy():
+            deployed["roll"] = create_valkey_replica_set(
+                "roll", replica_count=replica_count, primary_config=dict(settings), replica_config=dict(settings)
+            )
+
+        return plan_deployment(deploy)
+
+    def revision(deployment):
+        return deployment.env("roll-handoff")["VALKEY_PRIMARY_REVISION"]
+
+    before = plan()
+    primary = before.container("roll-primary").inputs
+    assert "exec /opt/bitnami/scripts/valkey/entrypoint.sh" in primary["command"][2]
+    assert "FAILOVER TIMEOUT 30000" in before.container("roll-handoff").inputs["command"][2]
+    assert before.container("roll-rejoin").inputs["mustRun"] is False
+    assert revision(before) == before.env("roll-rejoin")["VALKEY_PRIMARY_REVISION"]
+    peers = str(tmp_path / ".valkey-pulumi" / "roll-primary" / "peers")
+    assert {"hostPath": peers, "containerPath": PEERS_MOUNT_PATH, "readOnly": True} in primary["volumes"]
+    assert deployed["roll"]._replica_endpoints() == ["roll-replica-0:6379:6379", "roll-replica-1:6379:6379"]
+    # The rolling jobs exit, so they do not count towards the footprint
+    assert before.footprint().containers == 3
+
+    # Scaling rewrites the peer list without touching the primary or re-running the jobs
+    scaled = plan(replica_count=3)
+    assert scaled.container("roll-primary").inputs == primary
+    assert revision(scaled) == revision(before)
+    assert deployed["roll"]._replica_endpoints()[-1] == "roll-replica-2:6379:6379"
+
+    assert revision(plan(image="docker.io/bitnami/valkey:8.1")) != revision(before)
+
+
+def test_rolling_sentinel_replica_set_fails_over_through_sentinel(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    plan = plan_deployment(
+        lambda: create_valkey_sentinel_replica_set("ha", replica_count=1, primary_config={"update_strategy": "rolling"})
+    )
+
+    assert "SENTINEL FAILOVER mymaster" in plan.container("ha-handoff").inputs["command"][2]
+    assert "get-master-addr-by-name mymaster" in plan.container("ha-primary").inputs["command"][2]
+    assert "ha-rejoin" not in {container.name for container in plan.containers}
+
+
+def test_unknown_update_strategy_is_rejected(pulumi_mocks):
+    with pytest.raises(ValueError, match="Unknown update_strategy 'blue-green'"):
+        create_valkey_replica_set("r", primary_config={"update_strategy": "blue-green"})
+
+
+def test_seed_job_copies_a_snapshot_into_empty_data(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "yesterday.rdb").write_bytes(b"REDIS0011")
+
+    def deploy():
+        create_standalone_valkey("warm", seed_rdb_file="yesterday.rdb", allow_empty_password=True)
+        create_valkey_replica_set(
+            "rs", replica_count=2, primary_config={"seed_volume": "snapshots", "aof_enabled": False}
+        )
+
+    plan = plan_deployment(deploy)
+
+    seed = plan.container("warm-seed").inputs
+    assert seed["mustRun"] is False
+    assert seed["networkMode"] == "none"
+    assert {"containerPath": "/seed/dump.rdb", "hostPath": str(tmp_path / "yesterday.rdb"), "readOnly": True} in [
+        {key: volume.get(key) for key in ("containerPath", "hostPath", "readOnly")} for volume in seed["volumes"]
+    ]
+    # AOF is on by default, so the snapshot becomes the AOF base
+    assert "appendonlydir/appendonly.aof.1.base.rdb" in seed["command"][2]
+    assert "file appendonly.aof.1.base.rdb seq 1 type b" in seed["command"][2]
+    primary_seed = plan.container("rs-primary-seed").inputs
+    assert primary_seed["volumes"][-1]["volumeName"] == "snapshots"
+    assert 'mv "/bitnami/valkey/data/dump.rdb.seeding" "/bitnami/valkey/data/dump.rdb"' in primary_seed["command"][2]
+    assert {"rs-replica-0-seed", "rs-replica-1-seed"}.isdisjoint(c.name for c in plan.containers)
+
+
+def test_seeding_needs_one_shared_source(pulumi_mocks, tmp_path):
+    with pytest.raises(ValueError, match="either seed_rdb_file or seed_volume"):
+        create_standalone_valkey("a", seed_rdb_file="a.rdb", seed_volume="v")
+    with pytest.raises(ValueError, match="volume or bind mount"):
+        create_standalone_valkey("b", seed_volume="v", data_placement="tmpfs")
+    with pytest.raises(ValueError, match="does not exist"):
+        create_standalone_valkey("c", seed_rdb_file=str(tmp_path / "missing.rdb"))
@@ -0,0 +1,73 @@
+import pulumi
+import pytest
+
+from valkey_pulumi.config import Config, resolve_stack_config
+
+
+class _FakePulumiConfig:
+    instances = 0
+
+    def __init__(self, valkey=None):
+        type(self).instances += 1
+        self.valkey = valkey
+
+    def get_object(self, key):
+        return self.valkey if key == "valkey" else None
+
+    def get(self, *_args, **_kwargs):
+        return None
+
+    get_bool = get_int = get_secret = get
+
+
+@pytest.fixture
+def stack_valkey(monkeypatch):
+    def install(valkey):
+        _FakePulumiConfig.instances = 0
+        monkeypatch.setattr(pulumi, "Config", lambda *_args: _FakePulumiConfig(valkey))
+        return _FakePulumiConfig
+
+    return install
+
+
+def test_stack_config_is_resolved_once(stack_valkey):
+    fake = stack_valkey({"port": 6400, "replica_count": 2})
+
+    configs = [Config() for _ in range(10)]
+
+    assert fake.instances == 1
+    assert {cfg.port for cfg in configs} == {6400}
+    assert configs[0].replica_count == 2
+
+
+def test_constructor_arguments_override_snapshot(stack_valkey):
+    stack_valkey({"port": 6400})
+
+    assert Config(port=7000).port == 7000
+    assert Config().port == 6400
+
+
+def test_snapshot_is_immutable(stack_valkey):
+    stack_valkey({"disable_commands": ["FLUSHALL"], "extra_env_vars": {"A": "1"}})
+    snapshot = resolve_stack_config()
+
+    with pytest.raises(TypeError):
+        snapshot["port"] = 1  # type: ignore[index]
+    assert snapshot["disable_commands"] == ("FLUSHALL",)
+    with pytest.raises(TypeError):
+        snapshot["extra_env_vars"]["B"] = "2"  # type: ignore[index]
+
+
+def test_snapshot_validates_types(stack_valkey):
+    stack_valkey({"port": "not-a-port"})
+
+    with pytest.raises(ValueError, match="valkey:port"):
+        Config()
+
+
+def test_snapshot_splits_string_lists(stack_valkey):
+    stack_valkey({"extra_flags": "--maxmemory 100mb", "disable_commands": "FLUSHDB,FLUSHALL"})
+    cfg = Config()
+
+    assert cfg.extra_flags == ("--maxmemory", "100mb")
+    assert cfg.disable_commands == ("FLUSHDB", "FLUSHALL")
@@ -0,0 +1,83 @@
+import pytest
+
+from valkey_pulumi.fleet import parse_fleet
+from valkey_pulumi.plan import plan_deployment
+
+FLEET = {
+    "defaults": {"allow_empty_password": True},
+    "instances": {
+        "sessions": {"kind": "standalone", "port": 6400},
+        "catalog": {"kind": "replica-set", "port": 6410, "replica_count": 2, "replica": {"memory_limit": "2gb"}},
+        "search": {"port": 7000, "cluster_enabled": True, "cluster_primary_count": 3},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_defaults_are_merged_and_settings_validated():
+    sessions, catalog, search = parse_fleet(FLEET)
+
+    assert sessions.kind == "standalone"
+    assert sessions.settings == {"allow_empty_password": True, "port": 6400}
+    assert catalog.kind == "replica-set"
+    assert catalog.replica_settings()["memory_limit"] == "2gb"
+    assert "memory_limit" not in catalog.primary_settings()
+    assert search.kind is None
+
+
+@pytest.mark.parametrize(
+    ("spec", "message"),
+    [
+        ({"instances": {}}, "at least one entry"),
+        ({"instances": {"a": {"kind": "mesh"}}}, "unknown kind 'mesh'"),
+        ({"instances": {"a": {"prot": 6400}}}, "unknown setting 'prot'"),
+        ({"instances": {"a": {"port": "high"}}}, "fleet instance 'a': valkey:port must be of type int"),
+        ({"instances": {"a b": {}}}, "valid container name"),
+        ({"instances": {"a": {"kind": "cluster", "replica": {"port": 1}}}}, "need a replica set kind"),
+        ({"instances": {"a": {"cluster_enabled": True, "primary": {"port": 1}}}}, "need a replica set kind"),
+        (
+            {"instances": {"a": {"sentinel_enabled": False, "replica_count": 0, "replica": {"port": 1}}}},
+            "need a replica set kind",
+        ),
+        ({"instances": {"a": {"fleet_file": "other.yaml"}}}, "unknown setting 'fleet_file'"),
+    ],
+)
+def test_invalid_fleets_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_fleet(spec)
+
+
+def test_fleet_deploys_every_instance_in_one_run():
+    plan = plan_deployment(stack_config={"valkey": {"memory_limit": "512mb", "fleet": FLEET}})
+
+    names = {container.name for container in plan.containers}
+    assert {"sessions", "catalog-primary", "catalog-replica-1", "search-node-5", "search-bootstrap"} <= names
+    assert plan.container("catalog-primary").inputs["memory"] == 512
+    assert plan.container("catalog-replica-0").inputs["memory"] == 2048
+    assert plan.env("search-node-0")["VALKEY_PORT_NUMBER"] == "7000"
+    assert not plan.footprint().port_conflicts
+
+
+def test_fleet_file_is_read(tmp_path):
+    (tmp_path / "fleet.yaml").write_text(
+        "instances:\n  a:\n    port: 6500\n  b:\n    kind: standalone\n    port: 6510\n"
+    )
+
+    plan = plan_deployment(stack_config={"valkey": {"fleet_file": "fleet.yaml", "allow_empty_password": True}})
+
+    # Without a kind, the default replica_count of 1 makes a replica set
+    assert plan.host_ports() == {6500: ["a-primary"], 6501: ["a-replica-0"], 6510: ["b"]}
+
+
+def test_role_settings_of_an_instance_resolved_by_the_stack_are_rejected():
+    # Only the stack configuration makes this instance a cluster
+    fleet = {"instances": {"a": {"replica": {"memory_limit": "1gb"}}}}
+
+    with pytest.raises(ValueError, match="fleet instance 'a'.*resolves to 'cluster'"):
+        plan_deployment(
+            stack_config={"valkey": {"cluster_enabled": True, "allow_empty_password": True, "fleet": fleet}}
+        )
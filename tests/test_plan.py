@@ -0,0 +1,71 @@
+import pytest
+
+from valkey_pulumi import create_standalone_valkey, create_valkey_replica_set
+from valkey_pulumi.plan import _config_values, cli, plan_deployment
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(monkeypatch, tmp_path):
+    # Generated files land under the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def test_replica_set_plan_lists_resources_and_footprint():
+    plan = plan_deployment(
+        lambda: create_valkey_replica_set(
+            "planned", replica_count=2, replica_config={"memory_limit": "1gb", "cpus": "1.5"}
+        )
+    )
+
+    assert [c.name for c in plan.containers] == ["planned-primary", "planned-replica-0", "planned-replica-1"]
+    assert [n.name for n in plan.networks] == ["planned_network"]
+    assert len(plan.volumes) == 3
+    assert plan.container("planned-replica-1").inputs["image"] == "docker.io/bitnami/valkey:latest"
+    assert plan.env("planned-replica-0")["VALKEY_PRIMARY_HOST"] == "planned-primary"
+    assert list(plan.host_ports()) == [6379, 6380, 6381]
+
+    footprint = plan.footprint()
+    assert footprint.containers == 3
+    assert footprint.memory_bytes == 2 * 1024**3
+    assert footprint.cpus == 3.0
+    assert footprint.unbounded_memory == ["planned-primary"]
+    assert not footprint.port_conflicts
+
+
+def test_plan_reports_port_conflicts_and_warnings():
+    def deploy():
+        create_standalone_valkey("a", allow_empty_password=True)
+        create_standalone_valkey("b", allow_empty_password=True, swap_disabled=True)
+
+    plan = plan_deployment(deploy)
+
+    assert plan.footprint().port_conflicts == {6379: ["a", "b"]}
+    assert "swap_disabled has no effect without memory_limit" in plan.warnings
+
+
+def test_plan_runs_main_with_stack_config():
+    stack_config = {"valkey": {"cluster_enabled": True, "cluster_primary_count": 2, "cluster_replicas_per_primary": 0}}
+    plan = plan_deployment(stack_config=stack_config)
+
+    nodes = [c.name for c in plan.containers if c.name.startswith("valkey-cluster-node-")]
+    assert len(nodes) == 2
+    assert any("at least 3 are needed" in warning for warning in plan.warnings)
+    # The bootstrap job exits, so it does not count towards the footprint
+    assert plan.footprint().containers == 2
+
+
+def test_encrypted_config_cannot_be_planned():
+    with pytest.raises(ValueError, match="encrypted"):
+        _config_values({"valkey:password": {"secure": "v1:abc"}}, "valkey")
+
+
+def test_cli_prints_summary(tmp_path, capsys):
+    (tmp_path / "Pulumi.yaml").write_text("name: valkey\n")
+    stack_file = tmp_path / "Pulumi.dev.yaml"
+    stack_file.write_text("config:\n  valkey:\n    replica_count: 1\n    memory_limit: 512mb\n")
+
+    assert cli([str(stack_file)]) == 0
+
+    out = capsys.readouterr().out
+    assert "container valkey-replica-set-replica-0" in out
+    assert "Memory: 1.00 GiB" in out
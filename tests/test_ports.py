@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from valkey_pulumi import create_standalone_valkey, create_valkey_replica_set
+from valkey_pulumi.plan import plan_deployment
+from valkey_pulumi.ports import PortAllocator, parse_port_range
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("value", ["20000", "b-c", "30000-20000", "0-10", "65000-70000"])
+def test_invalid_port_ranges_are_rejected(value):
+    with pytest.raises(ValueError, match="port range"):
+        parse_port_range(value)
+
+
+def test_allocations_are_stable_and_released(tmp_path):
+    path = tmp_path / "ports.json"
+    allocator = PortAllocator(str(path), "valkey/prod")
+    assert allocator.allocate("a/valkey", (20000, 20002)) == 20000
+    assert allocator.allocate("b/valkey", (20000, 20002)) == 20001
+
+    # A later run asks in a different order and without "a"
+    allocator = PortAllocator(str(path), "valkey/prod")
+    assert allocator.allocate("c/valkey", (20000, 20002)) == 20002
+    assert allocator.allocate("b/valkey", (20000, 20002)) == 20001
+    assert allocator.release_unrequested() == ["a/valkey"]
+    assert json.loads(path.read_text())["stacks"] == {"valkey/prod": {"b/valkey": 20001, "c/valkey": 20002}}
+
+    with pytest.raises(ValueError, match="no free port"):
+        allocator.allocate("d/valkey", (20001, 20002))
+
+
+def test_stacks_share_the_range_but_release_only_their_own_ports(tmp_path):
+    path = tmp_path / "ports.json"
+    path.write_text(json.dumps({"version": 2, "stacks": {"valkey/dev": {"other-deploy/valkey": 20000}}}))
+
+    allocator = PortAllocator(str(path), "valkey/prod")
+    assert allocator.allocate("a/valkey", (20000, 20001)) == 20001
+    assert allocator.release_unrequested() == []
+    assert json.loads(path.read_text())["stacks"] == {
+        "valkey/dev": {"other-deploy/valkey": 20000},
+        "valkey/prod": {"a/valkey": 20001},
+    }
+
+
+def test_unscoped_assignments_are_adopted(tmp_path):
+    path = tmp_path / "ports.json"
+    path.write_text(json.dumps({"version": 1, "ports": {"a/valkey": 20001, "b/valkey": 20000}}))
+
+    allocator = PortAllocator(str(path), "valkey/prod")
+    assert allocator.allocate("a/valkey", (20000, 20002)) == 20001
+    # b may belong to another stack, so its port stays taken
+    assert allocator.allocate("c/valkey", (20000, 20002)) == 20002
+    assert json.loads(path.read_text())["unscoped"] == {"b/valkey": 20000}
+
+
+def test_concurrent_stacks_see_each_others_allocations(tmp_path):
+    path = tmp_path / "ports.json"
+    # Both stacks read the file before either allocates
+    prod = PortAllocator(str(path), "valkey/prod")
+    dev = PortAllocator(str(path), "valkey/dev")
+
+    assert prod.allocate("a/valkey", (20000, 20002)) == 20000
+    assert dev.allocate("b/valkey", (20000, 20002)) == 20001
+    assert prod.allocate("c/valkey", (20000, 20002)) == 20002
+    assert json.loads(path.read_text())["stacks"] == {
+        "valkey/dev": {"b/valkey": 20001},
+        "valkey/prod": {"a/valkey": 20000, "c/valkey": 20002},
+    }
+    # The file is replaced whole; no temporary file is left behind
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["ports.json", "ports.json.lock"]
+
+
+def test_read_only_allocations_are_not_saved(tmp_path):
+    path = tmp_path / "ports.json"
+    allocator = PortAllocator(str(path), "valkey/prod", read_only=True)
+    assert allocator.allocate("a/valkey", (20000, 20002)) == 20000
+    assert allocator.release_unrequested() == []
+    assert not path.exists()
+
+
+def test_allocated_ports_do_not_collide_across_deployments():
+    shared = {"port_range": "21000-21099", "exporter_enabled": True, "allow_empty_password": True}
+
+    def deploy():
+        create_standalone_valkey("a", **shared)
+        create_standalone_valkey("b", **shared)
+        create_valkey_replica_set("rs", replica_count=2, primary_config=dict(shared), replica_config=dict(shared))
+
+    plan = plan_deployment(deploy)
+
+    ports = plan.host_ports()
+    assert not plan.footprint().port_conflicts
+    assert len(ports) == 10  # 5 Valkey containers and 5 exporters
+    assert all(21000 <= port <= 21099 for port in ports)
+
+
+def test_plans_read_but_never_change_saved_ports(tmp_path):
+    def fleet(*names):
+        instances = {name: {"kind": "standalone"} for name in names}
+        return {"valkey": {"port_range": "22000-22099", "fleet": {"instances": instances}}}
+
+    path = tmp_path / ".valkey-pulumi" / "ports.json"
+    path.parent.mkdir()
+    saved = {
+        "version": 2,
+        "stacks": {
+            "valkey/plan": {"b/valkey": 22000, "c/valkey": 22001, "removed/valkey": 22003},
+            "valkey/dev": {"other-deploy/valkey": 22002},
+        },
+    }
+    path.write_text(json.dumps(saved))
+
+    plan = plan_deployment(stack_config=fleet("a", "b", "c"))
+
+    # Existing containers keep their ports and the new one avoids every stack's assignments
+    assert plan.host_ports() == {22000: ["b"], 22001: ["c"], 22004: ["a"]}
+    assert json.loads(path.read_text()) == saved
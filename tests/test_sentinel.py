@@ -0,0 +1,47 @@
+import pulumi
+import pytest
+
+from valkey_pulumi import create_valkey_sentinel_replica_set
+from valkey_pulumi.__main__ import _sentinel_script
+from valkey_pulumi.config import Config
+
+
+def test_sentinel_script_seeds_config_once_and_applies_tunables():
+    config = Config(sentinel_down_after_milliseconds=3000, sentinel_failover_timeout=20000, sentinel_parallel_syncs=2)
+    script = _sentinel_script("ha-sentinel-1", config, "mymaster", "ha-primary", 2)
+
+    assert 'if [ ! -s "$conf" ]; then' in script
+    assert "sentinel monitor mymaster ha-primary 6379 2" in script
+    assert "sentinel announce-ip ha-sentinel-1" in script
+    assert (
+        "SENTINEL SET mymaster down-after-milliseconds 3000 failover-timeout 20000 parallel-syncs 2 quorum 2" in script
+    )
+    assert "auth-pass" in script
+
+
+@pulumi.runtime.test
+def test_sentinels_start_between_primary_and_replicas(pulumi_mocks):
+    replica_set = create_valkey_sentinel_replica_set(
+        "ha",
+        replica_count=2,
+        primary_config={"password": "s3cret", "valkey_sentinel_primary_name": "cache"},
+    )
+
+    def check(_):
+        sentinels = sorted(name for name in pulumi_mocks.resources if "-sentinel-" in name and "_data" not in name)
+        assert sentinels == ["ha-sentinel-0", "ha-sentinel-1", "ha-sentinel-2"]
+        assert pulumi_mocks.resources["ha-sentinel-2"].inputs["ports"][0]["external"] == 26381
+        assert "VALKEY_PRIMARY_PASSWORD=s3cret" in pulumi_mocks.resources["ha-sentinel-0"].inputs["envs"]
+        assert "s3cret" not in pulumi_mocks.resources["ha-sentinel-0"].inputs["command"][-1]
+
+        replica_env = pulumi_mocks.resources["ha-replica-1"].inputs["envs"]
+        assert "VALKEY_SENTINEL_HOST=ha-sentinel-0" in replica_env
+        assert "VALKEY_SENTINEL_PRIMARY_NAME=cache" in replica_env
+        assert "VALKEY_REPLICA_IP=ha-replica-1" in replica_env
+
+    return pulumi.Output.all(*[s.id for s in replica_set.sentinels], *[r.id for r in replica_set.replicas]).apply(check)
+
+
+def test_sentinel_quorum_must_fit_sentinel_count(pulumi_mocks):
+    with pytest.raises(ValueError, match="sentinel_quorum"):
+        create_valkey_sentinel_replica_set("ha", primary_config={"sentinel_quorum": 4})
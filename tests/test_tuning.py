@@ -0,0 +1,170 @@
+import pytest
+
+from valkey_pulumi.__main__ import CONFIG_MOUNT_PATH, _build_env, _file_mounts
+from valkey_pulumi.config import Config
+from valkey_pulumi.tuning import (
+    PERSISTENCE_PRESETS,
+    TUNING_PROFILES,
+    config_directives,
+    derived_maxmemory,
+    parse_size,
+    render_valkey_conf,
+    repl_backlog_size_for,
+    write_valkey_conf,
+)
+
+
+def _env_dict(envs):
+    return dict(env.split("=", 1) for env in envs)
+
+
+def test_no_generated_config_by_default():
+    cfg = Config()
+
+    assert render_valkey_conf(cfg) is None
+    assert "VALKEY_PULUMI_CONFIG_DIGEST" not in _env_dict(_build_env(cfg))
+
+
+@pytest.mark.parametrize("profile", sorted(TUNING_PROFILES))
+def test_every_profile_renders(profile):
+    content = render_valkey_conf(Config(tuning_profile=profile))
+
+    assert f"# Tuning profile: {profile}" in content
+    assert "maxmemory-policy " in content
+
+
+def test_overrides_replace_and_remove_profile_directives():
+    cfg = Config(
+        tuning_profile="cache-lru",
+        maxmemory="2gb",
+        tuning_overrides={"hz": 25, "activedefrag": None, "lazyfree_lazy_eviction": False},
+    )
+    directives = config_directives(cfg)
+
+    assert directives["maxmemory"] == "2gb"
+    assert directives["hz"] == "25"
+    assert directives["lazyfree-lazy-eviction"] == "no"
+    assert "activedefrag" not in directives
+
+
+def test_repeated_directives_render_one_line_each():
+    content = render_valkey_conf(Config(tuning_profile="throughput"))
+
+    assert "client-output-buffer-limit replica 1gb 256mb 120" in content
+    assert "client-output-buffer-limit pubsub 64mb 16mb 120" in content
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown tuning profile"):
+        config_directives(Config(tuning_profile="turbo"))
+
+
+@pytest.mark.parametrize("preset", sorted(PERSISTENCE_PRESETS))
+def test_persistence_presets_drive_appendonly(preset):
+    cfg = Config(persistence_preset=preset)
+    directives = config_directives(cfg)
+
+    assert directives["save"]
+    aof = preset.startswith("aof-")
+    assert directives["appendonly"] == ("yes" if aof else "no")
+    assert _env_dict(_build_env(cfg))["VALKEY_AOF_ENABLED"] == ("yes" if aof else "no")
+
+
+def test_persistence_preset_can_be_overridden():
+    directives = config_directives(
+        Config(persistence_preset="aof-always", tuning_overrides={"no-appendfsync-on-rewrite": "yes"})
+    )
+
+    assert directives["appendfsync"] == "always"
+    assert directives["aof-use-rdb-preamble"] == "yes"
+    assert directives["no-appendfsync-on-rewrite"] == "yes"
+
+
+def test_unknown_persistence_preset_is_rejected():
+    with pytest.raises(ValueError, match="Unknown persistence preset"):
+        config_directives(Config(persistence_preset="aof-sometimes"))
+
+
+def test_generated_config_includes_user_file_and_is_mounted(tmp_path):
+    user_conf = tmp_path / "custom.conf"
+    user_conf.write_text("timeout 300\n")
+    cfg = Config(
+        tuning_profile="low-latency",
+        valkey_config_file=str(user_conf),
+        generated_config_dir=str(tmp_path / "generated"),
+    )
+
+    path = write_valkey_conf(cfg, "node-a")
+    content = open(path).read()
+    assert content.index("timeout 300") < content.index("hz 50")
+
+    mounts = [m for m in _file_mounts(cfg, "node-a") if m.container_path == CONFIG_MOUNT_PATH]
+    assert [m.host_path for m in mounts] == [path]
+    assert "VALKEY_PULUMI_CONFIG_DIGEST" in _env_dict(_build_env(cfg))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("512mb", 512 * 1024**2), ("2gb", 2 * 1024**3), ("1g", 10**9), (4096, 4096), ("100", 100)],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+def test_maxmemory_is_derived_from_memory_limit():
+    cfg = Config(memory_limit="4gb", maxmemory_headroom_percent=25)
+
+    assert derived_maxmemory(cfg) == 3 * 1024**3
+    assert config_directives(cfg)["maxmemory"] == "3072mb"
+    assert config_directives(Config(memory_limit="4gb", maxmemory="1gb"))["maxmemory"] == "1gb"
+
+
+def test_repl_backlog_size_covers_the_tolerated_disconnect():
+    # 8 MB/s for 30 s, doubled for bursts
+    assert repl_backlog_size_for("8mb", 30) == 480 * 1024**2
+    assert repl_backlog_size_for(1000, 1) == 1024**2
+
+
+def test_replication_directives():
+    cfg = Config(
+        repl_diskless_sync=True,
+        repl_diskless_sync_delay=0,
+        repl_diskless_load="on-empty-db",
+        repl_backlog_write_rate="4mb",
+        repl_backlog_disconnect_seconds=60,
+        repl_backlog_ttl=3600,
+    )
+    directives = config_directives(cfg)
+
+    assert directives["repl-diskless-sync"] == "yes"
+    assert directives["repl-diskless-sync-delay"] == "0"
+    assert directives["repl-diskless-load"] == "on-empty-db"
+    assert directives["repl-backlog-size"] == "480mb"
+    assert directives["repl-backlog-ttl"] == "3600"
+    assert (
+        config_directives(Config(repl_backlog_size="256mb", repl_backlog_write_rate="4mb"))["repl-backlog-size"]
+        == "256mb"
+    )
+    with pytest.raises(ValueError, match="repl_diskless_load"):
+        config_directives(Config(repl_diskless_load="always"))
+
+
+def test_tls_directives_only_apply_with_tls():
+    settings = {
+        "tls_session_caching": True,
+        "tls_session_cache_size": 40000,
+        "tls_session_cache_timeout": 600,
+        "tls_protocols": "TLSv1.2 TLSv1.3",
+        "tls_ciphersuites": "TLS_AES_128_GCM_SHA256:TLS_CHACHA20_POLY1305_SHA256",
+        "tls_replication": True,
+    }
+    directives = config_directives(Config(tls_enabled=True, **settings))
+
+    assert directives["tls-session-caching"] == "yes"
+    assert directives["tls-session-cache-size"] == "40000"
+    assert directives["tls-session-cache-timeout"] == "600"
+    assert directives["tls-protocols"] == '"TLSv1.2 TLSv1.3"'
+    assert directives["tls-ciphersuites"] == "TLS_AES_128_GCM_SHA256:TLS_CHACHA20_POLY1305_SHA256"
+    assert directives["tls-replication"] == "yes"
+    assert "tls-ciphers" not in directives
+    assert config_directives(Config(**settings)) == {}